@@ -4,16 +4,29 @@ Create a properly formatted LibreOffice spreadsheet with merged cells
 for the tap and drill sizes table.
 
 Data is structured to minimize duplication:
-- Drill sizes are defined once in lookup tables
-- Thread data is organized hierarchically by screw size
-- Clearance drill specifications are shared across thread pitches for each screw size
+- Drill sizes are defined once in lookup tables and interned as Drill values
+- Threads (UNC/UNF/UNEF/8-UN and ISO metric) are rows of a compact data file,
+  thread_catalogue.csv, loaded into array-backed columns; the chart is the
+  inch threads up to 1" selected from it
+- Cap screw data is organized by screw size
+
+Importing this module only builds the data tables and lookup helpers (the
+thread catalogue is read from a compiled cache in __pycache__ after the first
+run); openpyxl is loaded when a sheet is generated. Run it as a script (see main()) to write
+the workbook:
+
+    python inch_taps_drills.py [-o inch_taps_drills.xlsx] [--backend {openpyxl,direct}]
+                               [--pdf] [--poster ACROSSxDOWN ...] [--tile-overlap INCHES]
+                               [--no-tile-marks] [--split] [--pdf-dir DIR] [--jobs N]
+                               [--reproducible] [--incremental [--manifest FILE]]
+                               [--profile] [--cprofile FILE]
 """
 
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
 from fractions import Fraction
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
-from openpyxl.cell.cell import MergedCell
 
 # ============================================================================
 # DRILL SIZE LOOKUP TABLES (from Wikipedia: Drill bit sizes)
@@ -79,61 +92,6 @@ FRACTIONAL_DRILLS = {
     Fraction(33, 32): 1.0313,  # 1-1/32 = 33/32
 }
 
-def get_drill_decimal(drill_spec):
-    """
-    Look up the decimal equivalent of a drill size.
-    
-    Args:
-        drill_spec: Can be int (number drill), str (letter drill), 
-                   Fraction (fractional drill), or float (direct decimal)
-    
-    Returns:
-        float: Decimal equivalent in inches
-    """
-    if isinstance(drill_spec, int):
-        return NUMBER_DRILLS[drill_spec]
-    elif isinstance(drill_spec, str):
-        return LETTER_DRILLS[drill_spec]
-    elif isinstance(drill_spec, Fraction):
-        return FRACTIONAL_DRILLS[drill_spec]
-    elif isinstance(drill_spec, float):
-        return drill_spec
-    else:
-        raise ValueError(f"Unknown drill spec type: {type(drill_spec)}")
-
-def format_drill_size(drill_spec):
-    """
-    Format a drill size for display.
-    
-    Args:
-        drill_spec: Can be int (number drill), str (letter drill), 
-                   Fraction (fractional drill), or float (direct decimal)
-    
-    Returns:
-        str: Formatted drill size (e.g., "#53", "F", "3/64")
-    """
-    if isinstance(drill_spec, int):
-        return str(drill_spec)
-    elif isinstance(drill_spec, str):
-        return drill_spec
-    elif isinstance(drill_spec, Fraction):
-        if drill_spec > 1:
-            # Handle mixed fractions like 1-1/64
-            whole = drill_spec.numerator // drill_spec.denominator
-            remainder = drill_spec.numerator % drill_spec.denominator
-            if remainder == 0:
-                return str(whole)
-            else:
-                return f"{whole}-{remainder}/{drill_spec.denominator}"
-        elif drill_spec == 1:
-            return "1"
-        else:
-            return f"{drill_spec.numerator}/{drill_spec.denominator}"
-    elif isinstance(drill_spec, float):
-        return f"{drill_spec:.4f}"
-    else:
-        raise ValueError(f"Unknown drill spec type: {type(drill_spec)}")
-
 def format_decimal(value):
     """
     Format a decimal value to match the original spreadsheet format.
@@ -178,33 +136,575 @@ def format_screw_size(screw_key):
         return screw_key  # Fractional sizes are displayed as-is
 
 # ============================================================================
-# THREAD DATA ORGANIZED BY SCREW SIZE
+# DRILL VALUES
 # ============================================================================
 
-# Each screw size contains:
-# - major_diameter: Outer diameter of the thread
-# - threads: Dict of TPI -> thread specifications
-#   - minor_diameter: Inner diameter for this thread pitch
-#   - tap_75: Drill for 75% thread (soft materials)
-#   - tap_50: Drill for 50% thread (hard materials)
-# - clearance: Drill specifications (shared across all TPIs for this screw)
-#   - close_fit: Drill for close fit clearance hole
-#   - free_fit: Drill for free fit clearance hole
-
-THREAD_DATA = {
-    "#0": {
-        "major_diameter": 0.0600,
-        "threads": {
-            80: {
-                "minor_diameter": 0.0447,
-                "tap_75": Fraction(3, 64),
-                "tap_50": 55,
+class Drill:
+    """
+    One drill size, with everything the chart shows about it precomputed.
+    
+    The drills in the tables are interned: DRILLS holds the only instance
+    for each of their names, and parse_drill() looks them up. Other
+    fractional sizes get a new instance per parse, so drills hash and
+    compare by name. Instances are read-only.
+    
+    Attributes:
+        name: Canonical name, e.g. "#7", "F", "17/64", "1", "1-1/64"
+        kind: 'number', 'letter' or 'fraction'
+        decimal: Diameter in inches
+        display: Size as displayed (number drills without the '#')
+        decimal_text: Diameter as displayed, from format_decimal()
+    """
+    __slots__ = ('name', 'kind', 'decimal', 'display', 'decimal_text')
+    
+    def __init__(self, name, kind, decimal, display):
+        set_attribute = object.__setattr__
+        set_attribute(self, 'name', name)
+        set_attribute(self, 'kind', kind)
+        set_attribute(self, 'decimal', decimal)
+        set_attribute(self, 'display', display)
+        set_attribute(self, 'decimal_text', format_decimal(decimal))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Drill {self.name} is read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"Drill {self.name} is read-only")
+    
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, Drill):
+            return self.name == other.name
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash(self.name)
+    
+    def __reduce__(self):
+        # Copies and unpickled drills resolve to the interned instance, if any
+        return parse_drill, (self.name,)
+    
+    def __repr__(self):
+        return f"<Drill {self.name} ({self.decimal:.4f})>"
+
+# Drill registry: canonical name -> Drill
+DRILLS = {}
+
+def _register_drill(name, kind, decimal, display):
+    """Create and intern a drill."""
+    drill = DRILLS[name] = Drill(name, kind, decimal, display)
+    return drill
+
+def _fraction_name(numerator, denominator):
+    """Canonical name of a (reduced) fractional size, e.g. 65/64 -> '1-1/64'."""
+    whole, remainder = divmod(numerator, denominator)
+    if remainder == 0:
+        return str(whole)
+    if whole:
+        return f"{whole}-{remainder}/{denominator}"
+    return f"{remainder}/{denominator}"
+
+def _parse_fraction(text):
+    """Parse '17/64', '1-1/64' or '1' into a reduced (numerator, denominator), or None."""
+    from math import gcd
+    
+    whole, dash, fraction = text.rpartition('-')
+    numerator, slash, denominator = fraction.partition('/')
+    if dash and not (whole.isdigit() and slash):
+        return None  # A mixed number needs both parts: '-1', '1-' and '1-1' are not sizes
+    if not slash:
+        denominator = '1'
+    if not (numerator.isdigit() and denominator.isdigit()):
+        return None
+    numerator, denominator = int(numerator), int(denominator)
+    if denominator == 0:
+        return None
+    numerator += int(whole or 0) * denominator
+    divisor = gcd(numerator, denominator)
+    return numerator // divisor, denominator // divisor
+
+def parse_drill(text):
+    """
+    Look up a drill by name.
+    
+    Canonical names ("#7", "F", "17/64", "1-1/64") are a single dict lookup.
+    Other spellings are normalized first: "#07", "f" and "34/64" work too.
+    Fractional sizes that are not in the drill tables (such as a 1-3/8"
+    counterbore) are returned as new drills and are not added to DRILLS.
+    
+    Args:
+        text: Drill name
+    
+    Returns:
+        Drill
+    
+    Raises:
+        ValueError: If `text` is not a drill size
+    """
+    drill = DRILLS.get(text)
+    if drill is not None:
+        return drill
+    
+    name = text.strip().upper()
+    if name.startswith('#'):
+        if name[1:].isdigit():
+            drill = DRILLS.get(f"#{int(name[1:])}")
+    elif name.isalpha():
+        drill = DRILLS.get(name)
+    else:
+        fraction = _parse_fraction(name)
+        if fraction is not None and fraction[0]:
+            name = _fraction_name(*fraction)
+            drill = DRILLS.get(name)
+            if drill is None:
+                drill = Drill(name, 'fraction', round(fraction[0] / fraction[1], 4), name)
+    if drill is None:
+        raise ValueError(f"Unknown drill size: {text!r}")
+    return drill
+
+for _number, _decimal in NUMBER_DRILLS.items():
+    _register_drill(f"#{_number}", 'number', _decimal, str(_number))
+for _letter, _decimal in LETTER_DRILLS.items():
+    _register_drill(_letter, 'letter', _decimal, _letter)
+for _fraction, _decimal in FRACTIONAL_DRILLS.items():
+    _name = _fraction_name(_fraction.numerator, _fraction.denominator)
+    _register_drill(_name, 'fraction', _decimal, _name)
+del _number, _letter, _fraction, _name, _decimal
+
+# Every drill in the tables (number, letter then fractional), in table order
+STANDARD_DRILLS = tuple(DRILLS.values())
+
+def _legacy_drill(drill_spec):
+    """
+    Resolve an old-style drill spec (see get_drill_decimal()) to a Drill.
+    
+    As before, each spec type only looks in its own table: a size that is
+    not in it raises KeyError.
+    """
+    if isinstance(drill_spec, Drill):
+        return drill_spec
+    if isinstance(drill_spec, int):
+        table, name = NUMBER_DRILLS, f"#{drill_spec}"
+    elif isinstance(drill_spec, str):
+        table, name = LETTER_DRILLS, drill_spec
+    elif isinstance(drill_spec, Fraction):
+        table, name = FRACTIONAL_DRILLS, _fraction_name(drill_spec.numerator,
+                                                        drill_spec.denominator)
+    else:
+        raise ValueError(f"Unknown drill spec type: {type(drill_spec)}")
+    if drill_spec not in table:
+        raise KeyError(drill_spec)
+    return DRILLS[name]
+
+def get_drill_decimal(drill_spec):
+    """
+    Look up the decimal equivalent of a drill size.
+    
+    Kept for existing callers; new code should use parse_drill().decimal.
+    
+    Args:
+        drill_spec: Can be a Drill, int (number drill), str (letter drill),
+                   Fraction (fractional drill), or float (direct decimal)
+    
+    Returns:
+        float: Decimal equivalent in inches
+    """
+    if isinstance(drill_spec, float):
+        return drill_spec
+    return _legacy_drill(drill_spec).decimal
+
+def format_drill_size(drill_spec):
+    """
+    Format a drill size for display.
+    
+    Kept for existing callers; new code should use parse_drill().display.
+    
+    Args:
+        drill_spec: Can be a Drill, int (number drill), str (letter drill),
+                   Fraction (fractional drill), or float (direct decimal)
+    
+    Returns:
+        str: Formatted drill size (e.g., "53", "F", "3/64", "1-1/64")
+    """
+    if isinstance(drill_spec, float):
+        return f"{drill_spec:.4f}"
+    return _legacy_drill(drill_spec).display
+
+# ============================================================================
+# DRILL REVERSE LOOKUP (decimal -> drill)
+# ============================================================================
+
+class DrillIndex:
+    """
+    Sorted, array-backed reverse lookup from a decimal diameter to a drill.
+
+    Every number, letter and fractional drill is merged into one list sorted
+    by decimal size. Single queries use bisect on an ``array('d')``; the
+    ``*_many`` variants take a sequence (or NumPy array) of diameters and
+    resolve them all with one ``numpy.searchsorted`` call.
+
+    Drills with the same decimal keep the order of the source tables
+    (number, letter, fractional), so e.g. 0.2500 resolves to 'E' not 1/4.
+    """
+
+    def __init__(self, drills=None):
+        """
+        Args:
+            drills: Iterable of Drill (defaults to STANDARD_DRILLS)
+        """
+        if drills is None:
+            drills = STANDARD_DRILLS
+        self.drills = tuple(sorted(drills, key=lambda drill: drill.decimal))
+        self.decimals = array('d', (drill.decimal for drill in self.drills))
+        self._np_decimals = None
+        self._np_drills = None
+
+    def __len__(self):
+        return len(self.drills)
+
+    def nearest(self, diameter):
+        """
+        Find the drill closest to a diameter.
+
+        Args:
+            diameter: Diameter in inches
+
+        Returns:
+            Drill; ties go to the smaller drill
+        """
+        decimals = self.decimals
+        i = bisect_left(decimals, diameter)
+        if i == len(decimals) or (
+                i > 0 and diameter - decimals[i - 1] <= decimals[i] - diameter):
+            # Step back to the first of any drills sharing this decimal
+            i = bisect_left(decimals, decimals[i - 1])
+        return self.drills[i]
+
+    def next_larger(self, diameter):
+        """
+        Find the smallest drill that is at least the given diameter.
+
+        Returns:
+            Drill, or None if the diameter is larger than every drill
+        """
+        i = bisect_left(self.decimals, diameter)
+        if i == len(self.drills):
+            return None
+        return self.drills[i]
+
+    def next_smaller(self, diameter):
+        """
+        Find the largest drill that is no larger than the given diameter.
+
+        Returns:
+            Drill, or None if the diameter is smaller than every drill
+        """
+        decimals = self.decimals
+        i = bisect_right(decimals, diameter)
+        if i == 0:
+            return None
+        # Step back to the first of any drills sharing this decimal
+        return self.drills[bisect_left(decimals, decimals[i - 1])]
+
+    def _numpy_arrays(self):
+        """Lazily build the NumPy views used by the batched queries."""
+        if self._np_decimals is None:
+            import numpy as np
+            self._np_decimals = np.frombuffer(self.decimals, dtype=np.float64)
+            self._np_drills = np.empty(len(self.drills) + 1, dtype=object)
+            self._np_drills[:-1] = self.drills
+            self._np_drills[-1] = None  # target of out-of-range indices
+        return self._np_decimals, self._np_drills
+
+    def nearest_indices(self, diameters):
+        """
+        Vectorized form of nearest() returning positions in ``drills``.
+
+        Args:
+            diameters: Sequence or NumPy array of diameters in inches
+
+        Returns:
+            numpy.ndarray of int indices into ``self.drills``/``self.decimals``
+        """
+        import numpy as np
+        decimals, _ = self._numpy_arrays()
+        diameters = np.asarray(diameters, dtype=np.float64)
+        hi = np.searchsorted(decimals, diameters, side='left')
+        hi = np.clip(hi, 1, len(decimals) - 1)
+        lo = hi - 1
+        take_lo = (diameters - decimals[lo]) <= (decimals[hi] - diameters)
+        # Step back to the first of any drills sharing the chosen decimal
+        return np.searchsorted(decimals, decimals[np.where(take_lo, lo, hi)], side='left')
+
+    def nearest_many(self, diameters):
+        """
+        Vectorized nearest().
+
+        Returns:
+            numpy.ndarray (dtype=object) of Drill, same shape as input
+        """
+        _, drills = self._numpy_arrays()
+        return drills[self.nearest_indices(diameters)]
+
+    def next_larger_many(self, diameters):
+        """
+        Vectorized next_larger(); out-of-range entries are None.
+
+        Returns:
+            numpy.ndarray (dtype=object) of Drill, same shape as input
+        """
+        import numpy as np
+        decimals, drills = self._numpy_arrays()
+        idx = np.searchsorted(decimals, np.asarray(diameters, dtype=np.float64), side='left')
+        # idx == len(decimals) already points at the trailing None
+        return drills[idx]
+
+    def next_smaller_many(self, diameters):
+        """
+        Vectorized next_smaller(); out-of-range entries are None.
+
+        Returns:
+            numpy.ndarray (dtype=object) of Drill, same shape as input
+        """
+        import numpy as np
+        decimals, drills = self._numpy_arrays()
+        idx = np.searchsorted(decimals, np.asarray(diameters, dtype=np.float64), side='right') - 1
+        below = idx < 0
+        # Step back to the first of any drills sharing this decimal
+        idx = np.searchsorted(decimals, decimals[np.maximum(idx, 0)], side='left')
+        idx[below] = -1  # wraps around to the trailing None
+        return drills[idx]
+
+# Shared index over all drill tables
+DRILL_INDEX = DrillIndex()
+
+# ============================================================================
+# THREAD CATALOGUE (array-backed, loaded from thread_catalogue.csv)
+# ============================================================================
+
+# One row per thread (screw size + pitch) in the data file, with columns:
+# - series: UNC, UNF, UNEF, 8-UN (inch) or M, MF (ISO metric coarse / fine)
+# - size: Screw size as written, e.g. "#10", "1/4", "1-1/8", "M6"
+# - major, minor: Major and minor diameter (inches, or mm for metric)
+# - pitch: Threads per inch (or pitch in mm for metric)
+# - tap_75, tap_50: Drill for 75% / 50% thread, "-" if there is none
+# - close_fit, free_fit: Clearance drills, "-" if not tabulated
+# Drills are written "#53" (number), "F" (letter), "3/64" or "1-1/64".
+# The chart's rows are hand-checked values; the rest of the inch series and
+# all metric taps are the nearest drill to the theoretical size.
+THREAD_CATALOGUE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                     'thread_catalogue.csv')
+
+THREAD_SERIES = ('UNC', 'UNF', 'UNEF', '8-UN', 'M', 'MF')
+METRIC_SERIES = frozenset(('M', 'MF'))
+
+# Series and size range shown on the chart
+CHART_SERIES = ('UNC', 'UNF', 'UNEF')
+CHART_MAX_MAJOR = 1.0
+
+MM_PER_INCH = 25.4
+
+# Bump whenever the layout of the compiled cache below changes
+CATALOGUE_CACHE_VERSION = 1
+
+def catalogue_cache_path(path):
+    """Compiled cache file for a catalogue file, in __pycache__ beside it."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, '__pycache__', name + '.cache')
+
+class ThreadCatalogue:
+    """
+    Column store of every thread in the catalogue file.
+    
+    Each column is a flat array with one entry per thread, in file order:
+    ``series`` (``array('B')`` of THREAD_SERIES positions), ``major``,
+    ``minor`` and ``tpi`` (``array('d')``, all in inches / threads per inch,
+    metric rows converted), and ``tap_75``, ``tap_50``, ``close_fit`` and
+    ``free_fit`` (``array('h')`` of positions in the drill index's ``drills``,
+    -1 where there is no drill). ``sizes`` holds the size labels.
+    
+    Parsing the CSV (and the drill fractions in it) dominates start-up, so
+    the parsed columns are also written to a marshal cache. Later loads read
+    the raw array bytes back from it as long as the CSV's mtime and size and
+    the drill index are unchanged, much like a .pyc file.
+    
+    Range and series queries run as one vectorized NumPy mask over the
+    columns; NumPy is imported on the first query.
+    """
+    
+    DRILL_COLUMNS = ('tap_75', 'tap_50', 'close_fit', 'free_fit')
+    
+    # (attribute, array typecode) of every column
+    COLUMNS = (('series', 'B'), ('major', 'd'), ('minor', 'd'), ('tpi', 'd'),
+               ('tap_75', 'h'), ('tap_50', 'h'), ('close_fit', 'h'), ('free_fit', 'h'))
+    
+    def __init__(self, path=None, drill_index=None, cache_path=None):
+        """
+        Args:
+            path: Catalogue CSV file (defaults to THREAD_CATALOGUE_FILE)
+            drill_index: DrillIndex the drill columns refer to (defaults to
+                         DRILL_INDEX)
+            cache_path: Compiled cache file (defaults to
+                        catalogue_cache_path(path)), or False to always
+                        parse the CSV
+        """
+        if path is None:
+            path = THREAD_CATALOGUE_FILE
+        if drill_index is None:
+            drill_index = DRILL_INDEX
+        self.drill_index = drill_index
+        self._np_columns = None
+        
+        if cache_path is False:
+            self._parse(path)
+            return
+        if cache_path is None:
+            cache_path = catalogue_cache_path(path)
+        key = self._cache_key(path)
+        if not self._load_cache(cache_path, key):
+            self._parse(path)
+            self._save_cache(cache_path, key)
+    
+    def _parse(self, path):
+        """Fill the columns from the catalogue CSV."""
+        import csv
+        
+        positions = {drill: i for i, drill in enumerate(self.drill_index.drills)}
+        series_codes = {name: i for i, name in enumerate(THREAD_SERIES)}
+        
+        columns = {name: array(typecode) for name, typecode in self.COLUMNS}
+        sizes = []
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                major, minor, pitch = float(row['major']), float(row['minor']), float(row['pitch'])
+                if row['series'] in METRIC_SERIES:
+                    major, minor, pitch = (major / MM_PER_INCH, minor / MM_PER_INCH,
+                                           MM_PER_INCH / pitch)
+                columns['series'].append(series_codes[row['series']])
+                sizes.append(row['size'])
+                columns['major'].append(major)
+                columns['minor'].append(minor)
+                columns['tpi'].append(pitch)
+                for column in self.DRILL_COLUMNS:
+                    text = row[column]
+                    columns[column].append(-1 if text == '-' else positions[parse_drill(text)])
+        for name, values in columns.items():
+            setattr(self, name, values)
+        self.sizes = tuple(sizes)
+    
+    def _cache_key(self, path):
+        """What a cache must have been built from to be used for `path`."""
+        import sys
+        
+        stat = os.stat(path)
+        # The drill columns are positions in the index, so they are only
+        # valid for the same drills
+        return (CATALOGUE_CACHE_VERSION, sys.byteorder, stat.st_mtime_ns, stat.st_size,
+                self.drill_index.decimals.tobytes())
+    
+    def _load_cache(self, cache_path, key):
+        """
+        Fill the columns from a compiled cache.
+        
+        Returns:
+            bool: False if the cache is missing, unreadable or stale
+        """
+        import marshal
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, columns, sizes = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if cached_key != key:
+            return False
+        for (name, typecode), data in zip(self.COLUMNS, columns):
+            setattr(self, name, array(typecode, data))
+        self.sizes = sizes
+        return True
+    
+    def _save_cache(self, cache_path, key):
+        """Write the compiled cache, ignoring a read-only install location."""
+        import marshal
+        
+        columns = tuple(getattr(self, name).tobytes() for name, _ in self.COLUMNS)
+        # Per-process temporary name, as parallel workers may race to write it
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                marshal.dump((key, columns, self.sizes), f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
+    def __len__(self):
+        return len(self.sizes)
+    
+    def _numpy_columns(self):
+        """Lazily build zero-copy NumPy views of the numeric columns."""
+        if self._np_columns is None:
+            import numpy as np
+            self._np_columns = {
+                'series': np.frombuffer(self.series, dtype=np.uint8),
+                'major': np.frombuffer(self.major, dtype=np.float64),
+                'tpi': np.frombuffer(self.tpi, dtype=np.float64),
             }
-        },
-        "clearance": {"close_fit": 52, "free_fit": 50},
+        return self._np_columns
+    
+    def select(self, series=None, min_major=None, max_major=None):
+        """
+        Find the threads in some series and/or major diameter range.
+        
+        Args:
+            series: Iterable of series names (default: every series)
+            min_major: Smallest major diameter in inches, inclusive
+            max_major: Largest major diameter in inches, inclusive
+        
+        Returns:
+            numpy.ndarray of row indices, sorted by major diameter and then
+            by TPI (ties keep file order)
+        """
+        import numpy as np
+        columns = self._numpy_columns()
+        major = columns['major']
+        mask = np.ones(len(major), dtype=bool)
+        if series is not None:
+            codes = [THREAD_SERIES.index(name) for name in series]
+            mask &= np.isin(columns['series'], codes)
+        if min_major is not None:
+            mask &= major >= min_major
+        if max_major is not None:
+            mask &= major <= max_major
+        rows = np.flatnonzero(mask)
+        order = np.lexsort((columns['tpi'][rows], major[rows]))
+        return rows[order]
+    
+    def drill(self, column, row):
+        """Drill in a drill column (e.g. 'tap_75') of a row, or None."""
+        position = getattr(self, column)[row]
+        return None if position < 0 else self.drill_index.drills[position]
+
+# Shared catalogue loaded from THREAD_CATALOGUE_FILE
+THREAD_CATALOGUE = ThreadCatalogue()
+
+# ============================================================================
+# CAP SCREW DATA BY SCREW SIZE
+# ============================================================================
+
+# Keyed by catalogue size; sizes without socket head cap screw data are
+# omitted. Each screw size may contain:
+# - shcs: Socket head cap screw hex key and counterbore
+# - fhcs: Flat head cap screw hex key and countersink depth
+# Hex key sizes are the text shown on the chart; counterbore drills are
+# parse_drill() names.
+
+CAP_SCREW_DATA = {
+    "#0": {
         "shcs": {
             "hex": "0.050",
-            "counterbore_drill": Fraction(1, 8),
+            "counterbore_drill": "1/8",
             "counterbore_dia": 0.125,
             "counterbore_depth": 0.074
         },
@@ -214,1005 +714,2481 @@ THREAD_DATA = {
         }
     },
     "#1": {
-        "major_diameter": 0.0730,
-        "threads": {
-            64: {
-                "minor_diameter": 0.0538,
-                "tap_75": 53,
-                "tap_50": Fraction(1, 16),
-            },
-            72: {
-                "minor_diameter": 0.0560,
-                "tap_75": 53,
-                "tap_50": 52,
-            }
-        },
-        "clearance": {"close_fit": 48, "free_fit": 46},
         "shcs": {
-            "hex": Fraction(1, 16),
-            "counterbore_drill": Fraction(5, 32),
+            "hex": "1/16",
+            "counterbore_drill": "5/32",
             "counterbore_dia": 0.15625,
             "counterbore_depth": 0.087
         },
         "fhcs": {
-            "hex": Fraction(1, 20),
+            "hex": "1/20",
             "countersink_depth": 0.054
         }
     },
     "#2": {
-        "major_diameter": 0.0860,
-        "threads": {
-            56: {
-                "minor_diameter": 0.0641,
-                "tap_75": 50,
-                "tap_50": 49,
-            },
-            64: {
-                "minor_diameter": 0.0668,
-                "tap_75": 50,
-                "tap_50": 48,
-            }
-        },
-        "clearance": {"close_fit": 43, "free_fit": 41},
         "shcs": {
-            "hex": Fraction(5, 64),
-            "counterbore_drill": Fraction(3, 16),
+            "hex": "5/64",
+            "counterbore_drill": "3/16",
             "counterbore_dia": 0.1875,
             "counterbore_depth": 0.102
         },
         "fhcs": {
-            "hex": Fraction(1, 20),
+            "hex": "1/20",
             "countersink_depth": 0.064
         }
     },
     "#3": {
-        "major_diameter": 0.0990,
-        "threads": {
-            48: {
-                "minor_diameter": 0.0734,
-                "tap_75": 47,
-                "tap_50": 44,
-            },
-            56: {
-                "minor_diameter": 0.0771,
-                "tap_75": 45,
-                "tap_50": 43,
-            }
-        },
-        "clearance": {"close_fit": 37, "free_fit": 35},
         "shcs": {
-            "hex": Fraction(5, 64),
-            "counterbore_drill": Fraction(7, 32),
+            "hex": "5/64",
+            "counterbore_drill": "7/32",
             "counterbore_dia": 0.21875,
             "counterbore_depth": 0.115
         },
         "fhcs": {
-            "hex": Fraction(1, 16),
+            "hex": "1/16",
             "countersink_depth": 0.073
         }
     },
     "#4": {
-        "major_diameter": 0.1120,
-        "threads": {
-            40: {
-                "minor_diameter": 0.0813,
-                "tap_75": 43,
-                "tap_50": 41,
-            },
-            48: {
-                "minor_diameter": 0.0864,
-                "tap_75": 42,
-                "tap_50": 40,
-            }
-        },
-        "clearance": {"close_fit": 32, "free_fit": 30},
         "shcs": {
-            "hex": Fraction(3, 32),
-            "counterbore_drill": Fraction(7, 32),
+            "hex": "3/32",
+            "counterbore_drill": "7/32",
             "counterbore_dia": 0.21875,
             "counterbore_depth": 0.130
         },
         "fhcs": {
-            "hex": Fraction(1, 16),
+            "hex": "1/16",
             "countersink_depth": 0.083
         }
     },
     "#5": {
-        "major_diameter": 0.1250,
-        "threads": {
-            40: {
-                "minor_diameter": 0.0943,
-                "tap_75": 38,
-                "tap_50": Fraction(7, 64),
-            },
-            44: {
-                "minor_diameter": 0.0971,
-                "tap_75": 37,
-                "tap_50": 35,
-            }
-        },
-        "clearance": {"close_fit": 30, "free_fit": 29},
         "shcs": {
-            "hex": Fraction(3, 32),
-            "counterbore_drill": Fraction(1, 4),
+            "hex": "3/32",
+            "counterbore_drill": "1/4",
             "counterbore_dia": 0.250,
             "counterbore_depth": 0.145
         },
         "fhcs": {
-            "hex": Fraction(5, 64),
+            "hex": "5/64",
             "countersink_depth": 0.090
         }
     },
     "#6": {
-        "major_diameter": 0.1380,
-        "threads": {
-            32: {
-                "minor_diameter": 0.0997,
-                "tap_75": 36,
-                "tap_50": 32,
-            },
-            40: {
-                "minor_diameter": 0.1073,
-                "tap_75": 33,
-                "tap_50": 31,
-            }
-        },
-        "clearance": {"close_fit": 27, "free_fit": 25},
         "shcs": {
-            "hex": Fraction(7, 64),
-            "counterbore_drill": Fraction(9, 32),
+            "hex": "7/64",
+            "counterbore_drill": "9/32",
             "counterbore_dia": 0.28125,
             "counterbore_depth": 0.158
         },
         "fhcs": {
-            "hex": Fraction(5, 64),
+            "hex": "5/64",
             "countersink_depth": 0.097
         }
     },
     "#8": {
-        "major_diameter": 0.1640,
-        "threads": {
-            32: {
-                "minor_diameter": 0.1257,
-                "tap_75": 29,
-                "tap_50": 27,
-            },
-            36: {
-                "minor_diameter": 0.1299,
-                "tap_75": 29,
-                "tap_50": 26,
-            }
-        },
-        "clearance": {"close_fit": 18, "free_fit": 16},
         "shcs": {
-            "hex": Fraction(9, 64),
-            "counterbore_drill": Fraction(5, 16),
+            "hex": "9/64",
+            "counterbore_drill": "5/16",
             "counterbore_dia": 0.3125,
             "counterbore_depth": 0.188
         },
         "fhcs": {
-            "hex": Fraction(3, 32),
+            "hex": "3/32",
             "countersink_depth": 0.112
         }
     },
     "#10": {
-        "major_diameter": 0.1900,
-        "threads": {
-            24: {
-                "minor_diameter": 0.1389,
-                "tap_75": 25,
-                "tap_50": 20,
-            },
-            32: {
-                "minor_diameter": 0.1517,
-                "tap_75": 21,
-                "tap_50": 18,
-            }
-        },
-        "clearance": {"close_fit": 9, "free_fit": 7},
         "shcs": {
-            "hex": Fraction(5, 32),
-            "counterbore_drill": Fraction(3, 8),
+            "hex": "5/32",
+            "counterbore_drill": "3/8",
             "counterbore_dia": 0.375,
             "counterbore_depth": 0.218
         },
         "fhcs": {
-            "hex": Fraction(1, 8),
+            "hex": "1/8",
             "countersink_depth": 0.127
         }
     },
     "#12": {
-        "major_diameter": 0.2160,
-        "threads": {
-            24: {
-                "minor_diameter": 0.1649,
-                "tap_75": 16,
-                "tap_50": 12,
-            },
-            28: {
-                "minor_diameter": 0.1722,
-                "tap_75": 14,
-                "tap_50": 10,
-            },
-            32: {
-                "minor_diameter": 0.1777,
-                "tap_75": 13,
-                "tap_50": 9,
-            }
-        },
-        "clearance": {"close_fit": 2, "free_fit": 1},
         "shcs": {
-            "hex": Fraction(5, 32),
-            "counterbore_drill": Fraction(3, 8),
+            "hex": "5/32",
+            "counterbore_drill": "3/8",
             "counterbore_dia": 0.375,
             "counterbore_depth": 0.218
         },
         "fhcs": {
-            "hex": Fraction(1, 8),
+            "hex": "1/8",
             "countersink_depth": 0.135
         }
     },
     "1/4": {
-        "major_diameter": 0.2500,
-        "threads": {
-            20: {
-                "minor_diameter": 0.1887,
-                "tap_75": 7,
-                "tap_50": Fraction(7, 32),
-            },
-            28: {
-                "minor_diameter": 0.2062,
-                "tap_75": 3,
-                "tap_50": 1,
-            },
-            32: {
-                "minor_diameter": 0.2117,
-                "tap_75": Fraction(7, 32),
-                "tap_50": 1,
-            }
-        },
-        "clearance": {"close_fit": 'F', "free_fit": 'H'},
         "shcs": {
-            "hex": Fraction(3, 16),
-            "counterbore_drill": Fraction(7, 16),
+            "hex": "3/16",
+            "counterbore_drill": "7/16",
             "counterbore_dia": 0.4375,
             "counterbore_depth": 0.278
         },
         "fhcs": {
-            "hex": Fraction(5, 32),
+            "hex": "5/32",
             "countersink_depth": 0.161
         }
     },
     "5/16": {
-        "major_diameter": 0.3125,
-        "threads": {
-            18: {
-                "minor_diameter": 0.2443,
-                "tap_75": 'F',
-                "tap_50": 'J',
-            },
-            24: {
-                "minor_diameter": 0.2614,
-                "tap_75": 'I',
-                "tap_50": Fraction(9, 32),
-            },
-            32: {
-                "minor_diameter": 0.2742,
-                "tap_75": Fraction(9, 32),
-                "tap_50": 'L',
-            }
-        },
-        "clearance": {"close_fit": 'P', "free_fit": 'Q'},
         "shcs": {
-            "hex": Fraction(1, 4),
-            "counterbore_drill": Fraction(17, 32),
+            "hex": "1/4",
+            "counterbore_drill": "17/32",
             "counterbore_dia": 0.53125,
             "counterbore_depth": 0.346
         },
         "fhcs": {
-            "hex": Fraction(3, 16),
+            "hex": "3/16",
             "countersink_depth": 0.198
         }
     },
     "3/8": {
-        "major_diameter": 0.3750,
-        "threads": {
-            16: {
-                "minor_diameter": 0.2983,
-                "tap_75": Fraction(5, 16),
-                "tap_50": 'Q',
-            },
-            24: {
-                "minor_diameter": 0.3239,
-                "tap_75": 'Q',
-                "tap_50": 'S',
-            },
-            32: {
-                "minor_diameter": 0.3367,
-                "tap_75": Fraction(11, 32),
-                "tap_50": 'T',
-            }
-        },
-        "clearance": {"close_fit": 'W', "free_fit": 'X'},
         "shcs": {
-            "hex": Fraction(5, 16),
-            "counterbore_drill": Fraction(5, 8),
+            "hex": "5/16",
+            "counterbore_drill": "5/8",
             "counterbore_dia": 0.625,
             "counterbore_depth": 0.415
         },
         "fhcs": {
-            "hex": Fraction(7, 32),
+            "hex": "7/32",
             "countersink_depth": 0.234
         }
     },
     "7/16": {
-        "major_diameter": 0.4375,
-        "threads": {
-            14: {
-                "minor_diameter": 0.3499,
-                "tap_75": 'U',
-                "tap_50": Fraction(25, 64),
-            },
-            20: {
-                "minor_diameter": 0.3762,
-                "tap_75": Fraction(25, 64),
-                "tap_50": Fraction(13, 32),
-            },
-            28: {
-                "minor_diameter": 0.3937,
-                "tap_75": 'Y',
-                "tap_50": 'Z',
-            }
-        },
-        "clearance": {"close_fit": Fraction(29, 64), "free_fit": Fraction(15, 32)},
         "shcs": {
-            "hex": Fraction(3, 8),
-            "counterbore_drill": Fraction(23, 32),
+            "hex": "3/8",
+            "counterbore_drill": "23/32",
             "counterbore_dia": 0.71875,
             "counterbore_depth": 0.483
         },
         "fhcs": {
-            "hex": Fraction(1, 4),
+            "hex": "1/4",
             "countersink_depth": 0.234
         }
     },
     "1/2": {
-        "major_diameter": 0.5000,
-        "threads": {
-            13: {
-                "minor_diameter": 0.4056,
-                "tap_75": Fraction(27, 64),
-                "tap_50": Fraction(29, 64),
-            },
-            20: {
-                "minor_diameter": 0.4387,
-                "tap_75": Fraction(29, 64),
-                "tap_50": Fraction(15, 32),
-            },
-            28: {
-                "minor_diameter": 0.4562,
-                "tap_75": Fraction(15, 32),
-                "tap_50": Fraction(15, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(33, 64), "free_fit": Fraction(17, 32)},
         "shcs": {
-            "hex": Fraction(3, 8),
-            "counterbore_drill": Fraction(13, 16),
+            "hex": "3/8",
+            "counterbore_drill": "13/16",
             "counterbore_dia": 0.8125,
             "counterbore_depth": 0.552
         },
         "fhcs": {
-            "hex": Fraction(5, 16),
+            "hex": "5/16",
             "countersink_depth": 0.251
         }
     },
     "9/16": {
-        "major_diameter": 0.5625,
-        "threads": {
-            12: {
-                "minor_diameter": 0.4603,
-                "tap_75": Fraction(31, 64),
-                "tap_50": Fraction(33, 64),
-            },
-            18: {
-                "minor_diameter": 0.4943,
-                "tap_75": Fraction(33, 64),
-                "tap_50": Fraction(17, 32),
-            },
-            24: {
-                "minor_diameter": 0.5114,
-                "tap_75": Fraction(33, 64),
-                "tap_50": Fraction(17, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(37, 64), "free_fit": Fraction(19, 32)},
         "shcs": {
-            "hex": Fraction(1, 2),
-            "counterbore_drill": Fraction(29, 32),
+            "hex": "1/2",
+            "counterbore_drill": "29/32",
             "counterbore_dia": 0.9062,
             "counterbore_depth": 0.594
         }
     },
     "5/8": {
-        "major_diameter": 0.6250,
-        "threads": {
-            11: {
-                "minor_diameter": 0.5135,
-                "tap_75": Fraction(17, 32),
-                "tap_50": Fraction(9, 16),
-            },
-            18: {
-                "minor_diameter": 0.5568,
-                "tap_75": Fraction(37, 64),
-                "tap_50": Fraction(19, 32),
-            },
-            24: {
-                "minor_diameter": 0.5739,
-                "tap_75": Fraction(37, 64),
-                "tap_50": Fraction(19, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(41, 64), "free_fit": Fraction(21, 32)},
         "shcs": {
-            "hex": Fraction(1, 2),
-            "counterbore_drill": Fraction(1, 1),
+            "hex": "1/2",
+            "counterbore_drill": "1",
             "counterbore_dia": 1.0,
             "counterbore_depth": 0.689
         },
         "fhcs": {
-            "hex": Fraction(3, 8),
+            "hex": "3/8",
             "countersink_depth": 0.324
         }
     },
-    "11/16": {
-        "major_diameter": 0.6875,
-        "threads": {
-            24: {
-                "minor_diameter": 0.6364,
-                "tap_75": Fraction(41, 64),
-                "tap_50": Fraction(21, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(45, 64), "free_fit": Fraction(23, 32)}
-    },
     "3/4": {
-        "major_diameter": 0.7500,
-        "threads": {
-            10: {
-                "minor_diameter": 0.6273,
-                "tap_75": Fraction(21, 32),
-                "tap_50": Fraction(11, 16),
-            },
-            16: {
-                "minor_diameter": 0.6733,
-                "tap_75": Fraction(11, 16),
-                "tap_50": Fraction(45, 64),
-            },
-            20: {
-                "minor_diameter": 0.6887,
-                "tap_75": Fraction(45, 64),
-                "tap_50": Fraction(23, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(49, 64), "free_fit": Fraction(25, 32)},
         "shcs": {
-            "hex": Fraction(5, 8),
-            "counterbore_drill": Fraction(19, 16),
+            "hex": "5/8",
+            "counterbore_drill": "1-3/16",
             "counterbore_dia": 1.1875,
             "counterbore_depth": 0.828
         },
         "fhcs": {
-            "hex": Fraction(1, 2),
+            "hex": "1/2",
             "countersink_depth": 0.396
         }
     },
-    "13/16": {
-        "major_diameter": 0.8125,
-        "threads": {
-            20: {
-                "minor_diameter": 0.7512,
-                "tap_75": Fraction(49, 64),
-                "tap_50": Fraction(25, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(53, 64), "free_fit": Fraction(27, 32)}
-    },
     "7/8": {
-        "major_diameter": 0.8750,
-        "threads": {
-            9: {
-                "minor_diameter": 0.7387,
-                "tap_75": Fraction(49, 64),
-                "tap_50": Fraction(51, 64),
-            },
-            14: {
-                "minor_diameter": 0.7874,
-                "tap_75": Fraction(13, 16),
-                "tap_50": Fraction(53, 64),
-            },
-            20: {
-                "minor_diameter": 0.8137,
-                "tap_75": Fraction(53, 64),
-                "tap_50": Fraction(27, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(57, 64), "free_fit": Fraction(29, 32)},
         "shcs": {
-            "hex": Fraction(3, 4),
-            "counterbore_drill": Fraction(11, 8),
+            "hex": "3/4",
+            "counterbore_drill": "1-3/8",
             "counterbore_dia": 1.375,
             "counterbore_depth": 0.963
         },
         "fhcs": {
-            "hex": Fraction(9, 16),
+            "hex": "9/16",
             "countersink_depth": 0.468
         }
     },
-    "15/16": {
-        "major_diameter": 0.9375,
-        "threads": {
-            20: {
-                "minor_diameter": 0.8762,
-                "tap_75": Fraction(57, 64),
-                "tap_50": Fraction(29, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(61, 64), "free_fit": Fraction(31, 32)}
-    },
-    "1\"": {  # 1 inch screw
-        "major_diameter": 1.0000,
-        "threads": {
-            8: {
-                "minor_diameter": 0.8466,
-                "tap_75": Fraction(7, 8),
-                "tap_50": Fraction(59, 64),
-            },
-            12: {
-                "minor_diameter": 0.8978,
-                "tap_75": Fraction(15, 16),
-                "tap_50": Fraction(61, 64),
-            },
-            20: {
-                "minor_diameter": 0.9387,
-                "tap_75": Fraction(61, 64),
-                "tap_50": Fraction(31, 32),
-            }
-        },
-        "clearance": {"close_fit": Fraction(65, 64), "free_fit": Fraction(33, 32)},
+    "1": {  # 1 inch screw
         "shcs": {
-            "hex": Fraction(3, 4),
-            "counterbore_drill": Fraction(13, 8),
+            "hex": "3/4",
+            "counterbore_drill": "1-5/8",
             "counterbore_dia": 1.625,
             "counterbore_depth": 1.100
         },
         "fhcs": {
-            "hex": Fraction(5, 8),
+            "hex": "5/8",
             "countersink_depth": 0.540
         }
     },
 }
 
-# ============================================================================
-# SPREADSHEET GENERATION
-# ============================================================================
-
-# Define styles (shared across all sheets)
-header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-subheader_fill = PatternFill(start_color="E8E8E8", end_color="E8E8E8", fill_type="solid")
-alt_row_fill = PatternFill(start_color="E2E2E2", end_color="E2E2E2", fill_type="solid")
-center_align = Alignment(horizontal="center", vertical="center")
-center_align_wrap = Alignment(horizontal="center", vertical="center", wrap_text=True)
-thin_border = Border(
-    left=Side(style='thin'),
-    right=Side(style='thin'),
-    top=Side(style='thin'),
-    bottom=Side(style='thin')
-)
+def _legacy_drill_spec(drill):
+    """Old-style spec of a Drill: int (number), str (letter) or Fraction."""
+    if drill.kind == 'number':
+        return int(drill.display)
+    if drill.kind == 'letter':
+        return drill.name
+    return Fraction(*_parse_fraction(drill.name))
 
-def create_sheet(ws, config):
-    """
-    Create a worksheet with tap and drill data.
-    
-    Args:
-        ws: Worksheet object to populate
-        config: Dictionary with page configuration
+def build_thread_data(catalogue=None):
     """
-    # Create fonts with sizes from config
-    header_font_size = config.get('header_font_size', 11)
-    data_font_size = config.get('data_font_size', 11)
-    bold_font = Font(bold=True, size=header_font_size)
-    data_font = Font(size=data_font_size)
-    # Create header rows
-    # Row 1: Main headers with column spans
-    ws.merge_cells('A1:A3')  # Screw Size
-    ws['A1'] = "Screw Size"
-    ws['A1'].font = bold_font
-    ws['A1'].alignment = center_align_wrap
-
-    ws.merge_cells('B1:B3')  # Major Diameter
-    ws['B1'] = "Major Diameter"
-    ws['B1'].font = bold_font
-    ws['B1'].alignment = center_align_wrap
-
-    ws.merge_cells('C1:C3')  # Threads Per Inch
-    ws['C1'] = "TPI"
-    ws['C1'].font = bold_font
-    ws['C1'].alignment = center_align_wrap
-    
-    ws.merge_cells('D1:D3')  # Minor Diameter
-    ws['D1'] = "Minor Diameter"
-    ws['D1'].font = bold_font
-    ws['D1'].alignment = center_align_wrap
-    
-    # Tap Drill section
-    ws.merge_cells('E1:H1')  # Tap Drill header
-    ws['E1'] = "Tap Drill"
-    ws['E1'].font = bold_font
-    ws['E1'].alignment = center_align_wrap
-    
-    ws.merge_cells('E2:F2')  # 75% Thread subsection
-    ws['E2'] = "75% Thread for Aluminum, Brass, Plastics"
-    ws['E2'].font = bold_font
-    ws['E2'].alignment = center_align_wrap
-    
-    ws.merge_cells('G2:H2')  # 50% Thread subsection
-    ws['G2'] = "50% Thread for Stainless, Cast Iron & Iron"
-    ws['G2'].font = bold_font
-    ws['G2'].alignment = center_align_wrap
-    
-    # Clearance Drill section
-    ws.merge_cells('I1:L1')  # Clearance Drill header
-    ws['I1'] = "Clearance Drill"
-    ws['I1'].font = bold_font
-    ws['I1'].alignment = center_align_wrap
-    
-    ws.merge_cells('I2:J2')  # Close Fit subsection
-    ws['I2'] = "Close Fit"
-    ws['I2'].font = bold_font
-    ws['I2'].alignment = center_align_wrap
-    
-    ws.merge_cells('K2:L2')  # Free Fit subsection
-    ws['K2'] = "Free Fit"
-    ws['K2'].font = bold_font
-    ws['K2'].alignment = center_align_wrap
-    
-    # SHCS section
-    ws.merge_cells('M1:P1')  # SHCS header
-    ws['M1'] = "Socket Head Cap Screws"
-    ws['M1'].font = bold_font
-    ws['M1'].alignment = center_align_wrap
-    
-    ws.merge_cells('M2:M3')  # Hex subsection
-    ws['M2'] = "Hex"
-    ws['M2'].font = bold_font
-    ws['M2'].alignment = center_align_wrap
-    
-    ws.merge_cells('N2:P2')  # Counterbore subsection
-    ws['N2'] = "Counterbore"
-    ws['N2'].font = bold_font
-    ws['N2'].alignment = center_align_wrap
-    
-    # FHCS section
-    ws.merge_cells('Q1:R1')  # FHCS header
-    ws['Q1'] = "Flat Head Cap Screws"
-    ws['Q1'].font = bold_font
-    ws['Q1'].alignment = center_align_wrap
+    Build the old THREAD_DATA table from the catalogue and CAP_SCREW_DATA.
     
-    ws.merge_cells('Q2:Q3')  # Hex subsection
-    ws['Q2'] = "Hex"
-    ws['Q2'].font = bold_font
-    ws['Q2'].alignment = center_align_wrap
+    Kept for existing callers; the chart itself reads THREAD_CATALOGUE.
+    Drills are old-style specs (see get_drill_decimal()), and hex key
+    sizes are Fractions where they are fractional.
     
-    ws.merge_cells('R2:R3')  # Countersink Depth subsection
-    ws['R2'] = "Countersink Depth"
-    ws['R2'].font = bold_font
-    ws['R2'].alignment = center_align_wrap
+    Args:
+        catalogue: ThreadCatalogue (defaults to THREAD_CATALOGUE)
     
-    # Row 3: Column detail headers
-    headers_row3 = [
-        "", "", "", "",  # A-D (already merged from rows 1-3)
-        "Drill Size", "Dec. Eq.",  # E-F (75% Thread)
-        "Drill Size", "Dec. Eq.",  # G-H (50% Thread)
-        "Drill Size", "Dec. Eq.",  # I-J (Close Fit)
-        "Drill Size", "Dec. Eq.",  # K-L (Free Fit)
-        "",  # M (Hex - merged from row 2-3)
-        "Drill Size", "Dec. Eq.", "Depth",  # N-P (Counterbore)
-        "", ""  # Q-R (FHCS Hex and Countersink Depth - merged from row 2-3)
-    ]
+    Returns:
+        dict: {screw size: {"major_diameter", "threads": {tpi: {"minor_diameter",
+              "tap_75", "tap_50"}}, "clearance": {"close_fit", "free_fit"},
+              and "shcs"/"fhcs" where known}}, for the CHART_SERIES threads up
+              to CHART_MAX_MAJOR in major diameter order. Whole-inch sizes are
+              keyed like '1"'.
+    """
+    if catalogue is None:
+        catalogue = THREAD_CATALOGUE
     
-    for col, header in enumerate(headers_row3, start=1):
-        if header:  # Skip empty cells (A-D)
-            cell = ws.cell(row=3, column=col)
-            cell.value = header
-            cell.font = bold_font
-            cell.alignment = center_align_wrap
+    def spec(column, row):
+        drill = catalogue.drill(column, row)
+        return None if drill is None else _legacy_drill_spec(drill)
     
-    # Generate data rows from structured data
-    current_row = 4
-    alternate_color = False  # Track alternating colors for screw sizes
+    thread_data = {}
+    for row in catalogue.select(CHART_SERIES, max_major=CHART_MAX_MAJOR).tolist():
+        size = catalogue.sizes[row]
+        key = f'{size}"' if size.isdigit() else size
+        screw_data = thread_data.get(key)
+        if screw_data is None:
+            screw_data = thread_data[key] = {
+                "major_diameter": catalogue.major[row],
+                "threads": {},
+                "clearance": {"close_fit": spec('close_fit', row),
+                              "free_fit": spec('free_fit', row)},
+            }
+            for kind, values in CAP_SCREW_DATA.get(size, {}).items():
+                values = dict(values)
+                hex_fraction = _parse_fraction(values['hex'])
+                if hex_fraction is not None:
+                    values['hex'] = Fraction(*hex_fraction)
+                if 'counterbore_drill' in values:
+                    values['counterbore_drill'] = _legacy_drill_spec(
+                        parse_drill(values['counterbore_drill']))
+                screw_data[kind] = values
+        screw_data["threads"][round(catalogue.tpi[row])] = {
+            "minor_diameter": catalogue.minor[row],
+            "tap_75": spec('tap_75', row),
+            "tap_50": spec('tap_50', row),
+        }
+    return thread_data
+
+def __getattr__(name):
+    # THREAD_DATA is built on first access so importing stays cheap
+    if name == 'THREAD_DATA':
+        thread_data = globals()['THREAD_DATA'] = build_thread_data()
+        return thread_data
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ============================================================================
+# COMPUTED TAP DRILLS
+# ============================================================================
+
+# Depth of a 100% Unified thread is 0.6495 * pitch per side, so the drill for
+# a given engagement is: major - 2 * 0.6495 * (pct / 100) / TPI
+THREAD_PERCENT_CONSTANT = 0.01299
+
+# Column headers for thread percentages that have a customary material note
+THREAD_PERCENT_LABELS = {
+    75: "75% Thread for Aluminum, Brass, Plastics",
+    50: "50% Thread for Stainless, Cast Iron & Iron",
+}
+
+def ideal_tap_drill(major_diameter, tpi, percent):
+    """
+    Calculate the exact (unrounded) tap drill diameter for a thread engagement.
+
+    Args:
+        major_diameter: Thread major diameter in inches
+        tpi: Threads per inch
+        percent: Target thread engagement, e.g. 75 for 75%
+
+    Returns:
+        float: Ideal drill diameter in inches
+    """
+    return major_diameter - THREAD_PERCENT_CONSTANT * percent / tpi
+
+def compute_tap_drills(percentages, rows, catalogue=None, drill_index=None):
+    """
+    Calculate tap drills for catalogue threads at each thread percentage.
+
+    All threads and percentages are computed as one NumPy array and snapped
+    to the nearest real drill in a single vectorized lookup.
+
+    Args:
+        percentages: Sequence of thread engagement percentages, e.g. [75, 65, 50]
+        rows: Sequence of catalogue row indices, e.g. from ThreadCatalogue.select()
+        catalogue: ThreadCatalogue to use (defaults to THREAD_CATALOGUE)
+        drill_index: DrillIndex to snap to (defaults to DRILL_INDEX)
+
+    Returns:
+        numpy.ndarray (dtype=object) of Drill, one row per thread and
+        one column per percentage
+    """
+    import numpy as np
+
+    if catalogue is None:
+        catalogue = THREAD_CATALOGUE
+    if drill_index is None:
+        drill_index = DRILL_INDEX
+
+    rows = np.asarray(rows, dtype=np.intp)
+    columns = catalogue._numpy_columns()
+    majors = columns['major'][rows]
+    tpis = columns['tpi'][rows]
+    percents = np.asarray(percentages, dtype=np.float64)
+
+    ideal = ideal_tap_drill(majors[:, np.newaxis], tpis[:, np.newaxis], percents[np.newaxis, :])
+    return drill_index.nearest_many(ideal)
+
+def format_thread_percent_label(percent):
+    """Header text for a tap drill column at the given thread percentage."""
+    return THREAD_PERCENT_LABELS.get(percent, f"{percent:g}% Thread")
+
+# ============================================================================
+# ROW MODEL
+# ============================================================================
+
+class ThreadRow:
+    """
+    One data row of the chart: a single thread pitch of a screw size.
+    
+    Attributes:
+        tpi: Threads per inch
+        tpi_text: TPI as displayed
+        minor_diameter: Minor diameter in inches
+        minor_text: Minor diameter as displayed
+        tap_drills: Tuple of (drill size text, decimal text) pairs, one per
+                    tap drill column
+    """
+    __slots__ = ('tpi', 'tpi_text', 'minor_diameter', 'minor_text', 'tap_drills')
+    
+    def __init__(self, tpi, minor_diameter, tap_drills):
+        self.tpi = tpi
+        self.tpi_text = f"{tpi:g}"
+        self.minor_diameter = minor_diameter
+        self.minor_text = format_decimal(minor_diameter)
+        self.tap_drills = tuple(_drill_cells(drill) for drill in tap_drills)
+
+class ScrewGroup:
+    """
+    The block of rows for one screw size, in the order they appear.
+    
+    The screw size, major diameter, clearance, SHCS and FHCS cells appear once
+    per group and are merged down across all of its rows (`span` rows).
+    
+    Attributes:
+        screw_size: Catalogue size (CAP_SCREW_DATA key)
+        label: Screw size as displayed
+        major_diameter: Major diameter in inches
+        major_text: Major diameter as displayed
+        clearance: (close fit size, decimal, free fit size, decimal) texts
+        shcs: (hex, counterbore drill, counterbore diameter, depth) texts,
+              or None if the screw size has no SHCS data
+        fhcs: (hex, countersink depth) texts, or None
+        threads: Tuple of ThreadRow, coarse threads first
+    """
+    __slots__ = ('screw_size', 'label', 'major_diameter', 'major_text', 'clearance',
+                 'shcs', 'fhcs', 'threads')
+    
+    def __init__(self, screw_size, rows, tap_drills, catalogue=None):
+        """
+        Args:
+            screw_size: Catalogue size
+            rows: Catalogue row indices of the size's threads, coarse first
+            tap_drills: Tap drills for each of `rows`
+            catalogue: ThreadCatalogue the rows are in (default: THREAD_CATALOGUE)
+        """
+        if catalogue is None:
+            catalogue = THREAD_CATALOGUE
+        self.screw_size = screw_size
+        self.label = format_screw_size(screw_size)
+        self.major_diameter = catalogue.major[rows[0]]
+        self.major_text = format_decimal(self.major_diameter)
+        
+        # Clearance depends only on the screw size, so any row will do
+        self.clearance = (_drill_cells(catalogue.drill('close_fit', rows[0])) +
+                          _drill_cells(catalogue.drill('free_fit', rows[0])))
+        
+        cap_screw_data = CAP_SCREW_DATA.get(screw_size, {})
+        self.shcs = None
+        if 'shcs' in cap_screw_data:
+            shcs = cap_screw_data['shcs']
+            self.shcs = (
+                shcs['hex'],
+                parse_drill(shcs['counterbore_drill']).display,
+                format_decimal(shcs['counterbore_dia']),
+                format_decimal(shcs['counterbore_depth']),
+            )
+        
+        self.fhcs = None
+        if 'fhcs' in cap_screw_data:
+            fhcs = cap_screw_data['fhcs']
+            self.fhcs = (fhcs['hex'], format_decimal(fhcs['countersink_depth']))
+        
+        self.threads = tuple(
+            ThreadRow(catalogue.tpi[row], catalogue.minor[row], drills)
+            for row, drills in zip(rows, tap_drills)
+        )
+    
+    @property
+    def span(self):
+        """Number of chart rows (thread pitches) in the group."""
+        return len(self.threads)
+
+def _drill_cells(drill):
+    """(drill size text, decimal text) for a Drill."""
+    return (drill.display, drill.decimal_text)
+
+# Row models already built, keyed by thread percentages (None for the table's
+# tap_75/tap_50 values)
+_ROW_MODELS = {}
+
+def build_row_model(thread_percentages=None):
+    """
+    Build the display model of the chart rows, once per set of tap columns.
+    
+    Every value a sheet shows is formatted here, so sheets (and other output
+    formats) only lay out and style the result. Models are cached, so all
+    page configurations with the same tap columns share one.
+    
+    The rows are the CHART_SERIES threads up to CHART_MAX_MAJOR from
+    THREAD_CATALOGUE.
+    
+    Args:
+        thread_percentages: Thread percentages of the computed tap drill
+                            columns, or None for the catalogue's tap_75 and
+                            tap_50 drills
+    
+    Returns:
+        tuple: ScrewGroup per screw size, sorted by major diameter
+    """
+    from itertools import groupby
+    
+    key = None if thread_percentages is None else tuple(thread_percentages)
+    model = _ROW_MODELS.get(key)
+    if model is not None:
+        return model
+    
+    catalogue = THREAD_CATALOGUE
+    rows = catalogue.select(CHART_SERIES, max_major=CHART_MAX_MAJOR).tolist()
+    if key is None:
+        tap_drills = [(catalogue.drill('tap_75', row), catalogue.drill('tap_50', row))
+                      for row in rows]
+    else:
+        tap_drills = [tuple(drills) for drills in compute_tap_drills(key, rows)]
+    
+    groups = []
+    for screw_size, entries in groupby(zip(rows, tap_drills), key=lambda entry: catalogue.sizes[entry[0]]):
+        group_rows, group_taps = zip(*entries)
+        groups.append(ScrewGroup(screw_size, group_rows, group_taps, catalogue))
+    
+    model = _ROW_MODELS[key] = tuple(groups)
+    return model
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+# Environment variables that turn on profiling without the CLI flags:
+# a non-empty PROFILE_ENV_VAR acts like --profile, CPROFILE_ENV_VAR like
+# --cprofile with its value as the output path
+PROFILE_ENV_VAR = 'INCH_TAPS_DRILLS_PROFILE'
+CPROFILE_ENV_VAR = 'INCH_TAPS_DRILLS_CPROFILE'
+
+class PhaseTimer:
+    """
+    Accumulates wall time per named phase of workbook generation.
+    
+    Call lap() to start timing, then lap(name) at the end of each phase to
+    add the time since the previous lap to that phase. Times add up across
+    sheets. A disabled timer does nothing.
+    """
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.totals = {}
+        self._last = None
+    
+    def lap(self, phase=None):
+        """End the current phase as `phase` (or just restart the clock)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if phase is not None:
+            self.totals[phase] = self.totals.get(phase, 0.0) + now - self._last
+        self._last = now
+    
+    def report(self, file=None):
+        """Print the time spent in each phase, in the order first seen."""
+        total = sum(self.totals.values())
+        print("Phase timings:", file=file)
+        for phase, seconds in self.totals.items():
+            print(f"  {phase:<8} {seconds * 1000:9.1f} ms", file=file)
+        print(f"  {'total':<8} {total * 1000:9.1f} ms", file=file)
+
+# ============================================================================
+# SPREADSHEET GENERATION
+# ============================================================================
+
+# Styles shared across all sheets, built on first use so that importing this
+# module doesn't load openpyxl
+_STYLES = {}
+
+def get_styles():
+    """
+    Get the cell styles shared across all sheets.
+    
+    Returns:
+        dict: PatternFill/Alignment/Border objects keyed by name
+              ('header_fill', 'subheader_fill', 'alt_row_fill',
+              'center_align', 'center_align_wrap', 'thin_border')
+    """
+    if not _STYLES:
+        from openpyxl.styles import Alignment, Border, PatternFill, Side
+        _STYLES.update({
+            'header_fill': PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid"),
+            'subheader_fill': PatternFill(start_color="E8E8E8", end_color="E8E8E8", fill_type="solid"),
+            'alt_row_fill': PatternFill(start_color="E2E2E2", end_color="E2E2E2", fill_type="solid"),
+            'center_align': Alignment(horizontal="center", vertical="center"),
+            'center_align_wrap': Alignment(horizontal="center", vertical="center", wrap_text=True),
+            'thin_border': Border(
+                left=Side(style='thin'),
+                right=Side(style='thin'),
+                top=Side(style='thin'),
+                bottom=Side(style='thin')
+            ),
+        })
+    return _STYLES
+
+def named_style_names(header_font_size=11, data_font_size=11):
+    """Names of the 'header', 'data' and 'data-alt' styles for a pair of font sizes."""
+    return {
+        'header': f'header-{header_font_size:g}',
+        'data': f'data-{data_font_size:g}',
+        'data-alt': f'data-alt-{data_font_size:g}',
+    }
+
+def get_named_styles(wb, header_font_size=11, data_font_size=11):
+    """
+    Get the named cell styles for a sheet, registering them in the workbook
+    on first use.
+    
+    There are three styles per font size: 'header' (bold, centered and
+    wrapped), 'data' (centered) and 'data-alt' (data on the alternating
+    fill); all have a thin border. Sheets with the same font sizes share them,
+    so each is built and written to styles.xml once per workbook.
+    
+    Args:
+        wb: Workbook to register the styles in
+        header_font_size: Font size for the header rows
+        data_font_size: Font size for the data rows
+    
+    Returns:
+        dict: Style names keyed by 'header', 'data' and 'data-alt', for
+              assigning to cell.style
+    """
+    from openpyxl.styles import Font, NamedStyle
+    
+    names = named_style_names(header_font_size, data_font_size)
+    registered = set(wb.named_styles)
+    styles = get_styles()
+    if names['header'] not in registered:
+        wb.add_named_style(NamedStyle(
+            name=names['header'],
+            font=Font(bold=True, size=header_font_size),
+            alignment=styles['center_align_wrap'],
+            border=styles['thin_border'],
+        ))
+    if names['data'] not in registered:
+        data_font = Font(size=data_font_size)
+        wb.add_named_style(NamedStyle(
+            name=names['data'],
+            font=data_font,
+            alignment=styles['center_align'],
+            border=styles['thin_border'],
+        ))
+        wb.add_named_style(NamedStyle(
+            name=names['data-alt'],
+            font=data_font,
+            fill=styles['alt_row_fill'],
+            alignment=styles['center_align'],
+            border=styles['thin_border'],
+        ))
+    return names
+
+# Sheet dimensions before scaling by the page config's multipliers
+HEADER_ROW_HEIGHTS = (30, 40, 20)
+DATA_ROW_HEIGHT = 15
+
+# Page margins in inches, the same on every sheet
+PAGE_MARGINS = {'left': 0.5, 'right': 0.5, 'top': 0.5, 'bottom': 0.5, 'header': 0.0, 'footer': 0.3}
+
+# Centered page footer
+FOOTER_TEXT = "https://github.com/jantman/machining-projects"
+
+def column_width(col):
+    """Unscaled width of a 1-based table column: 10 for A-D, 11 for the drill columns."""
+    return 10 if col <= 4 else 11
+
+def column_letter(col):
+    """Spreadsheet column letter(s) for a 1-based column number (1 -> 'A')."""
+    letters = ''
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+class SheetLayout:
+    """
+    The cell grid of a chart sheet, independent of page setup, styling and
+    output format.
+    
+    Attributes:
+        tap_percentages: Thread percentages of the tap drill column pairs
+        last_col: Last column of the table
+        last_data_row: Last row of the table (rows 1-3 are headers)
+        values: Dict mapping (row, col) to the cell text
+        merged_ranges: Merged range references ('A4:A6'), headers first
+        group_rows: (first row, last row, alternate fill) per screw size
+    """
+    __slots__ = ('tap_percentages', 'last_col', 'last_data_row', 'values', 'merged_ranges',
+                 'group_rows')
+
+# Sheet layouts already built, keyed like _ROW_MODELS
+_SHEET_LAYOUTS = {}
+
+def build_sheet_layout(thread_percentages=None):
+    """
+    Lay out the chart table: header texts, data values and merged ranges.
+    
+    Built once per set of tap columns (and cached) from build_row_model(),
+    so every sheet and output backend shares it.
+    
+    Args:
+        thread_percentages: As for build_row_model()
+    
+    Returns:
+        SheetLayout: The table layout
+    """
+    key = None if thread_percentages is None else tuple(thread_percentages)
+    layout = _SHEET_LAYOUTS.get(key)
+    if layout is not None:
+        return layout
+    
+    # Tap drill columns: either computed from thread percentages or from the table
+    tap_percentages = [75, 50] if key is None else list(key)
+    row_model = build_row_model(key)
+    
+    # Column layout (1-based): A-D fixed, two columns per tap percentage,
+    # then clearance (4), SHCS (4) and FHCS (2)
+    tap_col = 5
+    clearance_col = tap_col + 2 * len(tap_percentages)
+    shcs_col = clearance_col + 4
+    fhcs_col = shcs_col + 4
+    last_col = fhcs_col + 1
+    
+    values = {}
+    merged_ranges = []
+    
+    def col_range(first_col, first_row, last_col_, last_row):
+        return f'{column_letter(first_col)}{first_row}:{column_letter(last_col_)}{last_row}'
+    
+    def write_header(first_col, first_row, last_col_, last_row, text):
+        if (first_col, first_row) != (last_col_, last_row):
+            merged_ranges.append(col_range(first_col, first_row, last_col_, last_row))
+        values[(first_row, first_col)] = text
+    
+    # Create header rows
+    # Row 1: Main headers with column spans
+    write_header(1, 1, 1, 3, "Screw Size")
+    write_header(2, 1, 2, 3, "Major Diameter")
+    write_header(3, 1, 3, 3, "TPI")
+    write_header(4, 1, 4, 3, "Minor Diameter")
+    
+    # Tap Drill section
+    write_header(tap_col, 1, clearance_col - 1, 1, "Tap Drill")
+    for idx, percent in enumerate(tap_percentages):
+        col = tap_col + 2 * idx
+        write_header(col, 2, col + 1, 2, format_thread_percent_label(percent))
+    
+    # Clearance Drill section
+    write_header(clearance_col, 1, clearance_col + 3, 1, "Clearance Drill")
+    write_header(clearance_col, 2, clearance_col + 1, 2, "Close Fit")
+    write_header(clearance_col + 2, 2, clearance_col + 3, 2, "Free Fit")
+    
+    # SHCS section
+    write_header(shcs_col, 1, shcs_col + 3, 1, "Socket Head Cap Screws")
+    write_header(shcs_col, 2, shcs_col, 3, "Hex")
+    write_header(shcs_col + 1, 2, shcs_col + 3, 2, "Counterbore")
+    
+    # FHCS section
+    write_header(fhcs_col, 1, fhcs_col + 1, 1, "Flat Head Cap Screws")
+    write_header(fhcs_col, 2, fhcs_col, 3, "Hex")
+    write_header(fhcs_col + 1, 2, fhcs_col + 1, 3, "Countersink Depth")
+    
+    # Row 3: Column detail headers
+    headers_row3 = (
+        ["", "", "", ""]  # A-D (already merged from rows 1-3)
+        + ["Drill Size", "Dec. Eq."] * len(tap_percentages)  # Tap drills
+        + ["Drill Size", "Dec. Eq."]  # Close Fit
+        + ["Drill Size", "Dec. Eq."]  # Free Fit
+        + [""]  # SHCS Hex (merged from row 2-3)
+        + ["Drill Size", "Dec. Eq.", "Depth"]  # Counterbore
+        + ["", ""]  # FHCS Hex and Countersink Depth (merged from row 2-3)
+    )
+    
+    for col, header in enumerate(headers_row3, start=1):
+        if header:  # Skip empty cells (A-D)
+            values[(3, col)] = header
     
-    # Sort screw sizes by major diameter
-    sorted_screws = sorted(THREAD_DATA.items(), key=lambda x: x[1]['major_diameter'])
+    # Data rows from the precomputed row model
+    current_row = 4
+    alternate_color = False  # Track alternating colors for screw sizes
+    group_rows = []
     
-    for screw_size, screw_data in sorted_screws:
-        major_diam = screw_data["major_diameter"]
-        threads = screw_data["threads"]
-        clearance = screw_data["clearance"]
+    for group in row_model:
+        num_threads = group.span
         
         # Toggle alternating color for each new screw size
         alternate_color = not alternate_color
         
-        # Get thread pitches sorted (ascending order - coarse threads first)
-        tpis = sorted(threads.keys())
-        num_threads = len(tpis)
-        
-        # Process each thread pitch for this screw size
         first_row_of_screw = current_row
-        for idx, tpi in enumerate(tpis):
-            thread_spec = threads[tpi]
-            
+        last_row_of_screw = first_row_of_screw + num_threads - 1
+        group_rows.append((first_row_of_screw, last_row_of_screw, alternate_color))
+        
+        def merge_down(col):
+            merged_ranges.append(col_range(col, first_row_of_screw, col, last_row_of_screw))
+        
+        for idx, thread_row in enumerate(group.threads):
             # Determine if we need to merge cells
             is_first_thread = (idx == 0)
             
             # Write screw size and major diameter (only on first thread row)
             if is_first_thread:
-                ws.cell(row=current_row, column=1).value = format_screw_size(screw_size)
-                ws.cell(row=current_row, column=2).value = format_decimal(major_diam)
+                values[(current_row, 1)] = group.label
+                values[(current_row, 2)] = group.major_text
                 
                 # Merge screw size and major diameter if multiple threads
                 if num_threads > 1:
-                    ws.merge_cells(f'A{first_row_of_screw}:A{first_row_of_screw + num_threads - 1}')
-                    ws.merge_cells(f'B{first_row_of_screw}:B{first_row_of_screw + num_threads - 1}')
+                    merge_down(1)
+                    merge_down(2)
             
             # Write TPI and minor diameter
-            ws.cell(row=current_row, column=3).value = str(tpi)
-            ws.cell(row=current_row, column=4).value = format_decimal(thread_spec['minor_diameter'])
+            values[(current_row, 3)] = thread_row.tpi_text
+            values[(current_row, 4)] = thread_row.minor_text
             
-            # Write tap drill sizes (75% thread)
-            tap_75 = thread_spec['tap_75']
-            ws.cell(row=current_row, column=5).value = format_drill_size(tap_75)
-            ws.cell(row=current_row, column=6).value = format_decimal(get_drill_decimal(tap_75))
-            
-            # Write tap drill sizes (50% thread)
-            tap_50 = thread_spec['tap_50']
-            ws.cell(row=current_row, column=7).value = format_drill_size(tap_50)
-            ws.cell(row=current_row, column=8).value = format_decimal(get_drill_decimal(tap_50))
+            # Write tap drill sizes, one column pair per thread percentage
+            for tap_idx, (size_text, decimal_text) in enumerate(thread_row.tap_drills):
+                col = tap_col + 2 * tap_idx
+                values[(current_row, col)] = size_text
+                values[(current_row, col + 1)] = decimal_text
             
             # Write clearance drill sizes (only on first thread row, then merge)
             if is_first_thread:
-                close_fit = clearance['close_fit']
-                ws.cell(row=current_row, column=9).value = format_drill_size(close_fit)
-                ws.cell(row=current_row, column=10).value = format_decimal(get_drill_decimal(close_fit))
-                
-                free_fit = clearance['free_fit']
-                ws.cell(row=current_row, column=11).value = format_drill_size(free_fit)
-                ws.cell(row=current_row, column=12).value = format_decimal(get_drill_decimal(free_fit))
+                for offset, text in enumerate(group.clearance):
+                    values[(current_row, clearance_col + offset)] = text
                 
                 # Merge clearance drill columns if multiple threads
                 if num_threads > 1:
-                    ws.merge_cells(f'I{first_row_of_screw}:I{first_row_of_screw + num_threads - 1}')
-                    ws.merge_cells(f'J{first_row_of_screw}:J{first_row_of_screw + num_threads - 1}')
-                    ws.merge_cells(f'K{first_row_of_screw}:K{first_row_of_screw + num_threads - 1}')
-                    ws.merge_cells(f'L{first_row_of_screw}:L{first_row_of_screw + num_threads - 1}')
+                    for col in range(clearance_col, clearance_col + 4):
+                        merge_down(col)
                 
                 # Write SHCS data (only on first thread row, then merge)
-                if 'shcs' in screw_data:
-                    shcs = screw_data['shcs']
-                    ws.cell(row=current_row, column=13).value = format_drill_size(shcs['hex'])
-                    ws.cell(row=current_row, column=14).value = format_drill_size(shcs['counterbore_drill'])
-                    ws.cell(row=current_row, column=15).value = format_decimal(shcs['counterbore_dia'])
-                    ws.cell(row=current_row, column=16).value = format_decimal(shcs['counterbore_depth'])
+                if group.shcs is not None:
+                    for offset, text in enumerate(group.shcs):
+                        values[(current_row, shcs_col + offset)] = text
                     
                     # Merge SHCS columns if multiple threads
                     if num_threads > 1:
-                        ws.merge_cells(f'M{first_row_of_screw}:M{first_row_of_screw + num_threads - 1}')
-                        ws.merge_cells(f'N{first_row_of_screw}:N{first_row_of_screw + num_threads - 1}')
-                        ws.merge_cells(f'O{first_row_of_screw}:O{first_row_of_screw + num_threads - 1}')
-                        ws.merge_cells(f'P{first_row_of_screw}:P{first_row_of_screw + num_threads - 1}')
+                        for col in range(shcs_col, shcs_col + 4):
+                            merge_down(col)
                 
                 # Write FHCS data (only on first thread row, then merge)
-                if 'fhcs' in screw_data:
-                    fhcs = screw_data['fhcs']
-                    ws.cell(row=current_row, column=17).value = format_drill_size(fhcs['hex'])
-                    ws.cell(row=current_row, column=18).value = format_decimal(fhcs['countersink_depth'])
+                if group.fhcs is not None:
+                    for offset, text in enumerate(group.fhcs):
+                        values[(current_row, fhcs_col + offset)] = text
                 
                 # Merge FHCS columns if multiple threads (always merge, even if no data)
                 if num_threads > 1:
-                    ws.merge_cells(f'Q{first_row_of_screw}:Q{first_row_of_screw + num_threads - 1}')
-                    ws.merge_cells(f'R{first_row_of_screw}:R{first_row_of_screw + num_threads - 1}')
-            
-            # Apply formatting to all cells in this row
-            for col in range(1, 19):
-                cell = ws.cell(row=current_row, column=col)
-                if not isinstance(cell, MergedCell):
-                    cell.alignment = center_align
-                    cell.border = thin_border
-                    cell.font = data_font
-                    # Apply alternating background color
-                    if alternate_color:
-                        cell.fill = alt_row_fill
+                    merge_down(fhcs_col)
+                    merge_down(fhcs_col + 1)
             
             current_row += 1
     
-    # Apply borders to all header cells
+    layout = SheetLayout()
+    layout.tap_percentages = tuple(tap_percentages)
+    layout.last_col = last_col
+    layout.last_data_row = current_row - 1
+    layout.values = values
+    layout.merged_ranges = tuple(merged_ranges)
+    layout.group_rows = tuple(group_rows)
+    _SHEET_LAYOUTS[key] = layout
+    return layout
+
+def create_sheet(ws, config, timer=None):
+    """
+    Create a worksheet with tap and drill data.
+    
+    The sheet is built in passes (data, merge, style, layout), each timed
+    by `timer`.
+    
+    Args:
+        ws: Worksheet object to populate
+        config: Dictionary with page configuration. If it contains
+                'thread_percentages' (e.g. [75, 65, 50]), one computed tap
+                drill column pair is emitted per percentage; otherwise the
+                catalogue's tap_75 / tap_50 drills are used.
+        timer: PhaseTimer to record pass times in (default: not timed)
+    """
+    from openpyxl.utils import get_column_letter
+    
+    if timer is None:
+        timer = PhaseTimer(enabled=False)
+    timer.lap()
+    config = resolve_config(config)
+    
+    # Named styles with the font sizes from config
+    named_styles = get_named_styles(ws.parent,
+                                    config.get('header_font_size', 11),
+                                    config.get('data_font_size', 11))
+    
+    layout = build_sheet_layout(config.get('thread_percentages'))
+    last_col = layout.last_col
+    last_data_row = layout.last_data_row
+    
+    # Data pass: write the header and data values
+    for (row, col), text in layout.values.items():
+        ws.cell(row=row, column=col).value = text
+    timer.lap('data')
+    
+    # Merge pass
+    for cell_range in layout.merged_ranges:
+        ws.merge_cells(cell_range)
+    timer.lap('merge')
+    
+    # Styling pass: one named style per cell. Cells covered by merged ranges
+    # are styled too, so their borders appear along the edges of the range
+    header_style = named_styles['header']
     for row in range(1, 4):
-        for col in range(1, 19):
-            ws.cell(row=row, column=col).border = thin_border
+        for col in range(1, last_col + 1):
+            ws.cell(row=row, column=col).style = header_style
     
-    # Apply borders to all data cells (including merged cells in the last row)
-    last_data_row = current_row - 1
-    for row in range(4, last_data_row + 1):
-        for col in range(1, 19):
-            cell = ws.cell(row=row, column=col)
-            # Apply border even to merged cells to ensure bottom borders appear
-            cell.border = thin_border
+    # Data cells alternate their fill per screw size
+    for first_row_of_screw, last_row_of_screw, alternate_color in layout.group_rows:
+        data_style = named_styles['data-alt' if alternate_color else 'data']
+        for row in range(first_row_of_screw, last_row_of_screw + 1):
+            for col in range(1, last_col + 1):
+                ws.cell(row=row, column=col).style = data_style
+    timer.lap('style')
     
+    # Layout pass: sheet-level sizes and print settings
     # Set row heights for data rows
     row_multiplier = config.get('row_height_multiplier', 1.0)
-    default_data_row_height = 15  # Default row height for data
     for row in range(4, last_data_row + 1):
-        ws.row_dimensions[row].height = default_data_row_height * row_multiplier
-    
-        # Adjust column widths
-        multiplier = config.get('column_width_multiplier', 1.0)
-        ws.column_dimensions['A'].width = 10 * multiplier
-        ws.column_dimensions['B'].width = 10 * multiplier
-        ws.column_dimensions['C'].width = 10 * multiplier
-        ws.column_dimensions['D'].width = 10 * multiplier
-        for col in ['E', 'F', 'G', 'H', 'I', 'J', 'K', 'L']:
-            ws.column_dimensions[col].width = 11 * multiplier
-        for col in ['M', 'N', 'O', 'P']:
-            ws.column_dimensions[col].width = 11 * multiplier
-        for col in ['Q', 'R']:
-            ws.column_dimensions[col].width = 11 * multiplier
-    
-        # Set row heights for better readability
-        row_multiplier = config.get('row_height_multiplier', 1.0)
-        ws.row_dimensions[1].height = 30 * row_multiplier
-        ws.row_dimensions[2].height = 40 * row_multiplier
-        ws.row_dimensions[3].height = 20 * row_multiplier
-    
-        # Freeze the first 3 rows (header rows)
-        ws.freeze_panes = 'A4'
-    
-        # Configure page setup for printing
-        ws.page_setup.paperSize = config['paper_size']
-        ws.page_setup.orientation = config['orientation']
-        
-        # Set custom paper dimensions if provided (for plotter sizes)
-        if 'paper_width' in config and 'paper_height' in config:
-            ws.page_setup.paperWidth = f"{config['paper_width']}in"
-            ws.page_setup.paperHeight = f"{config['paper_height']}in"
-        
-        if config.get('use_fit_to_page', True):
-            ws.page_setup.fitToPage = True
-            ws.page_setup.fitToHeight = config['fit_height']
-            ws.page_setup.fitToWidth = config['fit_width']
-        else:
-            ws.page_setup.fitToPage = False
-    
-        # Print options
-        ws.print_options.horizontalCentered = True
-        ws.print_options.verticalCentered = False
-        ws.print_options.gridLines = False
-    
-        # Page margins (in inches)
-        ws.page_margins.left = 0.5
-        ws.page_margins.right = 0.5
-        ws.page_margins.top = 0.5
-        ws.page_margins.bottom = 0.5
-        ws.page_margins.header = 0.0
-        ws.page_margins.footer = 0.3
-        
-        # Add footer with GitHub URL (centered)
-        ws.oddFooter.center.text = "https://github.com/jantman/machining-projects"
+        ws.row_dimensions[row].height = DATA_ROW_HEIGHT * row_multiplier
+    
+    # Adjust column widths
+    multiplier = config.get('column_width_multiplier', 1.0)
+    for col in range(1, last_col + 1):
+        ws.column_dimensions[get_column_letter(col)].width = column_width(col) * multiplier
+    
+    # Set row heights for better readability
+    for row, height in enumerate(HEADER_ROW_HEIGHTS, start=1):
+        ws.row_dimensions[row].height = height * row_multiplier
+    
+    # Freeze the first 3 rows (header rows)
+    ws.freeze_panes = 'A4'
+    
+    # Configure page setup for printing
+    ws.page_setup.paperSize = config['paper_size']
+    ws.page_setup.orientation = config['orientation']
+    
+    # Set custom paper dimensions if provided (for plotter sizes)
+    if 'paper_width' in config and 'paper_height' in config:
+        ws.page_setup.paperWidth = f"{config['paper_width']}in"
+        ws.page_setup.paperHeight = f"{config['paper_height']}in"
+    
+    if config.get('use_fit_to_page', True):
+        ws.page_setup.fitToPage = True
+        ws.page_setup.fitToHeight = config['fit_height']
+        ws.page_setup.fitToWidth = config['fit_width']
+    else:
+        ws.page_setup.fitToPage = False
+    
+    # Print options
+    ws.print_options.horizontalCentered = True
+    ws.print_options.verticalCentered = False
+    ws.print_options.gridLines = False
+    
+    # Page margins (in inches)
+    for side, margin in PAGE_MARGINS.items():
+        setattr(ws.page_margins, side, margin)
+    
+    # Add footer with GitHub URL (centered)
+    ws.oddFooter.center.text = FOOTER_TEXT
+    timer.lap('layout')
 
 
 # ============================================================================
 # CREATE WORKBOOK WITH MULTIPLE SHEETS
 # ============================================================================
 
-# Create workbook
-wb = Workbook()
-
 # Page configurations
 # Paper size: 1=Letter, 3=Tabloid (11"×17"), 0=User-defined/Custom (for plotters)
-configs = [
+# Column/row multipliers and font sizes are worked out by solve_layout() to
+# fill the paper (or the fit_width x fit_height page grid); set any of
+# LAYOUT_KEYS in a config to override the solver
+PAGE_CONFIGS = [
     {
         'name': 'Letter Landscape 1pg',
+        'pdf_suffix': 'letter',  # inch_taps_drills-letter.pdf
         'paper_size': 1,  # Letter
         'orientation': 'landscape',
         'fit_height': 1,
         'fit_width': 1,
         'use_fit_to_page': True,
-        'column_width_multiplier': 1.0,
-        'row_height_multiplier': 1.0,
-        'header_font_size': 11,  # Default font size for headers
-        'data_font_size': 11     # Default font size for data
     },
     {
         'name': 'Tabloid Landscape 1pg',
+        'pdf_suffix': 'tabloid',  # inch_taps_drills-tabloid.pdf
         'paper_size': 3,  # Tabloid
         'orientation': 'landscape',
         'fit_height': 1,
         'fit_width': 1,
         'use_fit_to_page': True,
-        'column_width_multiplier': 1.0,
-        'row_height_multiplier': 1.0,
-        'header_font_size': 12,
-        'data_font_size': 14
     },
     {
         'name': 'Tabloid Landscape 2x2',
+        'pdf_suffix': 'tabloid2x2',  # inch_taps_drills-tabloid2x2.pdf
         'paper_size': 3,  # Tabloid
         'orientation': 'landscape',
         'fit_height': 2,
         'fit_width': 2,
         'use_fit_to_page': True,
-        'column_width_multiplier': 2.0,
-        'row_height_multiplier': 2.0,
-        'header_font_size': 22,
-        'data_font_size': 25
+        'poster': True,  # PDF: tiled from one full-size rendering
     },
     {
         'name': 'Tabloid Landscape 3x3',
+        'pdf_suffix': 'tabloid3x3',  # inch_taps_drills-tabloid3x3.pdf
         'paper_size': 3,  # Tabloid
         'orientation': 'landscape',
         'fit_height': 3,
         'fit_width': 3,
         'use_fit_to_page': True,
-        'column_width_multiplier': 2.5,
-        'row_height_multiplier': 2.5,
-        'header_font_size': 27,
-        'data_font_size': 31
+        'poster': True,  # PDF: tiled from one full-size rendering
     },
     {
         'name': '24x36 Landscape 1pg',
+        'pdf_suffix': '24x36',  # inch_taps_drills-24x36.pdf
         'paper_size': 0,  # Custom/User-defined (plotter)
         'orientation': 'portrait',  # Use portrait with dimensions swapped for landscape effect
         'fit_height': 0,
         'fit_width': 0,
         'use_fit_to_page': False,
-        'column_width_multiplier': 1.85,  # Make columns wider for large format
-        'row_height_multiplier': 1.85,  # Make rows taller for large format
         'paper_width': 36,  # Width in inches (wider dimension)
         'paper_height': 24,  # Height in inches (shorter dimension)
-        'header_font_size': 20,  # Larger font for headers
-        'data_font_size': 26     # Larger font for data
     },
     {
         'name': '36x48 Landscape 1pg',
+        'pdf_suffix': '36x48',  # inch_taps_drills-36x48.pdf
         'paper_size': 0,  # Custom/User-defined (plotter)
         'orientation': 'portrait',  # Use portrait with dimensions swapped for landscape effect
         'fit_height': 0,
         'fit_width': 0,
         'use_fit_to_page': False,
-        'column_width_multiplier': 2.8,  # Make columns even wider for very large format
-        'row_height_multiplier': 2.8,  # Make rows taller for very large format
         'paper_width': 48,  # Width in inches (wider dimension)
         'paper_height': 36,  # Height in inches (shorter dimension)
-        'header_font_size': 30,  # Larger font for headers
-        'data_font_size': 36     # Larger font for data
     }
 ]
 
-# Create sheets
-for idx, config in enumerate(configs):
-    if idx == 0:
-        # Use the default sheet for the first config
-        ws = wb.active
-        ws.title = config['name']
+def build_workbook(configs=None, timer=None):
+    """
+    Build the workbook with one sheet per page configuration.
+    
+    Args:
+        configs: List of page configuration dicts (default: PAGE_CONFIGS)
+        timer: PhaseTimer to record per-pass times in (default: not timed)
+    
+    Returns:
+        Workbook: The populated (unsaved) workbook
+    """
+    from openpyxl import Workbook
+    
+    if configs is None:
+        configs = PAGE_CONFIGS
+    
+    wb = Workbook()
+    for idx, config in enumerate(configs):
+        if idx == 0:
+            # Use the default sheet for the first config
+            ws = wb.active
+            ws.title = config['name']
+        else:
+            # Create new sheets for additional configs
+            ws = wb.create_sheet(title=config['name'])
+        
+        create_sheet(ws, config, timer)
+    return wb
+
+# ============================================================================
+# REPRODUCIBLE OUTPUT
+# ============================================================================
+
+# Environment variable holding the build timestamp (seconds since the Unix
+# epoch) for reproducible builds, per https://reproducible-builds.org/specs/source-date-epoch/
+SOURCE_DATE_EPOCH_VAR = 'SOURCE_DATE_EPOCH'
+
+# Timestamp used by --reproducible when SOURCE_DATE_EPOCH isn't set:
+# 1980-01-01 00:00:00 UTC, the earliest time a zip entry can record
+REPRODUCIBLE_EPOCH = 315532800
+
+def build_timestamp(reproducible=False):
+    """
+    Get the timestamp to record in the workbook properties and zip entries.
+    
+    Args:
+        reproducible: Use a fixed time (SOURCE_DATE_EPOCH, or REPRODUCIBLE_EPOCH
+            if unset) instead of the current time
+    
+    Returns:
+        datetime: Naive UTC datetime, truncated to whole seconds
+    """
+    from datetime import datetime, timezone
+    
+    if reproducible:
+        epoch = int(os.environ.get(SOURCE_DATE_EPOCH_VAR) or REPRODUCIBLE_EPOCH)
+        stamp = datetime.fromtimestamp(max(epoch, REPRODUCIBLE_EPOCH), timezone.utc)
     else:
-        # Create new sheets for additional configs
-        ws = wb.create_sheet(title=config['name'])
-    
-    create_sheet(ws, config)
-
-# Save as Excel format (LibreOffice can open this)
-wb.save('inch_taps_drills.xlsx')
-print("Spreadsheet created: inch_taps_drills.xlsx")
-print(f"Created {len(configs)} sheets with different page layouts:")
-for config in configs:
-    print(f"  - {config['name']}")
-print("This file can be opened in LibreOffice Calc with all merged cells preserved.")
\ No newline at end of file
+        stamp = datetime.now(timezone.utc)
+    return stamp.replace(tzinfo=None, microsecond=0)
+
+def zip_entry(name, timestamp):
+    """
+    Build a ZipInfo whose metadata depends only on `name` and `timestamp`.
+    
+    zipfile otherwise stamps entries with the current local time and the
+    host OS, so the same parts would give a different archive on every run.
+    
+    Args:
+        name: Archive member name
+        timestamp: datetime to record as the entry's modification time
+    
+    Returns:
+        ZipInfo: Deflate-compressed, regular file with 0644 permissions
+    """
+    import zipfile
+    
+    info = zipfile.ZipInfo(name, date_time=timestamp.timetuple()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 3  # Unix, so external_attr holds the file mode
+    info.external_attr = 0o100644 << 16
+    return info
+
+def save_workbook_reproducible(wb, path, timestamp):
+    """
+    Save an openpyxl workbook so unchanged content gives identical bytes.
+    
+    The document properties are set to `timestamp` (ExcelWriter is used
+    directly because openpyxl's save() stamps the current time as modified),
+    and the archive it writes is copied member by member, in openpyxl's fixed
+    part order, into a new zip with zip_entry() metadata.
+    
+    Args:
+        wb: Workbook to save
+        path: Output .xlsx path
+        timestamp: datetime to record as created/modified time
+    """
+    import io
+    import zipfile
+    from openpyxl.writer.excel import ExcelWriter
+    
+    wb.properties.created = timestamp
+    wb.properties.modified = timestamp
+    buffer = io.BytesIO()
+    ExcelWriter(wb, zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED)).save()
+    
+    with zipfile.ZipFile(buffer) as src, zipfile.ZipFile(path, 'w') as dst:
+        for info in src.infolist():
+            dst.writestr(zip_entry(info.filename, timestamp), src.read(info))
+
+def file_sha256(path):
+    """Return the hex SHA-256 digest of the file at `path`."""
+    import hashlib
+    
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# ============================================================================
+# DIRECT XLSX WRITER
+# ============================================================================
+
+SPREADSHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+DOC_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Content types of the parts written, by part name (sheets are added per sheet)
+DIRECT_CONTENT_TYPES = {
+    '/xl/workbook.xml': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml',
+    '/xl/styles.xml': 'application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml',
+    '/xl/sharedStrings.xml':
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml',
+    '/docProps/core.xml': 'application/vnd.openxmlformats-package.core-properties+xml',
+    '/docProps/app.xml': 'application/vnd.openxmlformats-officedocument.extended-properties+xml',
+}
+WORKSHEET_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+
+def _xml_escape(text):
+    """Escape text for an XML element or attribute value."""
+    return (text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;'))
+
+def _xml_number(value):
+    """Format a number for an XML attribute (30.0 -> '30', 20.350000000000001 -> '20.35')."""
+    return f'{value:.10g}'
+
+class SharedStrings:
+    """The shared string table, in order of first use."""
+    
+    def __init__(self):
+        self.strings = []
+        self._index = {}
+    
+    def index(self, text):
+        """Index of `text` in the table, adding it if new."""
+        idx = self._index.get(text)
+        if idx is None:
+            idx = self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return idx
+    
+    def xml(self):
+        items = ''.join(f'<si><t>{_xml_escape(text)}</t></si>' for text in self.strings)
+        return (f'{XML_DECLARATION}<sst xmlns="{SPREADSHEET_NS}" count="{len(self.strings)}" '
+                f'uniqueCount="{len(self.strings)}">{items}</sst>')
+
+class DirectStyles:
+    """
+    The styles.xml of a directly written workbook: the same header, data and
+    data-alt named styles (and font sizes) as get_named_styles(), numbered
+    in the order sheets first use them.
+    """
+    
+    # Fill 2 is the alternating row fill; fills 0 and 1 are required defaults
+    FILLS = ('<fill><patternFill patternType="none"/></fill>'
+             '<fill><patternFill patternType="gray125"/></fill>'
+             '<fill><patternFill patternType="solid"><fgColor rgb="00E2E2E2"/>'
+             '<bgColor rgb="00E2E2E2"/></patternFill></fill>')
+    # Border 1 is the thin border around every table cell
+    BORDERS = ('<border><left/><right/><top/><bottom/><diagonal/></border>'
+               '<border><left style="thin"/><right style="thin"/><top style="thin"/>'
+               '<bottom style="thin"/></border>')
+    
+    def __init__(self):
+        # (bold, size) per font; font 0 is the workbook default (11pt Calibri)
+        self.fonts = [None]
+        # (name, font index, fill index, wrap text) per named style/cell format
+        self.formats = []
+        self._format_index = {}
+    
+    def _font(self, bold, size):
+        if (bold, size) not in self.fonts:
+            self.fonts.append((bold, size))
+        return self.fonts.index((bold, size))
+    
+    def _add(self, name, font, fill, wrap):
+        if name not in self._format_index:
+            self.formats.append((name, font, fill, wrap))
+            # Format 0 is the default, so named styles start at 1
+            self._format_index[name] = len(self.formats)
+        return self._format_index[name]
+    
+    def named_styles(self, header_font_size=11, data_font_size=11):
+        """
+        Cell format (s="...") indices of the named styles for a pair of font
+        sizes, keyed like named_style_names().
+        """
+        names = named_style_names(header_font_size, data_font_size)
+        data_font = self._font(False, data_font_size)
+        return {
+            'header': self._add(names['header'], self._font(True, header_font_size), 0, True),
+            'data': self._add(names['data'], data_font, 0, False),
+            'data-alt': self._add(names['data-alt'], data_font, 2, False),
+        }
+    
+    def xml(self):
+        fonts = []
+        for font in self.fonts:
+            if font is None:
+                fonts.append('<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>')
+            else:
+                bold, size = font
+                weight = '<b val="1"/>' if bold else ''
+                fonts.append(f'<font>{weight}<sz val="{_xml_number(size)}"/></font>')
+        style_xfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>']
+        cell_xfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>']
+        cell_styles = ['<cellStyle name="Normal" xfId="0" builtinId="0"/>']
+        for idx, (name, font, fill, wrap) in enumerate(self.formats, start=1):
+            wrap_text = ' wrapText="1"' if wrap else ''
+            alignment = f'<alignment horizontal="center" vertical="center"{wrap_text}/>'
+            xf = (f'numFmtId="0" fontId="{font}" fillId="{fill}" borderId="1" applyFont="1" '
+                  f'applyFill="1" applyBorder="1" applyAlignment="1"')
+            style_xfs.append(f'<xf {xf}>{alignment}</xf>')
+            cell_xfs.append(f'<xf {xf} xfId="{idx}">{alignment}</xf>')
+            cell_styles.append(f'<cellStyle name="{_xml_escape(name)}" xfId="{idx}"/>')
+        return (
+            f'{XML_DECLARATION}<styleSheet xmlns="{SPREADSHEET_NS}">'
+            f'<fonts count="{len(fonts)}">{"".join(fonts)}</fonts>'
+            f'<fills count="3">{self.FILLS}</fills>'
+            f'<borders count="2">{self.BORDERS}</borders>'
+            f'<cellStyleXfs count="{len(style_xfs)}">{"".join(style_xfs)}</cellStyleXfs>'
+            f'<cellXfs count="{len(cell_xfs)}">{"".join(cell_xfs)}</cellXfs>'
+            f'<cellStyles count="{len(cell_styles)}">{"".join(cell_styles)}</cellStyles>'
+            '</styleSheet>'
+        )
+
+def render_sheet_template(layout, shared_strings):
+    """
+    Render the <sheetData> and <mergeCells> XML of a sheet layout once.
+    
+    Style indices and row heights are left as str.format() fields ({header},
+    {data}, {alt}, {ht1}-{ht3} and {ht}), so sheets that differ only in page
+    setup and style scale share the rendering.
+    
+    Args:
+        layout: SheetLayout to render
+        shared_strings: SharedStrings table that cell texts are added to
+    
+    Returns:
+        str: The template
+    """
+    values = layout.values
+    letters = [None] + [column_letter(col) for col in range(1, layout.last_col + 1)]
+    
+    def row_xml(row, style, height):
+        cells = []
+        for col in range(1, layout.last_col + 1):
+            text = values.get((row, col))
+            if text is None:
+                cells.append(f'<c r="{letters[col]}{row}" s="{style}"/>')
+            else:
+                cells.append(f'<c r="{letters[col]}{row}" s="{style}" t="s">'
+                             f'<v>{shared_strings.index(text)}</v></c>')
+        return f'<row r="{row}" ht="{height}" customHeight="1">{"".join(cells)}</row>'
+    
+    parts = ['<sheetData>']
+    for row in range(1, 4):
+        parts.append(row_xml(row, '{header}', f'{{ht{row}}}'))
+    for first_row, last_row, alternate_color in layout.group_rows:
+        style = '{alt}' if alternate_color else '{data}'
+        for row in range(first_row, last_row + 1):
+            parts.append(row_xml(row, style, '{ht}'))
+    parts.append('</sheetData>')
+    parts.append(f'<mergeCells count="{len(layout.merged_ranges)}">')
+    parts.extend(f'<mergeCell ref="{ref}"/>' for ref in layout.merged_ranges)
+    parts.append('</mergeCells>')
+    return ''.join(parts)
+
+def _sheet_head(layout, config, selected):
+    """Worksheet XML before <sheetData>: properties, view and column widths."""
+    fit_to_page = '1' if config.get('use_fit_to_page', True) else '0'
+    tab_selected = ' tabSelected="1"' if selected else ''
+    width_multiplier = config.get('column_width_multiplier', 1.0)
+    cols = ''.join(
+        f'<col min="{col}" max="{col}" '
+        f'width="{_xml_number(column_width(col) * width_multiplier)}" customWidth="1"/>'
+        for col in range(1, layout.last_col + 1)
+    )
+    return (
+        f'{XML_DECLARATION}<worksheet xmlns="{SPREADSHEET_NS}" xmlns:r="{DOC_REL_NS}">'
+        f'<sheetPr><pageSetUpPr fitToPage="{fit_to_page}"/></sheetPr>'
+        f'<dimension ref="A1:{column_letter(layout.last_col)}{layout.last_data_row}"/>'
+        f'<sheetViews><sheetView{tab_selected} workbookViewId="0">'
+        '<pane ySplit="3" topLeftCell="A4" activePane="bottomLeft" state="frozen"/>'
+        '<selection pane="bottomLeft" activeCell="A1" sqref="A1"/></sheetView></sheetViews>'
+        '<sheetFormatPr defaultRowHeight="15"/>'
+        f'<cols>{cols}</cols>'
+    )
+
+def _sheet_tail(config):
+    """Worksheet XML after <mergeCells>: print options, margins, page setup and footer."""
+    margins = ' '.join(f'{side}="{_xml_number(margin)}"' for side, margin in PAGE_MARGINS.items())
+    page_setup = f'orientation="{config["orientation"]}" paperSize="{config["paper_size"]}"'
+    if config.get('use_fit_to_page', True):
+        page_setup += f' fitToHeight="{config["fit_height"]}" fitToWidth="{config["fit_width"]}"'
+    if 'paper_width' in config and 'paper_height' in config:
+        page_setup += (f' paperHeight="{config["paper_height"]}in"'
+                       f' paperWidth="{config["paper_width"]}in"')
+    return (
+        '<printOptions horizontalCentered="1" verticalCentered="0" gridLines="0"/>'
+        f'<pageMargins {margins}/>'
+        f'<pageSetup {page_setup}/>'
+        f'<headerFooter><oddFooter>{_xml_escape("&C" + FOOTER_TEXT)}</oddFooter></headerFooter>'
+        '</worksheet>'
+    )
+
+def write_xlsx_direct(path, configs=None, timer=None, timestamp=None):
+    """
+    Write the chart workbook straight to an .xlsx zip, without openpyxl.
+    
+    Sheets are streamed into the zip one at a time from build_sheet_layout().
+    The cell XML of each layout is rendered once (render_sheet_template())
+    and reused by every sheet with the same tap columns; only the sheet head,
+    style indices, row heights and page setup are written per sheet. Shared
+    strings, styles and the workbook parts follow the sheets.
+    
+    Args:
+        path: Output .xlsx path
+        configs: List of page configuration dicts (default: PAGE_CONFIGS)
+        timer: PhaseTimer to record 'render' and 'save' times in
+        timestamp: datetime recorded in docProps and on every zip entry
+            (default: now; see build_timestamp())
+    """
+    import zipfile
+    
+    if configs is None:
+        configs = PAGE_CONFIGS
+    if timer is None:
+        timer = PhaseTimer(enabled=False)
+    if timestamp is None:
+        timestamp = build_timestamp()
+    timer.lap()
+    
+    shared_strings = SharedStrings()
+    styles = DirectStyles()
+    templates = {}
+    
+    with zipfile.ZipFile(path, 'w') as zf:
+        for idx, config in enumerate(configs, start=1):
+            config = resolve_config(config)
+            layout = build_sheet_layout(config.get('thread_percentages'))
+            template = templates.get(layout)
+            if template is None:
+                template = templates[layout] = render_sheet_template(layout, shared_strings)
+            formats = styles.named_styles(config.get('header_font_size', 11),
+                                          config.get('data_font_size', 11))
+            row_multiplier = config.get('row_height_multiplier', 1.0)
+            heights = {f'ht{row}': _xml_number(height * row_multiplier)
+                       for row, height in enumerate(HEADER_ROW_HEIGHTS, start=1)}
+            body = template.format(header=formats['header'], data=formats['data'],
+                                   alt=formats['data-alt'],
+                                   ht=_xml_number(DATA_ROW_HEIGHT * row_multiplier), **heights)
+            timer.lap('render')
+            
+            with zf.open(zip_entry(f'xl/worksheets/sheet{idx}.xml', timestamp), 'w') as part:
+                part.write(_sheet_head(layout, config, selected=(idx == 1)).encode())
+                part.write(body.encode())
+                part.write(_sheet_tail(config).encode())
+            timer.lap('save')
+        
+        sheet_count = len(configs)
+        sheets = ''.join(
+            f'<sheet name="{_xml_escape(config["name"])}" sheetId="{idx}" r:id="rId{idx}"/>'
+            for idx, config in enumerate(configs, start=1)
+        )
+        zf.writestr(zip_entry('xl/workbook.xml', timestamp), (
+            f'{XML_DECLARATION}<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{DOC_REL_NS}">'
+            '<workbookPr/><bookViews><workbookView activeTab="0"/></bookViews>'
+            f'<sheets>{sheets}</sheets><calcPr calcId="124519" fullCalcOnLoad="1"/></workbook>'
+        ))
+        relationships = [
+            (f'rId{idx}', 'worksheet', f'worksheets/sheet{idx}.xml')
+            for idx in range(1, sheet_count + 1)
+        ] + [
+            (f'rId{sheet_count + 1}', 'styles', 'styles.xml'),
+            (f'rId{sheet_count + 2}', 'sharedStrings', 'sharedStrings.xml'),
+        ]
+        zf.writestr(zip_entry('xl/_rels/workbook.xml.rels', timestamp), (
+            f'{XML_DECLARATION}<Relationships xmlns="{PKG_REL_NS}">' + ''.join(
+                f'<Relationship Id="{rel_id}" Type="{DOC_REL_NS}/{rel_type}" Target="{target}"/>'
+                for rel_id, rel_type, target in relationships
+            ) + '</Relationships>'
+        ))
+        zf.writestr(zip_entry('xl/styles.xml', timestamp), styles.xml())
+        zf.writestr(zip_entry('xl/sharedStrings.xml', timestamp), shared_strings.xml())
+        
+        created = timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+        zf.writestr(zip_entry('docProps/core.xml', timestamp), (
+            f'{XML_DECLARATION}<cp:coreProperties '
+            'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            '<dc:creator>inch_taps_drills.py</dc:creator>'
+            f'<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created>'
+            f'<dcterms:modified xsi:type="dcterms:W3CDTF">{created}</dcterms:modified>'
+            '</cp:coreProperties>'
+        ))
+        zf.writestr(zip_entry('docProps/app.xml', timestamp), (
+            f'{XML_DECLARATION}<Properties xmlns="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/extended-properties"><Application>inch_taps_drills.py'
+            '</Application></Properties>'
+        ))
+        zf.writestr(zip_entry('_rels/.rels', timestamp), (
+            f'{XML_DECLARATION}<Relationships xmlns="{PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{DOC_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            f'<Relationship Id="rId2" Type="{PKG_REL_NS}/metadata/core-properties" '
+            'Target="docProps/core.xml"/>'
+            f'<Relationship Id="rId3" Type="{DOC_REL_NS}/extended-properties" '
+            'Target="docProps/app.xml"/></Relationships>'
+        ))
+        overrides = dict(DIRECT_CONTENT_TYPES)
+        for idx in range(1, sheet_count + 1):
+            overrides[f'/xl/worksheets/sheet{idx}.xml'] = WORKSHEET_CONTENT_TYPE
+        zf.writestr(zip_entry('[Content_Types].xml', timestamp), (
+            f'{XML_DECLARATION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+            'content-types"><Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>' + ''.join(
+                f'<Override PartName="{name}" ContentType="{content_type}"/>'
+                for name, content_type in overrides.items()
+            ) + '</Types>'
+        ))
+    timer.lap('save')
+
+# ============================================================================
+# PDF RENDERER
+# ============================================================================
+
+# Advance widths (1/1000 em) of the standard Helvetica fonts for the printable
+# ASCII characters ' ' (32) to '~' (126), from the Adobe Core 14 AFM files.
+# The fonts themselves are built into every PDF viewer, so nothing is embedded
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+# Paper sizes in inches (width, height in portrait) by spreadsheet paperSize
+# code; code 0 uses the config's own paper_width/paper_height
+PAPER_SIZES = {1: (8.5, 11), 3: (11, 17)}
+
+POINTS_PER_INCH = 72
+
+# Drawing parameters, in points at 100% scale
+CELL_PADDING = 2
+LINE_SPACING = 1.15
+THIN_LINE_WIDTH = 0.75
+FOOTER_FONT_SIZE = 10
+
+# Fill of the alternating screw size groups, as a PDF gray level (#E2E2E2)
+ALT_ROW_GRAY = 0xE2 / 0xFF
+
+def text_width(text, size, bold=False):
+    """Width in points of `text` set in Helvetica (or Helvetica-Bold) at `size`."""
+    widths = HELVETICA_BOLD_WIDTHS if bold else HELVETICA_WIDTHS
+    return sum(widths[ord(char) - 32] for char in text) * size / 1000
+
+def wrap_lines(text, width, size, bold=False):
+    """
+    Break `text` into lines no wider than `width` at spaces.
+    
+    A single word wider than `width` gets a line of its own.
+    
+    Returns:
+        list: The lines, in order
+    """
+    lines = []
+    line = ''
+    for word in text.split():
+        candidate = f'{line} {word}' if line else word
+        if line and text_width(candidate, size, bold) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    lines.append(line)
+    return lines
+
+def page_size(config):
+    """
+    Page size of a config in points, oriented as printed.
+    
+    Returns:
+        tuple: (width, height)
+    """
+    if 'paper_width' in config and 'paper_height' in config:
+        width, height = config['paper_width'], config['paper_height']
+    else:
+        width, height = PAPER_SIZES[config['paper_size']]
+        if config['orientation'] == 'landscape':
+            width, height = height, width
+    return width * POINTS_PER_INCH, height * POINTS_PER_INCH
+
+def printable_area(config):
+    """
+    Area of a config's page inside the margins, in points.
+    
+    Returns:
+        tuple: (left, bottom, width, height)
+    """
+    page_width, page_height = page_size(config)
+    left = PAGE_MARGINS['left'] * POINTS_PER_INCH
+    bottom = PAGE_MARGINS['bottom'] * POINTS_PER_INCH
+    return (left, bottom, page_width - left - PAGE_MARGINS['right'] * POINTS_PER_INCH,
+            page_height - bottom - PAGE_MARGINS['top'] * POINTS_PER_INCH)
+
+def column_points(width):
+    """Printed width in points of a column `width` characters wide (Calibri 11 digits)."""
+    return (width * 7 + 5) * 0.75
+
+def parse_cell_range(cell_range):
+    """
+    Parse a range reference like 'A4:B6'.
+    
+    Returns:
+        tuple: (first_row, first_col, last_row, last_col), 1-based
+    """
+    corners = []
+    for ref in cell_range.split(':'):
+        col = 0
+        idx = 0
+        while ref[idx].isalpha():
+            col = col * 26 + ord(ref[idx]) - ord('A') + 1
+            idx += 1
+        corners.append((int(ref[idx:]), col))
+    (first_row, first_col), (last_row, last_col) = corners
+    return first_row, first_col, last_row, last_col
+
+def table_edges(layout, config):
+    """
+    Column and row edge positions of a sheet's table at 100% scale.
+    
+    Returns:
+        tuple: (x of each column's left edge plus the right edge,
+                y of each row's top edge plus the bottom edge), in points
+                from the table's top left corner; index 0 is column/row 1
+    """
+    col_multiplier = config.get('column_width_multiplier', 1.0)
+    row_multiplier = config.get('row_height_multiplier', 1.0)
+    
+    xs = [0.0]
+    for col in range(1, layout.last_col + 1):
+        xs.append(xs[-1] + column_points(column_width(col) * col_multiplier))
+    ys = [0.0]
+    for row in range(1, layout.last_data_row + 1):
+        height = HEADER_ROW_HEIGHTS[row - 1] if row <= len(HEADER_ROW_HEIGHTS) else DATA_ROW_HEIGHT
+        ys.append(ys[-1] + height * row_multiplier)
+    return xs, ys
+
+def _pdf_string(text):
+    """PDF literal string for `text`."""
+    return '(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+def _pdf_number(value):
+    """Compact PDF number (at most 3 decimals, no trailing zeros)."""
+    text = f'{value:.3f}'.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+def render_chart(layout, config, scale=1.0):
+    """
+    Draw a sheet's table as PDF content, in points with the origin at the
+    table's bottom left corner.
+    
+    Fills come first, then the cell borders (interior edges of merged ranges
+    are left out), then the text: bold and wrapped in the header rows,
+    centered in its cell or merged range, shrunk if it would not fit.
+    
+    Args:
+        layout: SheetLayout to draw
+        config: Page configuration dict (multipliers and font sizes)
+        scale: Scale the table will be printed at; line widths are divided by
+            it so borders print at THIN_LINE_WIDTH
+    
+    Returns:
+        tuple: (content bytes, table width, table height)
+    """
+    xs, ys = table_edges(layout, config)
+    width, height = xs[-1], ys[-1]
+    header_font_size = config.get('header_font_size', 11)
+    data_font_size = config.get('data_font_size', 11)
+    last_header_row = len(HEADER_ROW_HEIGHTS)
+    num = _pdf_number
+    
+    ops = []
+    
+    # Alternating fills, one rectangle per screw size group
+    ops.append(f'{num(ALT_ROW_GRAY)} g')
+    for first_row, last_row, alternate in layout.group_rows:
+        if alternate:
+            ops.append(f'0 {num(height - ys[last_row])} {num(width)} '
+                       f'{num(ys[last_row] - ys[first_row - 1])} re f')
+    
+    # Cell boxes: single cells, or the merged range anchored at the cell
+    owner = {}
+    boxes = {}
+    for idx, cell_range in enumerate(layout.merged_ranges):
+        first_row, first_col, last_row, last_col = parse_cell_range(cell_range)
+        boxes[(first_row, first_col)] = (last_row, last_col)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                owner[(row, col)] = idx
+    
+    def joined(row_a, col_a, row_b, col_b):
+        merged = owner.get((row_a, col_a))
+        return merged is not None and merged == owner.get((row_b, col_b))
+    
+    # Borders, as runs of edge segments between cells that aren't merged
+    ops.append(f'0 G {num(THIN_LINE_WIDTH / scale)} w')
+    for row in range(1, layout.last_data_row + 2):
+        start = None
+        for col in range(1, layout.last_col + 2):
+            edge = col <= layout.last_col and not joined(row - 1, col, row, col)
+            if edge and start is None:
+                start = col
+            elif not edge and start is not None:
+                y = num(height - ys[row - 1])
+                ops.append(f'{num(xs[start - 1])} {y} m {num(xs[col - 1])} {y} l')
+                start = None
+    for col in range(1, layout.last_col + 2):
+        start = None
+        for row in range(1, layout.last_data_row + 2):
+            edge = row <= layout.last_data_row and not joined(row, col - 1, row, col)
+            if edge and start is None:
+                start = row
+            elif not edge and start is not None:
+                x = num(xs[col - 1])
+                ops.append(f'{x} {num(height - ys[start - 1])} m {x} {num(height - ys[row - 1])} l')
+                start = None
+    ops.append('S')
+    
+    # Text
+    ops.append('0 g BT')
+    for (row, col), text in layout.values.items():
+        last_row, last_col = boxes.get((row, col), (row, col))
+        box_width = xs[last_col] - xs[col - 1] - 2 * CELL_PADDING
+        box_height = ys[last_row] - ys[row - 1]
+        bold = row <= last_header_row
+        size = header_font_size if bold else data_font_size
+        if bold:
+            lines = wrap_lines(text, box_width, size, bold)
+        else:
+            lines = [text]
+        widest = max(text_width(line, size, bold) for line in lines)
+        if widest > box_width:
+            size *= box_width / widest
+        leading = size * LINE_SPACING
+        # Center the block of lines; a Helvetica capital is ~0.72 em tall
+        baseline = (height - ys[row - 1] - (box_height - leading * (len(lines) - 1)) / 2
+                    - 0.36 * size)
+        ops.append(f'/{"F2" if bold else "F1"} {num(size)} Tf')
+        for line in lines:
+            x = xs[col - 1] + (xs[last_col] - xs[col - 1] - text_width(line, size, bold)) / 2
+            ops.append(f'1 0 0 1 {num(x)} {num(baseline)} Tm {_pdf_string(line)} Tj')
+            baseline -= leading
+    ops.append('ET')
+    return '\n'.join(ops).encode('latin-1'), width, height
+
+class PdfWriter:
+    """
+    Minimal PDF 1.4 writer: numbered objects, Flate-compressed streams and
+    a cross-reference table.
+    """
+    
+    def __init__(self):
+        self.objects = []
+    
+    def reserve(self):
+        """Allocate an object number to be filled in later with add()."""
+        self.objects.append(None)
+        return len(self.objects)
+    
+    def add(self, body, obj_id=None):
+        """Add (or fill in a reserved) object from its PDF source; returns its number."""
+        if isinstance(body, str):
+            body = body.encode('latin-1')
+        if obj_id is None:
+            obj_id = self.reserve()
+        self.objects[obj_id - 1] = body
+        return obj_id
+    
+    def add_stream(self, data, attributes=''):
+        """Add a Flate-compressed stream object; `attributes` go in its dictionary."""
+        import zlib
+        
+        data = zlib.compress(data, 9)
+        return self.add(b'<< /Length %d /Filter /FlateDecode %s>>\nstream\n%s\nendstream'
+                        % (len(data), attributes.encode('latin-1'), data))
+    
+    def write(self, path, root, info):
+        """Write the file with `root` as the catalog and `info` as the document info."""
+        with open(path, 'wb') as f:
+            f.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+            offsets = []
+            for obj_id, body in enumerate(self.objects, start=1):
+                offsets.append(f.tell())
+                f.write(b'%d 0 obj\n%s\nendobj\n' % (obj_id, body))
+            xref = f.tell()
+            f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(self.objects) + 1))
+            for offset in offsets:
+                f.write(b'%010d 00000 n \n' % offset)
+            f.write(b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                    % (len(self.objects) + 1, root, info, xref))
+
+def variant_path(output, config, extension='.pdf', directory=None):
+    """
+    Path of a config's own output: inch_taps_drills.xlsx -> inch_taps_drills-letter.pdf
+    
+    Args:
+        output: Workbook output path, whose name the variants share
+        config: Page configuration dict (its 'pdf_suffix' names the file)
+        extension: '.pdf', or '.xlsx' for a standalone single-sheet workbook
+        directory: Directory for the file (default: the workbook's)
+    """
+    stem, _ = os.path.splitext(os.path.basename(output))
+    if directory is None:
+        directory = os.path.dirname(output)
+    return os.path.join(directory, f'{stem}-{config["pdf_suffix"]}{extension}')
+
+# Poster tiling defaults: overlap between neighbouring tiles (inches), and
+# registration mark radius, trim mark length and tile label size (points)
+TILE_OVERLAP = 0.25
+TILE_MARK_RADIUS = 9
+TRIM_MARK_LENGTH = 18
+TILE_LABEL_FONT_SIZE = 8
+
+def _registration_mark(x, y, radius):
+    """PDF path ops for a circle with a cross through it, centered on (x, y)."""
+    num = _pdf_number
+    k = radius * 0.5523  # Bezier control offset for a quarter circle
+    return (
+        f'{num(x + radius)} {num(y)} m '
+        f'{num(x + radius)} {num(y + k)} {num(x + k)} {num(y + radius)} {num(x)} {num(y + radius)} c '
+        f'{num(x - k)} {num(y + radius)} {num(x - radius)} {num(y + k)} {num(x - radius)} {num(y)} c '
+        f'{num(x - radius)} {num(y - k)} {num(x - k)} {num(y - radius)} {num(x)} {num(y - radius)} c '
+        f'{num(x + k)} {num(y - radius)} {num(x + radius)} {num(y - k)} {num(x + radius)} {num(y)} c '
+        f'{num(x - 2 * radius)} {num(y)} m {num(x + 2 * radius)} {num(y)} l '
+        f'{num(x)} {num(y - 2 * radius)} m {num(x)} {num(y + 2 * radius)} l'
+    )
+
+def poster_variant(across, down, base=None):
+    """
+    Page configuration for a poster of any tile grid.
+    
+    Args:
+        across: Number of tiles across
+        down: Number of tiles down
+        base: Poster config to copy the paper and styling from (default: the
+            first poster config in PAGE_CONFIGS)
+    
+    Returns:
+        dict: e.g. 'Tabloid Landscape 4x3', written to inch_taps_drills-tabloid4x3.pdf
+    """
+    import re
+    
+    if base is None:
+        base = next(config for config in PAGE_CONFIGS if config.get('poster'))
+    grid = f'{across}x{down}'
+    return dict(
+        base,
+        name=re.sub(r'\d+x\d+$', grid, base['name']),
+        pdf_suffix=re.sub(r'\d+x\d+$', '', base['pdf_suffix']) + grid,
+        fit_width=across,
+        fit_height=down,
+    )
+
+def pdf_configs(posters=(), tile_overlap=None, tile_marks=True):
+    """
+    Page configurations to render as PDFs: PAGE_CONFIGS plus poster variants.
+    
+    Args:
+        posters: (across, down) grids to add poster_variant()s for
+        tile_overlap: Tile overlap in inches for every poster, overriding
+            the configs' own
+        tile_marks: Whether posters get registration and trim marks
+    
+    Returns:
+        list: Page configuration dicts (copies where anything was overridden)
+    """
+    configs = list(PAGE_CONFIGS) + [poster_variant(across, down) for across, down in posters]
+    overrides = {}
+    if tile_overlap is not None:
+        overrides['tile_overlap'] = tile_overlap
+    if not tile_marks:
+        overrides['tile_marks'] = False
+    if overrides:
+        configs = [dict(config, **overrides) if config.get('poster') else config
+                   for config in configs]
+    return configs
+
+def write_pdf(path, config, timestamp=None):
+    """
+    Render one page configuration straight to PDF.
+    
+    Regular configs follow the sheet's print setup: the table is scaled down
+    to fit fit_width x fit_height pages if use_fit_to_page is set (never
+    enlarged) and printed at 100% otherwise, centered horizontally within the
+    margins and split into page-sized pieces if it is bigger than one page,
+    ordered down then across.
+    
+    Configs with 'poster' set are tiled instead. The table is scaled to fill
+    a poster of fit_width x fit_height pages whose neighbours overlap by
+    'tile_overlap' inches (default TILE_OVERLAP), and the tiles are ordered
+    left to right, top to bottom. Each tile is labelled with its position
+    and, unless 'tile_marks' is false, gets registration marks inside the
+    overlaps (at the same poster position on both neighbours) and trim marks
+    in the margins at the middle of each overlap.
+    
+    Either way the table is drawn once, as a form XObject that each page
+    clips and places, and every page gets the footer.
+    
+    Args:
+        path: Output .pdf path
+        config: Page configuration dict
+        timestamp: datetime recorded as the creation date (default: now)
+    """
+    import math
+    
+    if timestamp is None:
+        timestamp = build_timestamp()
+    
+    config = resolve_config(config)
+    layout = build_sheet_layout(config.get('thread_percentages'))
+    page_width, page_height = page_size(config)
+    left, bottom, area_width, area_height = printable_area(config)
+    
+    xs, ys = table_edges(layout, config)
+    poster = config.get('poster', False)
+    if poster:
+        pages_across, pages_down = config['fit_width'], config['fit_height']
+        overlap = config.get('tile_overlap', TILE_OVERLAP) * POINTS_PER_INCH
+        if not 0 <= overlap < min(area_width, area_height):
+            raise ValueError(f"tile_overlap must be at least 0 and less than the printable "
+                             f"tile size, not {overlap / POINTS_PER_INCH:g} inches")
+        scale = min((pages_across * area_width - (pages_across - 1) * overlap) / xs[-1],
+                    (pages_down * area_height - (pages_down - 1) * overlap) / ys[-1])
+    else:
+        overlap = 0.0
+        scale = 1.0
+        if config.get('use_fit_to_page', True):
+            scale = min(1.0, config['fit_width'] * area_width / xs[-1],
+                        config['fit_height'] * area_height / ys[-1])
+        pages_across = max(1, math.ceil(xs[-1] * scale / area_width - 1e-9))
+        pages_down = max(1, math.ceil(ys[-1] * scale / area_height - 1e-9))
+    chart, width, height = render_chart(layout, config, scale)
+    step_x = area_width - overlap
+    step_y = area_height - overlap
+    offset = (pages_across * step_x + overlap - width * scale) / 2
+    if poster:
+        tiles = [(across, down) for down in range(pages_down) for across in range(pages_across)]
+    else:
+        tiles = [(across, down) for across in range(pages_across) for down in range(pages_down)]
+    
+    pdf = PdfWriter()
+    catalog = pdf.reserve()
+    pages = pdf.reserve()
+    font = pdf.add('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                   '/Encoding /WinAnsiEncoding >>')
+    bold_font = pdf.add('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold '
+                        '/Encoding /WinAnsiEncoding >>')
+    fonts = f'/Font << /F1 {font} 0 R /F2 {bold_font} 0 R >>'
+    form = pdf.add_stream(chart, f'/Type /XObject /Subtype /Form /BBox [0 0 {_pdf_number(width)} '
+                                 f'{_pdf_number(height)}] /Resources << {fonts} >> ')
+    
+    num = _pdf_number
+    footer_y = PAGE_MARGINS['footer'] * POINTS_PER_INCH
+    footer_width = text_width(FOOTER_TEXT, FOOTER_FONT_SIZE)
+    footer = (f'BT /F1 {FOOTER_FONT_SIZE} Tf {num((page_width - footer_width) / 2)} '
+              f'{num(footer_y)} Td {_pdf_string(FOOTER_TEXT)} Tj ET')
+    right = left + area_width
+    top = bottom + area_height
+    radius = min(TILE_MARK_RADIUS, overlap / 4) if overlap else TILE_MARK_RADIUS
+    kids = []
+    for across, down in tiles:
+        x = left - across * step_x + offset
+        y = top + down * step_y - height * scale
+        ops = [
+            f'q {num(left)} {num(bottom)} {num(area_width)} {num(area_height)} re W n',
+            f'{num(scale)} 0 0 {num(scale)} {num(x)} {num(y)} cm /Chart Do Q',
+            footer,
+        ]
+        if poster:
+            label = (f'{config["name"]}: row {down + 1} of {pages_down}, '
+                     f'column {across + 1} of {pages_across}')
+            ops.append(f'BT /F1 {TILE_LABEL_FONT_SIZE} Tf {num(left)} {num(footer_y)} Td '
+                       f'{_pdf_string(label)} Tj ET')
+        if poster and config.get('tile_marks', True):
+            # Middle of the overlap on each side shared with a neighbour
+            cuts_x = []
+            if across > 0:
+                cuts_x.append(left + overlap / 2)
+            if across < pages_across - 1:
+                cuts_x.append(right - overlap / 2)
+            cuts_y = []
+            if down > 0:
+                cuts_y.append(top - overlap / 2)
+            if down < pages_down - 1:
+                cuts_y.append(bottom + overlap / 2)
+            ops.append(f'q 0 G {num(THIN_LINE_WIDTH / 2)} w')
+            for cut in cuts_x:
+                ops.append(f'{num(cut)} {num(top + 2)} m {num(cut)} {num(top + 2 + TRIM_MARK_LENGTH)} l '
+                           f'{num(cut)} {num(bottom - 2)} m {num(cut)} {num(bottom - 2 - TRIM_MARK_LENGTH)} l')
+                for fraction in (0.25, 0.75):
+                    ops.append(_registration_mark(cut, bottom + area_height * fraction, radius))
+            for cut in cuts_y:
+                ops.append(f'{num(left - 2)} {num(cut)} m {num(left - 2 - TRIM_MARK_LENGTH)} {num(cut)} l '
+                           f'{num(right + 2)} {num(cut)} m {num(right + 2 + TRIM_MARK_LENGTH)} {num(cut)} l')
+                for fraction in (0.25, 0.75):
+                    ops.append(_registration_mark(left + area_width * fraction, cut, radius))
+            ops.append('S Q')
+        content = pdf.add_stream('\n'.join(ops).encode('latin-1'))
+        kids.append(pdf.add(
+            f'<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {num(page_width)} '
+            f'{num(page_height)}] /Resources << {fonts} /XObject << /Chart {form} 0 R >> >> '
+            f'/Contents {content} 0 R >>'
+        ))
+    pdf.add(f'<< /Type /Pages /Kids [{" ".join(f"{kid} 0 R" for kid in kids)}] '
+            f'/Count {len(kids)} >>', pages)
+    pdf.add(f'<< /Type /Catalog /Pages {pages} 0 R >>', catalog)
+    info = pdf.add(f'<< /Title {_pdf_string(config["name"])} /Producer (inch_taps_drills.py) '
+                   f'/CreationDate (D:{timestamp.strftime("%Y%m%d%H%M%S")}Z) >>')
+    pdf.write(path, catalog, info)
+
+# ============================================================================
+# LAYOUT SOLVER
+# ============================================================================
+
+# Config keys solve_layout() works out when a page configuration leaves them out
+LAYOUT_KEYS = ('column_width_multiplier', 'row_height_multiplier', 'header_font_size',
+               'data_font_size')
+
+# Search bounds for the multipliers and font sizes
+MAX_MULTIPLIER = 50.0
+MAX_FONT_SIZE = 400
+SEARCH_STEPS = 30
+
+# Width of each distinct cell text at 1pt, keyed by (text, bold); widths
+# scale linearly with font size
+_UNIT_TEXT_WIDTHS = {}
+
+def unit_text_width(text, bold=False):
+    """text_width() of `text` at 1pt, cached."""
+    key = (text, bold)
+    width = _UNIT_TEXT_WIDTHS.get(key)
+    if width is None:
+        width = _UNIT_TEXT_WIDTHS[key] = text_width(text, 1, bold)
+    return width
+
+def _largest(fits, high, steps=SEARCH_STEPS):
+    """Binary search for the largest value in (0, high] for which fits(value) holds."""
+    low = 0.0
+    if fits(high):
+        return high
+    for _ in range(steps):
+        middle = (low + high) / 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+def _text_boxes(layout, xs, ys, header):
+    """(text, box width less padding, box height) of each header or data cell."""
+    spans = {}
+    for cell_range in layout.merged_ranges:
+        first_row, first_col, last_row, last_col = parse_cell_range(cell_range)
+        spans[(first_row, first_col)] = (last_row, last_col)
+    last_header_row = len(HEADER_ROW_HEIGHTS)
+    boxes = []
+    for (row, col), text in layout.values.items():
+        if (row <= last_header_row) != header:
+            continue
+        last_row, last_col = spans.get((row, col), (row, col))
+        boxes.append((text, xs[last_col] - xs[col - 1] - 2 * CELL_PADDING,
+                      ys[last_row] - ys[row - 1]))
+    return boxes
+
+def solve_layout(config):
+    """
+    Work out the cell scale and font sizes that fill a config's paper.
+    
+    Only the paper size, the margins and the page grid (fit_width x
+    fit_height, or one page) are used. Columns and rows share one
+    multiplier, so cells keep the proportions of the hand-tuned configs; it
+    is binary searched for the largest table that fits the printable area of
+    the grid at 100% scale, which is the size the old configs printed at
+    after fit-to-page shrinking. The data font is then the largest at which
+    every value fits its cell (or merged range) on one line, and the header
+    font is binary searched for the largest at which every header, wrapped
+    as render_chart() wraps it, fits its box. Text is measured with the
+    cached Helvetica metrics, which run wider than the spreadsheet's
+    Calibri, so the result fits either way.
+    
+    Args:
+        config: Page configuration dict
+    
+    Returns:
+        dict: Values for LAYOUT_KEYS (multipliers to 0.01, fonts to whole points)
+    """
+    import math
+    
+    layout = build_sheet_layout(config.get('thread_percentages'))
+    _, _, area_width, area_height = printable_area(config)
+    area_width *= config.get('fit_width') or 1
+    area_height *= config.get('fit_height') or 1
+    
+    def table_size(multiplier):
+        xs, ys = table_edges(layout, {'column_width_multiplier': multiplier,
+                                      'row_height_multiplier': multiplier})
+        return xs[-1], ys[-1]
+    
+    def fits(multiplier):
+        width, height = table_size(multiplier)
+        return width <= area_width and height <= area_height
+    
+    multiplier = math.floor(_largest(fits, MAX_MULTIPLIER) * 100) / 100
+    xs, ys = table_edges(layout, {'column_width_multiplier': multiplier,
+                                  'row_height_multiplier': multiplier})
+    
+    data_font_size = min(
+        min(width / unit_text_width(text), height / LINE_SPACING)
+        for text, width, height in _text_boxes(layout, xs, ys, header=False)
+    )
+    
+    header_boxes = _text_boxes(layout, xs, ys, header=True)
+    
+    def headers_fit(size):
+        for text, width, height in header_boxes:
+            lines = wrap_lines(text, width, size, bold=True)
+            if len(lines) * size * LINE_SPACING > height:
+                return False
+            if any(unit_text_width(line, True) * size > width for line in lines):
+                return False
+        return True
+    
+    header_font_size = _largest(headers_fit, MAX_FONT_SIZE)
+    return {
+        'column_width_multiplier': multiplier,
+        'row_height_multiplier': multiplier,
+        'header_font_size': max(1, math.floor(header_font_size)),
+        'data_font_size': max(1, math.floor(data_font_size)),
+    }
+
+def resolve_config(config):
+    """
+    Fill in any LAYOUT_KEYS a page configuration leaves out with solve_layout().
+    
+    Returns:
+        dict: `config` itself if it sets them all, otherwise a completed copy
+    """
+    if all(key in config for key in LAYOUT_KEYS):
+        return config
+    solved = solve_layout(config)
+    return dict(config, **{key: config.get(key, solved[key]) for key in LAYOUT_KEYS})
+
+# ============================================================================
+# INCREMENTAL BUILD
+# ============================================================================
+
+# Bump whenever a change to the generation code alters the output for the
+# same data and configs, so that every output recorded in a manifest is
+# rebuilt
+GENERATOR_VERSION = 3
+
+MANIFEST_VERSION = 1
+
+def _digest(value):
+    """SHA-256 hex digest of repr(value) (dicts must be in a fixed order)."""
+    import hashlib
+    
+    return hashlib.sha256(repr(value).encode()).hexdigest()
+
+def data_digest():
+    """Digest of the drill and thread tables every sheet is generated from."""
+    return _digest((
+        NUMBER_DRILLS, LETTER_DRILLS, FRACTIONAL_DRILLS, file_sha256(THREAD_CATALOGUE_FILE),
+        CHART_SERIES, CHART_MAX_MAJOR, CAP_SCREW_DATA,
+        THREAD_PERCENT_CONSTANT, THREAD_PERCENT_LABELS,
+    ))
+
+def sheet_digest(config, data=None):
+    """
+    Digest of everything one sheet's content depends on.
+    
+    Args:
+        config: Page configuration dict for the sheet
+        data: data_digest() result, to avoid recomputing it per sheet
+    
+    Returns:
+        str: Hex digest that changes whenever the sheet would
+    """
+    if data is None:
+        data = data_digest()
+    return _digest((
+        GENERATOR_VERSION, data, HEADER_ROW_HEIGHTS, DATA_ROW_HEIGHT,
+        sorted(PAGE_MARGINS.items()), FOOTER_TEXT, sorted(config.items()),
+    ))
+
+def workbook_inputs(configs=None, backend='openpyxl', reproducible=False):
+    """
+    Describe the inputs of a workbook build for the manifest.
+    
+    Args:
+        configs: List of page configuration dicts (default: PAGE_CONFIGS)
+        backend: 'openpyxl' or 'direct'
+        reproducible: Whether the build uses --reproducible
+    
+    Returns:
+        dict: 'inputs' (digest of the whole build) and 'sheets' (sheet
+        name -> sheet_digest())
+    """
+    if configs is None:
+        configs = PAGE_CONFIGS
+    
+    data = data_digest()
+    sheets = {config['name']: sheet_digest(config, data) for config in configs}
+    writer = backend
+    if backend == 'openpyxl':
+        from importlib.metadata import version
+        writer += '-' + version('openpyxl')
+    return {
+        'inputs': _digest((writer, reproducible, list(sheets.items()))),
+        'sheets': sheets,
+    }
+
+def pdf_inputs(config, data=None):
+    """'inputs' digest of a config's PDF (see write_pdf())."""
+    return _digest(('pdf', sheet_digest(config, data)))
+
+def default_manifest_path(output):
+    """Manifest path for an output: inch_taps_drills.xlsx -> inch_taps_drills.manifest.json"""
+    return os.path.splitext(output)[0] + '.manifest.json'
+
+def load_manifest(path):
+    """
+    Load a build manifest, or an empty one if it's missing or unreadable.
+    
+    The manifest maps each output path to the 'inputs' digest it was built
+    from, the SHA-256 of the file written and any per-part digests.
+    """
+    import json
+    
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    if not isinstance(manifest, dict) or manifest.get('manifest_version') != MANIFEST_VERSION:
+        manifest = {'manifest_version': MANIFEST_VERSION, 'outputs': {}}
+    return manifest
+
+def save_manifest(path, manifest):
+    """Write a build manifest atomically."""
+    import json
+    
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+def output_is_current(manifest, path, inputs):
+    """
+    Check whether `path` was built from `inputs` and hasn't changed since.
+    
+    Args:
+        manifest: Manifest from load_manifest()
+        path: Output path
+        inputs: 'inputs' digest the output would be built from now
+    
+    Returns:
+        bool: True if the output can be kept as is
+    """
+    entry = manifest['outputs'].get(path)
+    if entry is None or entry.get('inputs') != inputs or not os.path.exists(path):
+        return False
+    return entry.get('sha256') == file_sha256(path)
+
+def changed_sheets(manifest, path, sheets):
+    """Names of sheets whose digest differs from the one recorded for `path`."""
+    recorded = manifest['outputs'].get(path, {}).get('sheets', {})
+    return [name for name, digest in sheets.items() if recorded.get(name) != digest]
+
+def record_output(manifest, path, inputs, **parts):
+    """Record a freshly built output (and any per-part digests) in the manifest."""
+    manifest['outputs'][path] = dict(parts, inputs=inputs, sha256=file_sha256(path))
+
+def write_workbook(path, backend='openpyxl', timer=None, timestamp=None, reproducible=False,
+                   configs=None):
+    """
+    Generate the workbook with the given backend.
+    
+    Args:
+        path: Output .xlsx path
+        backend: 'openpyxl' or 'direct'
+        timer: PhaseTimer to record phase times in
+        timestamp: datetime to record in the file (default: now)
+        reproducible: Save with fixed zip metadata (see save_workbook_reproducible())
+        configs: List of page configuration dicts (default: PAGE_CONFIGS)
+    """
+    if timer is None:
+        timer = PhaseTimer(enabled=False)
+    if timestamp is None:
+        timestamp = build_timestamp(reproducible)
+    
+    if backend == 'direct':
+        write_xlsx_direct(path, configs, timer=timer, timestamp=timestamp)
+        return
+    
+    wb = build_workbook(configs, timer=timer)
+    
+    # Save as Excel format (LibreOffice can open this)
+    timer.lap()
+    if reproducible:
+        save_workbook_reproducible(wb, path, timestamp)
+    else:
+        wb.save(path)
+    timer.lap('save')
+
+def export_variant(config, pdf_file=None, xlsx_file=None, backend='openpyxl', timestamp=None,
+                   reproducible=False):
+    """
+    Write the standalone outputs of one page configuration.
+    
+    Each variant is independent of the others, so with --jobs this runs in
+    a worker process per variant.
+    
+    Args:
+        config: Page configuration dict
+        pdf_file: Path to render the config's PDF to, if any
+        xlsx_file: Path to write a single-sheet workbook of the config to, if any
+        backend: Workbook backend for xlsx_file
+        timestamp: datetime to record in the files (default: now)
+        reproducible: As for write_workbook()
+    """
+    if timestamp is None:
+        timestamp = build_timestamp(reproducible)
+    if xlsx_file is not None:
+        write_workbook(xlsx_file, backend, timestamp=timestamp, reproducible=reproducible,
+                       configs=[config])
+    if pdf_file is not None:
+        write_pdf(pdf_file, config, timestamp)
+
+def parse_grid(text):
+    """Parse a tile grid like '4x3' into (4, 3), for argparse."""
+    import argparse
+    
+    try:
+        across, down = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ACROSSxDOWN, e.g. 4x3, not {text!r}")
+    if across < 1 or down < 1:
+        raise argparse.ArgumentTypeError(f"tile grid must be at least 1x1, not {text!r}")
+    return across, down
+
+def parse_tile_overlap(text):
+    """Parse a poster tile overlap in inches, for argparse."""
+    import argparse
+    
+    try:
+        overlap = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number of inches, not {text!r}")
+    # Every poster shares the paper of the poster configs in PAGE_CONFIGS
+    limit = min(min(printable_area(config)[2:]) for config in PAGE_CONFIGS
+                if config.get('poster')) / POINTS_PER_INCH
+    if not 0 <= overlap < limit:
+        raise argparse.ArgumentTypeError(
+            f"tile overlap must be at least 0 and less than the {limit:g} inch printable "
+            f"tile size, not {text!r}")
+    return overlap
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Generate the inch tap and drill chart workbook.'
+    )
+    parser.add_argument('-o', '--output', default='inch_taps_drills.xlsx',
+                        help='Output .xlsx path (default: inch_taps_drills.xlsx)')
+    parser.add_argument('--backend', choices=('openpyxl', 'direct'), default='openpyxl',
+                        help='openpyxl builds the workbook in memory; direct streams the '
+                             'sheet XML straight into the .xlsx zip (faster, no openpyxl)')
+    parser.add_argument('--reproducible', action='store_true',
+                        default=bool(os.environ.get(SOURCE_DATE_EPOCH_VAR)),
+                        help='Write byte-identical output for unchanged inputs: fixed '
+                             f'timestamps (from {SOURCE_DATE_EPOCH_VAR} if set) and zip '
+                             'metadata; prints the SHA-256 of the result. Enabled by '
+                             f'default when {SOURCE_DATE_EPOCH_VAR} is set')
+    parser.add_argument('--pdf', action='store_true',
+                        help='Also render each page configuration straight to PDF '
+                             '(inch_taps_drills-letter.pdf etc., next to the output)')
+    parser.add_argument('--pdf-dir', metavar='DIR',
+                        help='Directory for the --pdf, --poster and --split files (default: '
+                             'the output\'s)')
+    parser.add_argument('--split', action='store_true',
+                        help='Also write each page configuration as a standalone single-sheet '
+                             'workbook (inch_taps_drills-letter.xlsx etc.)')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='Export the page variants (--pdf, --poster and --split files) in '
+                             'up to N worker processes, one per variant, while the combined '
+                             'workbook is built (default: 1, all in this process)')
+    parser.add_argument('--poster', metavar='ACROSSxDOWN', action='append', default=[],
+                        type=parse_grid,
+                        help='Also write a tabloid poster PDF tiled ACROSS x DOWN pages, e.g. '
+                             '4x3 for inch_taps_drills-tabloid4x3.pdf (implies --pdf; repeatable)')
+    parser.add_argument('--tile-overlap', metavar='INCHES', type=parse_tile_overlap,
+                        help=f'Overlap between neighbouring poster tiles (default: {TILE_OVERLAP})')
+    parser.add_argument('--no-tile-marks', dest='tile_marks', action='store_false',
+                        help='Leave the registration and trim marks off poster tiles')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only regenerate outputs whose inputs (data tables, page '
+                             'configs, generator version, backend) changed since the build '
+                             'recorded in the manifest, and list the sheets that changed')
+    parser.add_argument('--manifest', metavar='FILE',
+                        help='Build manifest for --incremental (default: the output path '
+                             'with a .manifest.json extension)')
+    parser.add_argument('--profile', action='store_true',
+                        default=bool(os.environ.get(PROFILE_ENV_VAR)),
+                        help='Print wall time per generation phase (data, merge, style, '
+                             f'layout, save); also enabled by setting {PROFILE_ENV_VAR}')
+    parser.add_argument('--cprofile', metavar='FILE', default=os.environ.get(CPROFILE_ENV_VAR),
+                        help='Write cProfile stats for the whole run to FILE (view with '
+                             f'python -m pstats); also set by {CPROFILE_ENV_VAR}')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    timer = PhaseTimer(enabled=args.profile)
+    timestamp = build_timestamp(args.reproducible)
+    manifest = None
+    if args.incremental:
+        manifest_path = args.manifest or default_manifest_path(args.output)
+        manifest = load_manifest(manifest_path)
+    
+    # Standalone outputs per page variant: (config, pdf_file, xlsx_file),
+    # leaving out files whose inputs are unchanged
+    variants = []
+    pending = []  # (path, inputs, per-part digests) to record once written
+    current = []
+    want_pdf = args.pdf or bool(args.poster)
+    if want_pdf or args.split:
+        data = data_digest()
+        for config in pdf_configs(args.poster, args.tile_overlap, args.tile_marks):
+            files = {}
+            if want_pdf:
+                files['.pdf'] = {'inputs': pdf_inputs(config, data)}
+            if args.split:
+                files['.xlsx'] = workbook_inputs([config], args.backend, args.reproducible)
+            for extension, built in files.items():
+                path = variant_path(args.output, config, extension, args.pdf_dir)
+                if manifest is not None and output_is_current(manifest, path, built['inputs']):
+                    current.append(path)
+                    files[extension] = None
+                else:
+                    pending.append((path, built))
+                    files[extension] = path
+            if any(files.values()):
+                variants.append((config, files.get('.pdf'), files.get('.xlsx')))
+    
+    # With --jobs, variants render in worker processes while the combined
+    # workbook is built here
+    pool = None
+    if args.jobs > 1 and variants:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=min(args.jobs, len(variants)))
+        futures = [pool.submit(export_variant, config, pdf_file, xlsx_file, args.backend,
+                               timestamp, args.reproducible)
+                   for config, pdf_file, xlsx_file in variants]
+    
+    if manifest is not None:
+        built = workbook_inputs(backend=args.backend, reproducible=args.reproducible)
+        stale = not output_is_current(manifest, args.output, built['inputs'])
+        if stale:
+            changed = changed_sheets(manifest, args.output, built['sheets'])
+    else:
+        stale = True
+    if stale:
+        write_workbook(args.output, args.backend, timer, timestamp, args.reproducible)
+        if manifest is not None:
+            record_output(manifest, args.output, **built)
+    
+    timer.lap()
+    if pool is not None:
+        with pool:
+            for future in futures:
+                future.result()
+    else:
+        for config, pdf_file, xlsx_file in variants:
+            export_variant(config, pdf_file, xlsx_file, args.backend, timestamp,
+                           args.reproducible)
+    timer.lap('variants')
+    
+    if manifest is not None:
+        for path, built in pending:
+            record_output(manifest, path, **built)
+        save_manifest(manifest_path, manifest)
+    
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+    
+    if not stale:
+        print(f"Spreadsheet up to date: {args.output} (inputs unchanged since last build)")
+    else:
+        print(f"Spreadsheet created: {args.output}")
+        if args.incremental:
+            print(f"Sheets with changed inputs: {', '.join(changed) or 'none'}")
+        print(f"Created {len(PAGE_CONFIGS)} sheets with different page layouts:")
+        for config in PAGE_CONFIGS:
+            print(f"  - {config['name']}")
+        print("This file can be opened in LibreOffice Calc with all merged cells preserved.")
+    for path, _ in pending:
+        print(f"Created: {path}")
+    for path in current:
+        print(f"Up to date: {path}")
+    if args.reproducible:
+        print(f"SHA-256: {file_sha256(args.output)}")
+    if args.profile:
+        timer.report()
+    if profiler is not None:
+        print(f"cProfile stats written to {args.cprofile}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
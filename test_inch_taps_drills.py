@@ -0,0 +1,561 @@
+"""Tests for inch_taps_drills.py (run with: python -m pytest)."""
+
+import pytest
+
+import inch_taps_drills as itd
+
+# ============================================================================
+# DRILL VALUES
+# ============================================================================
+
+@pytest.mark.parametrize('text, name', [
+    ('#7', '#7'), ('#07', '#7'), ('f', 'F'), ('17/64', '17/64'), ('34/64', '17/32'),
+    ('1', '1'), ('64/64', '1'), ('1-1/64', '1-1/64'), (' 1-2/128 ', '1-1/64'),
+])
+def test_parse_drill_normalizes_names(text, name):
+    assert itd.parse_drill(text) is itd.DRILLS[name]
+
+@pytest.mark.parametrize('text', [
+    '', '#', '#X', 'E1', '0', '0/64', '1/0', '1/', '/2', '-1', '-1/2', '1-', '1-1', '1--1/2',
+    '1.5',
+])
+def test_parse_drill_rejects_malformed_sizes(text):
+    with pytest.raises(ValueError):
+        itd.parse_drill(text)
+
+def test_adhoc_fraction_is_not_interned():
+    drill = itd.parse_drill('1/3')
+    assert drill.decimal == 0.3333
+    assert '1/3' not in itd.DRILLS
+    assert itd.parse_drill('2/6') == drill
+    assert hash(itd.parse_drill('2/6')) == hash(drill)
+    assert drill not in itd.STANDARD_DRILLS
+
+def test_copied_drills_resolve_to_interned_instance():
+    import copy
+    import pickle
+    
+    drill = itd.parse_drill('17/64')
+    assert copy.deepcopy(drill) is drill
+    assert pickle.loads(pickle.dumps(drill)) is drill
+    assert pickle.loads(pickle.dumps(itd.parse_drill('1-3/8'))) == itd.parse_drill('1-3/8')
+
+def test_legacy_drill_helpers():
+    from fractions import Fraction
+    
+    assert itd.get_drill_decimal(53) == 0.0595
+    assert itd.get_drill_decimal('F') == 0.2570
+    assert itd.get_drill_decimal(Fraction(3, 64)) == 0.0469
+    assert itd.get_drill_decimal(0.1234) == 0.1234
+    assert itd.get_drill_decimal(itd.parse_drill('E')) == 0.2500
+    assert itd.format_drill_size(53) == '53'
+    assert itd.format_drill_size('F') == 'F'
+    assert itd.format_drill_size(Fraction(65, 64)) == '1-1/64'
+    assert itd.format_drill_size(Fraction(1)) == '1'
+    assert itd.format_drill_size(0.1234) == '0.1234'
+    with pytest.raises(ValueError):
+        itd.get_drill_decimal(None)
+    # Each spec type only names sizes in its own table
+    for spec in ('7', '#7', '17/64', 81, Fraction(1, 3)):
+        with pytest.raises(KeyError):
+            itd.get_drill_decimal(spec)
+    assert itd.FRACTIONAL_DRILLS[Fraction(3, 64)] == 0.0469
+
+# ============================================================================
+# DRILL REVERSE LOOKUP
+# ============================================================================
+
+@pytest.mark.parametrize('diameter', [0.2499, 0.2500, 0.2501])
+def test_nearest_tie_prefers_first_table(diameter):
+    # 'E' and 1/4 are both 0.2500; the number/letter tables come first
+    assert itd.DRILL_INDEX.nearest(diameter).name == 'E'
+    assert itd.DRILL_INDEX.nearest_many([diameter])[0].name == 'E'
+
+def test_nearest_many_matches_nearest():
+    index = itd.DRILL_INDEX
+    diameters = [0.0, 0.01, 0.0595, 0.06, 0.2345, 0.2500, 0.2501, 0.5, 0.99, 1.5]
+    assert list(index.nearest_many(diameters)) == [index.nearest(d) for d in diameters]
+
+def test_nearest_out_of_range():
+    index = itd.DRILL_INDEX
+    assert index.nearest(0.0) is index.drills[0]
+    assert index.nearest(5.0) is index.drills[-1]
+
+def test_next_larger_and_smaller():
+    index = itd.DRILL_INDEX
+    assert index.next_larger(0.2500).name == 'E'
+    assert index.next_smaller(0.2500).name == 'E'
+    assert index.next_larger(0.2501).name == 'F'
+    assert index.next_larger(5.0) is None
+    assert index.next_smaller(0.001) is None
+    assert list(index.next_larger_many([0.2500, 5.0])) == [index.next_larger(0.2500), None]
+    assert list(index.next_smaller_many([0.2500, 0.001])) == [index.next_smaller(0.2500), None]
+
+# ============================================================================
+# COMPUTED TAP DRILLS
+# ============================================================================
+
+def test_compute_tap_drills_quarter_twenty():
+    rows = itd.THREAD_CATALOGUE.select(['UNC'], min_major=0.25, max_major=0.25)
+    assert [itd.THREAD_CATALOGUE.sizes[row] for row in rows] == ['1/4']
+    drills = itd.compute_tap_drills([75, 50], rows)
+    assert [drill.name for drill in drills[0]] == ['#7', '7/32']
+
+def test_compute_tap_drills_matches_scalar_lookup():
+    catalogue = itd.THREAD_CATALOGUE
+    rows = catalogue.select(itd.CHART_SERIES, max_major=itd.CHART_MAX_MAJOR)
+    percentages = [83, 75, 65, 50]
+    drills = itd.compute_tap_drills(percentages, rows)
+    assert drills.shape == (len(rows), len(percentages))
+    for row, row_drills in zip(rows, drills):
+        for percent, drill in zip(percentages, row_drills):
+            ideal = itd.ideal_tap_drill(catalogue.major[row], catalogue.tpi[row], percent)
+            assert drill is itd.DRILL_INDEX.nearest(ideal)
+
+def test_thread_percent_labels():
+    assert itd.format_thread_percent_label(75) == itd.THREAD_PERCENT_LABELS[75]
+    assert itd.format_thread_percent_label(65) == '65% Thread'
+    assert itd.format_thread_percent_label(62.5) == '62.5% Thread'
+
+# ============================================================================
+# THREAD CATALOGUE
+# ============================================================================
+
+def test_catalogue_select():
+    catalogue = itd.THREAD_CATALOGUE
+    rows = catalogue.select(['UNC', 'UNF', 'UNEF'], min_major=0.25, max_major=0.25)
+    assert [(catalogue.sizes[row], catalogue.tpi[row]) for row in rows] == [
+        ('1/4', 20), ('1/4', 28), ('1/4', 32)]
+    assert [catalogue.drill('tap_75', row).name for row in rows] == ['#7', '#3', '7/32']
+    
+    rows = catalogue.select(max_major=10)
+    assert len(rows) == len(catalogue)
+    majors = [catalogue.major[row] for row in rows]
+    assert majors == sorted(majors)
+    assert all(itd.THREAD_SERIES[catalogue.series[row]] == '8-UN'
+               for row in catalogue.select(['8-UN']))
+
+def test_catalogue_converts_metric_rows():
+    catalogue = itd.THREAD_CATALOGUE
+    row, = (row for row in range(len(catalogue)) if catalogue.sizes[row] == 'M6')
+    assert catalogue.major[row] == pytest.approx(6 / 25.4)
+    assert catalogue.tpi[row] == pytest.approx(25.4)
+    assert catalogue.drill('tap_75', row).name == '#8'
+    assert catalogue.drill('close_fit', row) is None
+
+def catalogue_columns(catalogue):
+    """Every column of a ThreadCatalogue, for comparing two loads."""
+    return [catalogue.sizes] + [getattr(catalogue, name) for name, _ in catalogue.COLUMNS]
+
+@pytest.fixture
+def catalogue_file(tmp_path):
+    """A private copy of the catalogue CSV, so its cache can be changed freely."""
+    import shutil
+    
+    path = tmp_path / 'thread_catalogue.csv'
+    shutil.copyfile(itd.THREAD_CATALOGUE_FILE, path)
+    return str(path)
+
+def test_catalogue_cache_matches_parse(catalogue_file):
+    parsed = itd.ThreadCatalogue(catalogue_file, cache_path=False)
+    written = itd.ThreadCatalogue(catalogue_file)
+    cache_path = itd.catalogue_cache_path(catalogue_file)
+    with open(cache_path, 'rb') as f:
+        cache = f.read()
+    cached = itd.ThreadCatalogue(catalogue_file)
+    assert catalogue_columns(written) == catalogue_columns(parsed)
+    assert catalogue_columns(cached) == catalogue_columns(parsed)
+    with open(cache_path, 'rb') as f:
+        assert f.read() == cache  # a valid cache is not rewritten
+
+def test_catalogue_cache_is_rebuilt_when_the_csv_changes(catalogue_file):
+    itd.ThreadCatalogue(catalogue_file)
+    with open(catalogue_file, 'a') as f:
+        f.write('UNC,9,9.0000,4,8.6500,-,-,-,-\n')
+    catalogue = itd.ThreadCatalogue(catalogue_file)
+    assert catalogue.sizes[-1] == '9'
+    assert len(catalogue) == len(itd.THREAD_CATALOGUE) + 1
+
+@pytest.mark.parametrize('contents', [b'', b'garbage', b'\xff' * 64])
+def test_corrupt_catalogue_cache_is_ignored(catalogue_file, contents):
+    cache_path = itd.catalogue_cache_path(catalogue_file)
+    itd.ThreadCatalogue(catalogue_file)
+    with open(cache_path, 'wb') as f:
+        f.write(contents)
+    catalogue = itd.ThreadCatalogue(catalogue_file)
+    assert catalogue_columns(catalogue) == catalogue_columns(itd.THREAD_CATALOGUE)
+
+def test_thread_data_view():
+    from fractions import Fraction
+    
+    thread_data = itd.THREAD_DATA
+    assert list(thread_data)[:3] == ['#0', '#1', '#2']
+    assert list(thread_data)[-1] == '1"'
+    assert thread_data['#0'] == {
+        "major_diameter": 0.0600,
+        "threads": {80: {"minor_diameter": 0.0447, "tap_75": Fraction(3, 64), "tap_50": 55}},
+        "clearance": {"close_fit": 52, "free_fit": 50},
+        "shcs": {"hex": "0.050", "counterbore_drill": Fraction(1, 8),
+                 "counterbore_dia": 0.125, "counterbore_depth": 0.074},
+        "fhcs": {"hex": "0.035", "countersink_depth": 0.044},
+    }
+    assert sorted(thread_data['1/4']['threads']) == [20, 28, 32]
+    assert thread_data['1/4']['shcs']['hex'] == Fraction(3, 16)
+    assert 'shcs' not in thread_data['11/16']
+    assert itd.THREAD_DATA is thread_data
+
+def test_thread_data_matches_row_model():
+    groups = itd.build_row_model()
+    assert [group.screw_size for group in groups] == [
+        size.rstrip('"') for size in itd.THREAD_DATA]
+
+# ============================================================================
+# ROW MODEL
+# ============================================================================
+
+def test_row_model_quarter_inch_group():
+    groups = itd.build_row_model()
+    group = next(group for group in groups if group.screw_size == '1/4')
+    assert (group.label, group.major_text, group.span) == ('1/4', '.2500', 3)
+    assert group.clearance == ('F', '.2570', 'H', '.2660')
+    assert group.shcs == ('3/16', '7/16', '.4375', '.2780')
+    assert group.fhcs == ('5/32', '.1610')
+    assert [(row.tpi_text, row.minor_text, row.tap_drills) for row in group.threads] == [
+        ('20', '.1887', (('7', '.2010'), ('7/32', '.2188'))),
+        ('28', '.2062', (('3', '.2130'), ('1', '.2280'))),
+        ('32', '.2117', (('7/32', '.2188'), ('1', '.2280'))),
+    ]
+
+def test_row_model_is_shared_per_tap_columns():
+    assert itd.build_row_model() is itd.build_row_model()
+    computed = itd.build_row_model([75, 65, 50])
+    assert itd.build_row_model((75, 65, 50)) is computed
+    assert all(len(row.tap_drills) == 3 for group in computed for row in group.threads)
+    groups = itd.build_row_model()
+    majors = [group.major_diameter for group in groups]
+    assert majors == sorted(majors)
+    assert (groups[0].label, groups[-1].label) == ('0', '1')
+    assert 'shcs' not in itd.CAP_SCREW_DATA.get('11/16', {})
+    assert next(group for group in groups if group.screw_size == '11/16').shcs is None
+
+# ============================================================================
+# SPREADSHEET GENERATION
+# ============================================================================
+
+def test_phase_timer():
+    timer = itd.PhaseTimer(enabled=False)
+    timer.lap()
+    timer.lap('data')
+    assert timer.totals == {}
+    
+    timer = itd.PhaseTimer()
+    timer.lap()
+    timer.lap('data')
+    timer.lap('save')
+    timer.lap('data')
+    assert list(timer.totals) == ['data', 'save']
+    assert all(seconds >= 0 for seconds in timer.totals.values())
+
+def test_build_workbook_times_each_phase():
+    timer = itd.PhaseTimer()
+    itd.build_workbook(itd.PAGE_CONFIGS[:1], timer=timer)
+    assert list(timer.totals) == ['data', 'merge', 'style', 'layout']
+
+def test_named_styles_registered_once_per_font_size():
+    import openpyxl
+    
+    wb = openpyxl.Workbook()
+    names = itd.get_named_styles(wb, 10, 12)
+    assert names == {'header': 'header-10', 'data': 'data-12', 'data-alt': 'data-alt-12'}
+    count = len(wb.named_styles)
+    assert itd.get_named_styles(wb, 10, 12) == names
+    assert len(wb.named_styles) == count
+    itd.get_named_styles(wb, 10, 14)
+    assert len(wb.named_styles) == count + 2
+
+def test_chart_cells_use_named_styles():
+    config = itd.resolve_config(itd.PAGE_CONFIGS[0])
+    ws = itd.build_workbook([config]).active
+    names = itd.named_style_names(config['header_font_size'], config['data_font_size'])
+    assert ws['A1'].style == names['header']
+    assert ws['A1'].font.b and ws['A1'].font.sz == config['header_font_size']
+    data_styles = {ws.cell(row, 5).style for row in range(4, ws.max_row + 1)}
+    assert data_styles == {names['data'], names['data-alt']}
+
+def test_sheet_layout_scales_rows_and_columns():
+    config = itd.resolve_config(itd.PAGE_CONFIGS[0])
+    ws = itd.build_workbook([config]).active
+    row_scale = config['row_height_multiplier']
+    column_scale = config['column_width_multiplier']
+    assert [ws.row_dimensions[row].height for row in (1, 2, 3)] == pytest.approx(
+        [height * row_scale for height in itd.HEADER_ROW_HEIGHTS])
+    assert ws.row_dimensions[ws.max_row].height == pytest.approx(itd.DATA_ROW_HEIGHT * row_scale)
+    assert ws.column_dimensions['A'].width == pytest.approx(10 * column_scale)
+    assert ws.column_dimensions['E'].width == pytest.approx(11 * column_scale)
+
+# ============================================================================
+# DIRECT XLSX WRITER
+# ============================================================================
+
+def sheet_snapshot(ws):
+    """Values, merged ranges, styles and dimensions of a loaded sheet."""
+    cells = [(cell.coordinate, cell.value, cell.font.b, cell.font.sz, cell.fill.fgColor.rgb,
+              cell.alignment.wrap_text)
+             for row in ws.iter_rows() for cell in row]
+    return (cells, sorted(str(merged) for merged in ws.merged_cells.ranges),
+            # The direct writer rounds dimensions to 10 significant digits
+            {row: round(dimension.height, 6) for row, dimension in ws.row_dimensions.items()},
+            {col: round(dimension.width, 6) for col, dimension in ws.column_dimensions.items()},
+            ws.page_setup.paperSize, ws.page_setup.orientation, ws.oddFooter.center.text)
+
+def test_direct_writer_matches_openpyxl_backend(tmp_path):
+    import openpyxl
+    
+    itd.write_workbook(str(tmp_path / 'openpyxl.xlsx'))
+    itd.write_workbook(str(tmp_path / 'direct.xlsx'), backend='direct')
+    expected = openpyxl.load_workbook(tmp_path / 'openpyxl.xlsx')
+    actual = openpyxl.load_workbook(tmp_path / 'direct.xlsx')
+    assert actual.sheetnames == expected.sheetnames
+    for name in expected.sheetnames:
+        assert sheet_snapshot(actual[name]) == sheet_snapshot(expected[name])
+
+# ============================================================================
+# REPRODUCIBLE BUILDS
+# ============================================================================
+
+def test_build_timestamp(monkeypatch):
+    from datetime import datetime
+    
+    monkeypatch.delenv(itd.SOURCE_DATE_EPOCH_VAR, raising=False)
+    assert itd.build_timestamp(reproducible=True) == datetime(1980, 1, 1)
+    monkeypatch.setenv(itd.SOURCE_DATE_EPOCH_VAR, '1700000000')
+    assert itd.build_timestamp(reproducible=True) == datetime(2023, 11, 14, 22, 13, 20)
+    monkeypatch.setenv(itd.SOURCE_DATE_EPOCH_VAR, '0')
+    assert itd.build_timestamp(reproducible=True) == datetime(1980, 1, 1)
+    assert itd.build_timestamp().microsecond == 0
+
+@pytest.mark.parametrize('backend', ['openpyxl', 'direct'])
+def test_reproducible_builds_are_byte_identical(tmp_path, backend, monkeypatch):
+    import zipfile
+    
+    monkeypatch.setenv(itd.SOURCE_DATE_EPOCH_VAR, '1700000000')
+    configs = itd.PAGE_CONFIGS[:2]
+    first, second = tmp_path / 'first.xlsx', tmp_path / 'second.xlsx'
+    for path in (first, second):
+        itd.write_workbook(str(path), backend, reproducible=True, configs=configs)
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as zf:
+        assert {info.date_time for info in zf.infolist()} == {(2023, 11, 14, 22, 13, 20)}
+
+# ============================================================================
+# INCREMENTAL BUILD
+# ============================================================================
+
+def test_incremental_build_skips_current_outputs(tmp_path, capsys):
+    output = tmp_path / 'chart.xlsx'
+    argv = ['-o', str(output), '--incremental', '--split']
+    itd.main(argv)
+    out = capsys.readouterr().out
+    assert 'Sheets with changed inputs: ' + ', '.join(
+        config['name'] for config in itd.PAGE_CONFIGS) in out
+    manifest = itd.load_manifest(itd.default_manifest_path(str(output)))
+    assert str(output) in manifest['outputs']
+    
+    itd.main(argv)
+    out = capsys.readouterr().out
+    assert 'Spreadsheet up to date' in out
+    assert 'Created:' not in out
+    
+    # An edited output is rebuilt even though its inputs are unchanged
+    split = itd.variant_path(str(output), itd.PAGE_CONFIGS[0], '.xlsx')
+    with open(split, 'ab') as f:
+        f.write(b'edited')
+    output.unlink()
+    itd.main(argv)
+    out = capsys.readouterr().out
+    assert 'Sheets with changed inputs: none' in out
+    assert [line for line in out.splitlines() if line.startswith('Created:')] == [
+        f'Created: {split}']
+
+def test_changed_sheets_and_config_digests():
+    manifest = {'manifest_version': itd.MANIFEST_VERSION, 'outputs': {}}
+    built = itd.workbook_inputs()
+    manifest['outputs']['chart.xlsx'] = {'sheets': built['sheets']}
+    assert itd.changed_sheets(manifest, 'chart.xlsx', built['sheets']) == []
+    
+    configs = [dict(itd.PAGE_CONFIGS[0], data_font_size=9)] + itd.PAGE_CONFIGS[1:]
+    rebuilt = itd.workbook_inputs(configs)
+    assert rebuilt['inputs'] != built['inputs']
+    assert itd.changed_sheets(manifest, 'chart.xlsx', rebuilt['sheets']) == [
+        itd.PAGE_CONFIGS[0]['name']]
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    path = tmp_path / 'chart.manifest.json'
+    path.write_text('{not json')
+    assert itd.load_manifest(str(path)) == {'manifest_version': itd.MANIFEST_VERSION,
+                                            'outputs': {}}
+
+# ============================================================================
+# LAYOUT SOLVER
+# ============================================================================
+
+def test_solved_letter_layout():
+    assert itd.solve_layout(itd.PAGE_CONFIGS[0]) == {
+        'column_width_multiplier': 0.61, 'row_height_multiplier': 0.61,
+        'header_font_size': 5, 'data_font_size': 7,
+    }
+
+@pytest.mark.parametrize('config', itd.PAGE_CONFIGS, ids=lambda config: config['name'])
+def test_solved_table_fills_the_page_grid(config):
+    solved = itd.solve_layout(config)
+    assert solved['column_width_multiplier'] == solved['row_height_multiplier']
+    layout = itd.build_sheet_layout(config.get('thread_percentages'))
+    _, _, width, height = itd.printable_area(config)
+    width *= config.get('fit_width') or 1
+    height *= config.get('fit_height') or 1
+    
+    xs, ys = itd.table_edges(layout, solved)
+    assert xs[-1] <= width and ys[-1] <= height
+    larger = solved['column_width_multiplier'] + 0.01
+    xs, ys = itd.table_edges(layout, {'column_width_multiplier': larger,
+                                      'row_height_multiplier': larger})
+    assert xs[-1] > width or ys[-1] > height
+
+# Multipliers of the hand-tuned configs the solver replaced
+HAND_TUNED_MULTIPLIERS = {
+    'Letter Landscape 1pg': 1.0, 'Tabloid Landscape 1pg': 1.0, 'Tabloid Landscape 2x2': 2.0,
+    'Tabloid Landscape 3x3': 2.5, '24x36 Landscape 1pg': 1.85, '36x48 Landscape 1pg': 2.8,
+}
+
+@pytest.mark.parametrize('config', itd.PAGE_CONFIGS, ids=lambda config: config['name'])
+def test_solved_table_prints_at_the_hand_tuned_size(config):
+    # The old configs printed at their multiplier, shrunk to fit the page grid
+    # when use_fit_to_page is set
+    layout = itd.build_sheet_layout(config.get('thread_percentages'))
+    _, _, width, height = itd.printable_area(config)
+    width *= config.get('fit_width') or 1
+    height *= config.get('fit_height') or 1
+    multiplier = HAND_TUNED_MULTIPLIERS[config['name']]
+    xs, ys = itd.table_edges(layout, {'column_width_multiplier': multiplier,
+                                      'row_height_multiplier': multiplier})
+    shrink = min(1, width / xs[-1], height / ys[-1]) if config['use_fit_to_page'] else 1
+    
+    solved_xs, solved_ys = itd.table_edges(layout, itd.solve_layout(config))
+    # Column widths carry fixed padding, so widths don't scale exactly
+    assert solved_xs[-1] == pytest.approx(xs[-1] * shrink, rel=0.05)
+    assert solved_ys[-1] == pytest.approx(ys[-1] * shrink, rel=0.015)
+
+def test_resolve_config_keeps_explicit_values():
+    config = dict(itd.PAGE_CONFIGS[0], data_font_size=9)
+    resolved = itd.resolve_config(config)
+    assert resolved['data_font_size'] == 9
+    assert resolved['header_font_size'] == 5
+    assert 'header_font_size' not in config
+    assert itd.resolve_config(resolved) is resolved
+
+# ============================================================================
+# PDF RENDERER
+# ============================================================================
+
+def pdf_text(data):
+    """Decompressed content of every stream in a PDF written by PdfWriter."""
+    import re
+    import zlib
+    
+    streams = []
+    for match in re.finditer(rb'<< /Length (\d+) /Filter /FlateDecode .*?>>\nstream\n', data, re.S):
+        start = match.end()
+        streams.append(zlib.decompress(data[start:start + int(match.group(1))]))
+    return b''.join(streams)
+
+@pytest.mark.parametrize('config', itd.pdf_configs(), ids=lambda config: config['name'])
+def test_pdf_pages_and_media_box(tmp_path, config):
+    import re
+    
+    path = tmp_path / 'chart.pdf'
+    itd.write_pdf(str(path), config)
+    data = path.read_bytes()
+    assert data.startswith(b'%PDF-1.4') and data.endswith(b'%%EOF\n')
+    pages = config['fit_width'] * config['fit_height'] if config.get('poster') else 1
+    assert f'/Count {pages}'.encode() in data
+    width, height = itd.page_size(config)
+    assert re.search(rb'/MediaBox \[0 0 %g %g\]' % (width, height), data)
+    # The cross-reference table is where startxref says it is
+    offset = int(re.search(rb'startxref\n(\d+)', data).group(1))
+    assert data[offset:offset + 4] == b'xref'
+    assert b'(1/4)' in pdf_text(data)
+
+def test_pdf_is_reproducible_with_a_timestamp(tmp_path):
+    from datetime import datetime
+    
+    config = itd.PAGE_CONFIGS[0]
+    timestamp = datetime(2023, 11, 14, 22, 13, 20)
+    itd.write_pdf(str(tmp_path / 'a.pdf'), config, timestamp)
+    itd.write_pdf(str(tmp_path / 'b.pdf'), config, timestamp)
+    assert (tmp_path / 'a.pdf').read_bytes() == (tmp_path / 'b.pdf').read_bytes()
+
+# ============================================================================
+# POSTER TILING
+# ============================================================================
+
+@pytest.mark.parametrize('text', ['-0.1', '10', '100', 'nan', 'wide'])
+def test_tile_overlap_rejects_bad_values(text):
+    with pytest.raises(SystemExit):
+        itd.parse_args(['--tile-overlap', text])
+
+def test_tile_overlap_accepts_valid_values():
+    assert itd.parse_args(['--tile-overlap', '0']).tile_overlap == 0
+    assert itd.parse_args(['--tile-overlap', '0.5']).tile_overlap == 0.5
+
+def test_write_pdf_rejects_oversized_overlap(tmp_path):
+    config = itd.pdf_configs(posters=[(2, 2)], tile_overlap=50)[-1]
+    with pytest.raises(ValueError):
+        itd.write_pdf(str(tmp_path / 'poster.pdf'), config)
+
+def test_poster_pdf_has_one_page_per_tile(tmp_path):
+    path = tmp_path / 'poster.pdf'
+    itd.write_pdf(str(path), itd.poster_variant(3, 2))
+    assert b'/Count 6' in path.read_bytes()
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def test_import_has_no_side_effects(tmp_path):
+    import os
+    import subprocess
+    import sys
+    
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(itd.__file__)))
+    subprocess.run([sys.executable, '-c', 'import inch_taps_drills'], cwd=tmp_path, env=env,
+                   check=True)
+    assert list(tmp_path.iterdir()) == []
+
+def test_main_profile_reports_phases(tmp_path, capsys):
+    itd.main(['-o', str(tmp_path / 'chart.xlsx'), '--profile'])
+    out = capsys.readouterr().out
+    assert 'Phase timings:' in out
+    assert all(phase in out for phase in ('data', 'merge', 'style', 'layout', 'save'))
+
+def test_parallel_export_matches_serial(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv(itd.SOURCE_DATE_EPOCH_VAR, '1700000000')
+    outputs = {}
+    for jobs in (1, 3):
+        directory = tmp_path / f'jobs{jobs}'
+        directory.mkdir()
+        itd.main(['-o', str(directory / 'chart.xlsx'), '--pdf', '--split', '--poster', '2x1',
+                  '--jobs', str(jobs)])
+        outputs[jobs] = {path.name: path.read_bytes() for path in directory.iterdir()}
+    capsys.readouterr()
+    # Workbook, plus a PDF and a workbook per page config and the extra poster
+    assert len(outputs[1]) == 1 + 2 * len(itd.PAGE_CONFIGS) + 2
+    assert outputs[3] == outputs[1]
+
+def test_main_writes_every_sheet(tmp_path, capsys):
+    import openpyxl
+    
+    output = tmp_path / 'chart.xlsx'
+    itd.main(['-o', str(output)])
+    assert f'Spreadsheet created: {output}' in capsys.readouterr().out
+    wb = openpyxl.load_workbook(output)
+    assert wb.sheetnames == [config['name'] for config in itd.PAGE_CONFIGS]
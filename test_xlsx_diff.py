@@ -0,0 +1,371 @@
+"""Tests for xlsx_diff.py (run with: python -m pytest)."""
+
+import openpyxl
+import pytest
+
+import xlsx_diff
+
+def save_workbook(path, sheets):
+    """
+    Write a workbook of {sheet name: {cell ref: value}} to `path`.
+
+    Returns:
+        str: The path, for passing straight to compare_workbooks()
+    """
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name, cells in sheets.items():
+        ws = wb.create_sheet(name)
+        for ref, value in cells.items():
+            ws[ref] = value
+    wb.save(path)
+    return str(path)
+
+@pytest.fixture
+def two_sheet_pair(tmp_path):
+    """Workbooks where only sheet 'Changed' differs (in A1)."""
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'Same': {'A1': 5}, 'Changed': {'A1': 1, 'B2': 'x'}})
+    file2 = save_workbook(tmp_path / 'b.xlsx', {'Same': {'A1': 5}, 'Changed': {'A1': 2, 'B2': 'x'}})
+    return file1, file2
+
+# ============================================================================
+# SHEET COMPARISON
+# ============================================================================
+
+def test_dense_compare_visits_only_populated_cells(tmp_path):
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1, 'C5000': 'x'}})
+    file2 = save_workbook(tmp_path / 'b.xlsx', {'S': {'A1': 1, 'C5000': 'y', 'XFD1': 2}})
+    ws1 = openpyxl.load_workbook(file1)['S']
+    ws2 = openpyxl.load_workbook(file2)['S']
+    differences, count = xlsx_diff.compare_sheets(ws1, ws2, 'S')
+    assert [(diff['cell'], diff['file1'], diff['file2']) for diff in differences] == [
+        ('XFD1', None, 2), ('C5000', 'x', 'y')]
+    # Reading the cell store must not populate the used range
+    assert len(xlsx_diff.worksheet_cells(ws1)) == 2
+    assert len(xlsx_diff.worksheet_cells(ws2)) == 3
+
+class PublicOnly:
+    """Proxy that hides an object's private attributes, like another openpyxl version might."""
+    
+    def __init__(self, target):
+        self._target = target
+    
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._target, name)
+
+def test_worksheet_cells_public_fallback(tmp_path):
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1, 'C3': 'x'}})
+    ws = openpyxl.load_workbook(file1)['S']
+    cells = xlsx_diff.worksheet_cells(PublicOnly(ws))
+    assert {key: cell.value for key, cell in cells.items() if cell.value is not None} == {
+        (1, 1): 1, (3, 3): 'x'}
+
+def test_style_signatures_public_fallback(tmp_path):
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1, 'B1': 2}})
+    wb = openpyxl.load_workbook(file1)
+    wb['S']['A1'].font = openpyxl.styles.Font(bold=True)
+    wb['S']['B1'].number_format = '0.00'
+    indexed = xlsx_diff.StyleSignatures(wb)
+    public = xlsx_diff.StyleSignatures(PublicOnly(wb))
+    for cell in (wb['S']['A1'], wb['S']['B1'], None):
+        assert public(cell) == indexed(cell)
+
+# ============================================================================
+# PARALLEL COMPARISON
+# ============================================================================
+
+@pytest.mark.parametrize('method', ['dense', 'streaming', 'raw'])
+def test_jobs_with_one_changed_sheet(two_sheet_pair, method, capsys):
+    # The other sheet's hash matches, so only one sheet needs a cell walk
+    file1, file2 = two_sheet_pair
+    assert not xlsx_diff.compare_workbooks(file1, file2, method=method, jobs=3)
+    assert 'Found 1 total differences' in capsys.readouterr().out
+
+def test_jobs_without_hash_matches_serial(two_sheet_pair, capsys):
+    file1, file2 = two_sheet_pair
+    assert not xlsx_diff.compare_workbooks(file1, file2, jobs=1, use_hash=False)
+    serial = capsys.readouterr().out
+    assert not xlsx_diff.compare_workbooks(file1, file2, jobs=2, use_hash=False)
+    assert capsys.readouterr().out == serial
+
+@pytest.mark.parametrize('jobs', [1, 3])
+def test_jobs_with_sheet_option(two_sheet_pair, jobs, capsys):
+    # Regression: --jobs N --sheet X used to walk the parent's read-only sheet
+    file1, file2 = two_sheet_pair
+    assert not xlsx_diff.compare_workbooks(file1, file2, sheet_name='Changed', jobs=jobs)
+    assert 'Found 1 total differences' in capsys.readouterr().out
+
+def test_main_jobs_with_sheet_exit_code(two_sheet_pair, monkeypatch):
+    file1, file2 = two_sheet_pair
+    monkeypatch.setattr('sys.argv', ['xlsx_diff.py', file1, file2, '--sheet', 'Changed',
+                                     '--jobs', '3'])
+    with pytest.raises(SystemExit) as exit_info:
+        xlsx_diff.main()
+    assert exit_info.value.code == 1
+
+# ============================================================================
+# ROW ALIGNMENT
+# ============================================================================
+
+def lcs_length(a, b):
+    """Longest common subsequence length by dynamic programming."""
+    lengths = [0] * (len(b) + 1)
+    for x in a:
+        previous = 0
+        for j, y in enumerate(b, start=1):
+            previous, lengths[j] = lengths[j], (previous + 1 if x == y
+                                                else max(lengths[j], lengths[j - 1]))
+    return lengths[-1]
+
+def test_myers_matches_is_a_longest_common_subsequence():
+    import random
+    
+    rng = random.Random(7)
+    for _ in range(200):
+        a = [rng.randrange(4) for _ in range(rng.randrange(12))]
+        b = [rng.randrange(4) for _ in range(rng.randrange(12))]
+        matches = xlsx_diff._myers_matches(a, b)
+        assert all(a[i] == b[j] for i, j in matches)
+        assert all(i1 < i2 and j1 < j2 for (i1, j1), (i2, j2) in zip(matches, matches[1:]))
+        assert len(matches) == lcs_length(a, b)
+        edits = len(a) + len(b) - 2 * len(matches)
+        assert xlsx_diff._myers_matches(a, b, max_edits=edits) is not None
+        if edits:
+            assert xlsx_diff._myers_matches(a, b, max_edits=edits - 1) is None
+
+def test_myers_matches_gives_up_past_max_edits():
+    assert xlsx_diff._myers_matches([1, 2, 3], [4, 5, 6], max_edits=5) is None
+    assert len(xlsx_diff._myers_matches([1, 2, 3], [4, 5, 6], max_edits=6)) == 0
+    assert xlsx_diff._myers_matches([1, 2, 3], [1, 9, 2, 3], max_edits=1) == [(0, 0), (1, 2), (2, 3)]
+    assert xlsx_diff._myers_matches([], list(range(11)), max_edits=0) is None
+    assert xlsx_diff._myers_matches([1, 3, 0, 1, 4, 2, 3, 2, 3, 4], [1], max_edits=7) is None
+    assert xlsx_diff._myers_matches([1, 3, 0, 1, 4, 2, 3, 2, 3, 4], [1], max_edits=9) == [(0, 0)]
+    assert xlsx_diff._myers_matches([], [], max_edits=0) == []
+
+def test_aligned_rows_report_an_insertion_once(tmp_path, capsys):
+    cells = {f'A{row}': row for row in range(1, 21)}
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': cells})
+    inserted = {f'A{row + (row > 5)}': row for row in range(1, 21)}
+    inserted['A6'] = 'new'
+    file2 = save_workbook(tmp_path / 'b.xlsx', {'S': inserted})
+    assert not xlsx_diff.compare_workbooks(file1, file2, align_rows=True)
+    out = capsys.readouterr().out
+    assert 'Found 1 total differences' in out
+    
+    assert not xlsx_diff.compare_workbooks(file1, file2)
+    assert 'Found 16 total differences' in capsys.readouterr().out
+
+# ============================================================================
+# OUTPUT FORMATS
+# ============================================================================
+
+@pytest.fixture
+def three_cell_pair(tmp_path):
+    """Workbooks whose one sheet differs in A1, A2 and A3."""
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1, 'A2': 2, 'A3': 3}})
+    file2 = save_workbook(tmp_path / 'b.xlsx', {'S': {'A1': 2, 'A2': 4, 'A3': 6}})
+    return file1, file2
+
+@pytest.mark.parametrize('method', ['dense', 'streaming', 'raw'])
+def test_jsonl_writes_only_records_to_stdout(three_cell_pair, method, capsys):
+    import json
+    
+    file1, file2 = three_cell_pair
+    assert not xlsx_diff.compare_workbooks(file1, file2, method=method, output_format='jsonl')
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [(record['sheet'], record['cell'], record['file1'], record['file2'])
+            for record in records] == [('S', 'A1', 1, 2), ('S', 'A2', 2, 4), ('S', 'A3', 3, 6)]
+    assert 'Found 3 total differences' in err
+
+@pytest.mark.parametrize('output_format', ['text', 'jsonl'])
+def test_quick_stops_at_first_difference(three_cell_pair, output_format, capsys):
+    file1, file2 = three_cell_pair
+    assert not xlsx_diff.compare_workbooks(file1, file2, output_format=output_format,
+                                           quick=True)
+    out, err = capsys.readouterr()
+    assert 'stopped at first difference' in out + err
+    if output_format == 'jsonl':
+        assert len(out.splitlines()) == 1
+    else:
+        assert 'Cell A1' in out and 'Cell A2' not in out
+
+def test_main_quick_exit_code(three_cell_pair, monkeypatch):
+    file1, file2 = three_cell_pair
+    monkeypatch.setattr('sys.argv', ['xlsx_diff.py', file1, file2, '--quick'])
+    with pytest.raises(SystemExit) as exit_info:
+        xlsx_diff.main()
+    assert exit_info.value.code == 1
+
+# ============================================================================
+# STRUCTURAL DIFF
+# ============================================================================
+
+@pytest.fixture
+def merge_pair(tmp_path):
+    """Workbooks with equal values where only sheet 'Merged' has a merged range in file 2."""
+    sheets = {'Other': {'A1': 5}, 'Merged': {'A1': 'title'}}
+    file1 = save_workbook(tmp_path / 'a.xlsx', sheets)
+    wb = openpyxl.load_workbook(file1)
+    wb['Merged'].merge_cells('A1:C1')
+    file2 = str(tmp_path / 'b.xlsx')
+    wb.save(file2)
+    return file1, file2
+
+@pytest.mark.parametrize('jobs', [1, 3])
+@pytest.mark.parametrize('sheet_name', [None, 'Merged'])
+def test_structure_with_jobs(merge_pair, jobs, sheet_name, capsys):
+    # Regression: --structure --jobs N --sheet X read merged_cells from the
+    # parent's read-only sheet
+    file1, file2 = merge_pair
+    assert not xlsx_diff.compare_workbooks(file1, file2, sheet_name=sheet_name, jobs=jobs,
+                                           structure=True)
+    assert 'Merged range A1:C1 only in File 2' in capsys.readouterr().out
+
+def test_structure_reports_styles_and_page_setup(tmp_path):
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1, 'B1': 2}})
+    wb = openpyxl.load_workbook(file1)
+    ws = wb['S']
+    ws['A1'].font = openpyxl.styles.Font(bold=True)
+    ws.page_setup.orientation = 'landscape'
+    file2 = str(tmp_path / 'b.xlsx')
+    wb.save(file2)
+    
+    ws1 = openpyxl.load_workbook(file1)['S']
+    ws2 = openpyxl.load_workbook(file2)['S']
+    differences = list(xlsx_diff.iter_structure_differences(ws1, ws2))
+    assert [(diff['kind'], diff['cell'], diff['attribute']) for diff in differences] == [
+        ('style', 'A1', 'font'), ('page', None, 'page_setup.orientation')]
+    assert not list(xlsx_diff.iter_structure_differences(ws1, ws1))
+
+# ============================================================================
+# CONTENT HASH PRE-PASS
+# ============================================================================
+
+def test_hash_matches_equal_sheets(two_sheet_pair):
+    file1, file2 = two_sheet_pair
+    identical, all_identical = xlsx_diff.find_identical_sheets(file1, file2)
+    assert identical == {'Same'}
+    assert not all_identical
+
+def test_hash_ignores_pure_formatting(tmp_path):
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1.5}})
+    wb = openpyxl.load_workbook(file1)
+    wb['S']['A1'].font = openpyxl.styles.Font(bold=True)
+    wb['S']['A1'].number_format = '0.00'
+    file2 = str(tmp_path / 'b.xlsx')
+    wb.save(file2)
+    assert xlsx_diff.find_identical_sheets(file1, file2) == ({'S'}, True)
+
+@pytest.mark.parametrize('text', ['x ht="1"', 'x s="0"', 'x spans="1:2"'])
+def test_hash_keeps_attribute_like_cell_text(tmp_path, text, capsys):
+    # openpyxl writes strings inline, so the text sits in the sheet XML
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': text}})
+    file2 = save_workbook(tmp_path / 'b.xlsx', {'S': {'A1': 'x'}})
+    assert xlsx_diff.find_identical_sheets(file1, file2) == (set(), False)
+    assert not xlsx_diff.compare_workbooks(file1, file2)
+    assert 'Found 1 total differences' in capsys.readouterr().out
+
+@pytest.mark.parametrize('use_hash', [True, False])
+def test_date_format_is_a_value_difference(tmp_path, use_hash, capsys):
+    # The same serial number reads as a datetime once it has a date format
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 45000}})
+    wb = openpyxl.load_workbook(file1)
+    wb['S']['A1'].number_format = 'yyyy-mm-dd'
+    file2 = str(tmp_path / 'b.xlsx')
+    wb.save(file2)
+    assert not xlsx_diff.compare_workbooks(file1, file2, use_hash=use_hash)
+    assert 'Found 1 total differences' in capsys.readouterr().out
+
+def test_missing_sheet_is_an_error_despite_hash_match(tmp_path, capsys):
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1}})
+    file2 = save_workbook(tmp_path / 'b.xlsx', {'S': {'A1': 1}})
+    assert not xlsx_diff.compare_workbooks(file1, file2, sheet_name='Nope')
+    assert "Sheet 'Nope' not found" in capsys.readouterr().out
+
+# ============================================================================
+# COMPARISON BACKENDS
+# ============================================================================
+
+@pytest.mark.parametrize('method', ['dense', 'streaming', 'raw'])
+def test_backends_report_the_same_differences(tmp_path, method, capsys):
+    file1 = save_workbook(tmp_path / 'a.xlsx', {'S': {'A1': 1, 'B3': 'x', 'D2': 2.5}})
+    file2 = save_workbook(tmp_path / 'b.xlsx', {'S': {'A1': 1, 'B3': 'y', 'E5': 3}})
+    assert not xlsx_diff.compare_workbooks(file1, file2, method=method)
+    out = capsys.readouterr().out
+    assert [line.split()[1] for line in out.splitlines() if line.startswith('  Cell ')] == [
+        'D2', 'B3', 'E5']
+    assert 'Found 3 total differences' in out
+
+@pytest.fixture
+def value_under_merge_pair(tmp_path):
+    """
+    Workbooks whose only difference is a value hidden under a merged range.
+
+    openpyxl's insert_rows() shifts cells but not merged ranges, so B1 ends
+    up stored as B2, inside A2:C2.
+    """
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws['A2'] = 'anchor'
+    ws.merge_cells('A2:C2')
+    file1 = str(tmp_path / 'a.xlsx')
+    wb.save(file1)
+    
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.merge_cells('A2:C2')
+    ws['A1'] = 'anchor'
+    ws['B1'] = 'hidden'
+    ws.insert_rows(1)
+    file2 = str(tmp_path / 'b.xlsx')
+    wb.save(file2)
+    return file1, file2
+
+@pytest.mark.parametrize('align_rows', [False, True])
+@pytest.mark.parametrize('method', ['dense', 'streaming', 'raw'])
+def test_values_under_merged_ranges_are_ignored(value_under_merge_pair, method, align_rows, capsys):
+    file1, file2 = value_under_merge_pair
+    assert xlsx_diff.compare_workbooks(file1, file2, method=method, use_hash=False,
+                                       align_rows=align_rows)
+    assert 'Files are identical' in capsys.readouterr().out
+
+def test_open_sheet_source_public_fallback(value_under_merge_pair):
+    from types import SimpleNamespace
+    
+    _, file2 = value_under_merge_pair
+    wb = xlsx_diff.open_workbook(file2, 'streaming')
+    ws = wb.active
+    expected = xlsx_diff.read_covered_cells(xlsx_diff.open_sheet_source(ws))
+    public_ws = SimpleNamespace(parent=wb, title=ws.title)
+    assert xlsx_diff.read_covered_cells(xlsx_diff.open_sheet_source(public_ws)) == expected
+    assert expected == {(2, 2), (2, 3)}
+    wb.close()
+
+# ============================================================================
+# BATCH MODE
+# ============================================================================
+
+def test_batch_mode_pairs_and_exit_code(tmp_path, capsys):
+    dir_a = tmp_path / 'a'
+    dir_b = tmp_path / 'b'
+    dir_a.mkdir()
+    dir_b.mkdir()
+    save_workbook(dir_a / 'same.xlsx', {'S': {'A1': 1}})
+    save_workbook(dir_b / 'same.xlsx', {'S': {'A1': 1}})
+    save_workbook(dir_a / 'changed.xlsx', {'S': {'A1': 1}})
+    save_workbook(dir_b / 'changed.xlsx', {'S': {'A1': 2}})
+    save_workbook(dir_a / 'lonely.xlsx', {'S': {'A1': 1}})
+    assert xlsx_diff.compare_directories(str(dir_a), str(dir_b), jobs=2) == 1
+    out = capsys.readouterr().out
+    assert 'identical' in out and 'different' in out and 'only in' in out
+
+def test_batch_mode_missing_directory_exits_2(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['xlsx_diff.py', '--dir-a', str(tmp_path),
+                                     '--dir-b', str(tmp_path / 'missing')])
+    with pytest.raises(SystemExit) as exit_info:
+        xlsx_diff.main()
+    assert exit_info.value.code == 2
+    assert 'not a directory' in capsys.readouterr().out
@@ -5,11 +5,324 @@ Compare two Excel (.xlsx) files and show differences.
 Usage:
     python xlsx_diff.py file1.xlsx file2.xlsx
     python xlsx_diff.py file1.xlsx file2.xlsx --sheet "Sheet Name"
+    python xlsx_diff.py file1.xlsx file2.xlsx --streaming
+    python xlsx_diff.py file1.xlsx file2.xlsx --raw
+    python xlsx_diff.py file1.xlsx file2.xlsx --jobs 4
+    python xlsx_diff.py file1.xlsx file2.xlsx --align-rows
+    python xlsx_diff.py file1.xlsx file2.xlsx --format jsonl --quick
+    python xlsx_diff.py file1.xlsx file2.xlsx --structure
+    python xlsx_diff.py --dir-a golden/ --dir-b out/ --jobs 8
+
+Options:
+    --sheet NAME   Only compare the named sheet
+    --streaming    Read both files with read-only worksheets and compare them
+                   row by row, so memory stays bounded by one pair of rows
+    --raw          Parse the sheet XML directly (no openpyxl workbook objects)
+                   and merge-join the populated cells of both files
+    --jobs N       Compare up to N sheets at once in a process pool (in batch
+                   mode: N workbook pairs at once, default one per CPU)
+    --dir-a DIR    Batch mode: pair the .xlsx files of DIR and --dir-b DIR by
+    --dir-b DIR    name, compare the pairs concurrently and print one summary
+                   table (with --format jsonl, one JSON object per pair). Exits
+                   1 if any pair differs or lacks a partner, 2 on any error
+    --align-rows   Align rows (hash-based Myers diff) before comparing cells, so
+                   inserted/deleted rows are reported once instead of shifting
+                   every cell below them
+    --no-hash      Skip the content-hash pre-pass and always compare cell by cell
+    --format FMT   'text' (default) or 'jsonl': one JSON object per difference
+                   on stdout, streamed as found; progress text goes to stderr
+    --quick        Stop at the first difference and exit 1
+    --structure    Also compare merged ranges (as sets), per-cell styles (font,
+                   fill, border, number format, alignment, protection) and
+                   page setup, margins, print options and headers/footers;
+                   not available with --streaming or --raw
+
+Before loading anything with openpyxl, each sheet's XML part (and the shared
+strings table) is hashed straight from the .xlsx zip. Sheets whose hashes
+match are reported identical without a cell walk, and if every sheet matches
+the comparison ends there. With --structure the hashes cover formatting,
+styles.xml and workbook.xml too.
 """
 
+import argparse
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
 import sys
+import weakref
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from itertools import chain, zip_longest
+
 import openpyxl
-from openpyxl.cell.cell import MergedCell
+from openpyxl.cell.cell import Cell, MergedCell
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS, BUILTIN_FORMATS_MAX_SIZE, is_date_format, is_timedelta_format
+)
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+)
+from openpyxl.xml.functions import tostring
+
+# XML namespaces used to map sheet names to their parts inside the zip
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Qualified tag names used by the raw XML backend
+SI_TAG = f'{MAIN_NS}si'
+T_TAG = f'{MAIN_NS}t'
+R_TAG = f'{MAIN_NS}r'
+ROW_TAG = f'{MAIN_NS}row'
+V_TAG = f'{MAIN_NS}v'
+IS_TAG = f'{MAIN_NS}is'
+DIMENSION_TAG = f'{MAIN_NS}dimension'
+SHEET_DATA_TAG = f'{MAIN_NS}sheetData'
+
+# Size of the blocks read from zip members while hashing
+HASH_CHUNK_SIZE = 1 << 20
+
+# Row and cell start tags; the attribute patterns below are only applied
+# inside them, never to cell text
+ROW_CELL_TAG = re.compile(rb'<(?:\w+:)?(?:c|row)\b[^>]*>')
+
+# Row/cell attributes that only affect formatting, stripped before hashing
+FORMAT_ATTRS = re.compile(rb'\s(?:ht|customHeight|customFormat|spans|thickTop|thickBot)="[^"]*"')
+
+# Cell style index; it is hashed only as whether the style's number format is
+# a date or a duration, since that changes the value openpyxl reads
+STYLE_ATTR = re.compile(rb'\ss="(\d+)"')
+
+# Merged range entries, hashed in sorted order since writers emit them unordered
+MERGE_CELL = re.compile(rb'<mergeCell\b[^>]*>')
+MERGE_REF = re.compile(rb'\sref="([^"]+)"')
+
+def _hash_part(zf, name, digest):
+    """Feed a zip member into a hash object in fixed-size blocks."""
+    with zf.open(name) as part:
+        for chunk in iter(lambda: part.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest
+
+def _hash_sheet_part(zf, name, context_digest, structure=False, date_styles=frozenset(),
+                     timedelta_styles=frozenset()):
+    """
+    Hash the value-bearing content of a worksheet part.
+    
+    Everything before <sheetData> (sheet properties, view, column widths) and
+    the cell/row formatting attributes are dropped, so only changes that can
+    affect cell values or merged ranges change the hash; attributes are only
+    rewritten inside <row> and <c> start tags. A style index is
+    replaced by whether it formats numbers as dates or durations (from
+    `date_styles` / `timedelta_styles`), as openpyxl reads those cells as
+    datetimes. Merged ranges are hashed as a sorted list. The digest of the
+    shared strings (and, for a structural comparison, styles and workbook
+    parts) is mixed in because cells only hold indices into those tables.
+    
+    With structure=True the whole part is hashed, formatting included.
+    """
+    def style_class(match):
+        style = int(match.group(1))
+        if style in timedelta_styles:
+            return b' s="timedelta"'
+        if style in date_styles:
+            return b' s="date"'
+        return b''
+    
+    def strip_format(match):
+        return FORMAT_ATTRS.sub(b'', STYLE_ATTR.sub(style_class, match.group()))
+    
+    digest = hashlib.sha256(context_digest)
+    merge_cells = []
+    in_sheet_data = structure
+    pending = b''
+    with zf.open(name) as part:
+        for chunk in iter(lambda: part.read(HASH_CHUNK_SIZE), b''):
+            # Only process up to the last complete tag so no tag is split
+            chunk = pending + chunk
+            cut = chunk.rfind(b'>') + 1
+            chunk, pending = chunk[:cut], chunk[cut:]
+            if not in_sheet_data:
+                start = chunk.find(b'<sheetData')
+                if start < 0:
+                    continue
+                chunk = chunk[start:]
+                in_sheet_data = True
+            merge_cells.extend(MERGE_CELL.findall(chunk))
+            chunk = MERGE_CELL.sub(b'', chunk)
+            if not structure:
+                chunk = ROW_CELL_TAG.sub(strip_format, chunk)
+            digest.update(chunk)
+    digest.update(pending)
+    digest.update(b''.join(sorted(merge_cells)))
+    return digest.hexdigest()
+
+def sheet_digests(path, structure=False):
+    """
+    Hash every worksheet in an .xlsx file without going through openpyxl.
+    
+    Args:
+        path: Path to the .xlsx file
+        structure: Also hash formatting, styles and print settings
+    
+    Returns:
+        list: (sheet name, hex digest) tuples in workbook order
+    """
+    with zipfile.ZipFile(path) as zf:
+        sheet_parts, shared_strings_part = workbook_parts(zf)
+        
+        context = hashlib.sha256()
+        if shared_strings_part is not None:
+            _hash_part(zf, shared_strings_part, context)
+        date_styles = timedelta_styles = frozenset()
+        if structure:
+            # Cell style indices point into styles.xml; print titles and areas
+            # are defined names in workbook.xml
+            _hash_part(zf, 'xl/styles.xml', context)
+            _hash_part(zf, 'xl/workbook.xml', context)
+        else:
+            # Date cells are read relative to the workbook's epoch
+            context.update(str(read_epoch(zf)).encode())
+            date_styles, timedelta_styles = read_date_styles(zf)
+        context_digest = context.digest()
+        
+        return [
+            (name, _hash_sheet_part(zf, part, context_digest, structure, date_styles,
+                                    timedelta_styles))
+            for name, part in sheet_parts
+        ]
+
+def workbook_parts(zf):
+    """
+    Map sheet names to their XML parts inside an open .xlsx zip.
+    
+    Returns:
+        tuple: (list of (sheet name, part name) in workbook order,
+                shared strings part name or None)
+    """
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    
+    targets = {}
+    shared_strings_part = None
+    for rel in rels.iter(f'{PKG_REL_NS}Relationship'):
+        target = rel.get('Target')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join('xl', target))
+        targets[rel.get('Id')] = target
+        if rel.get('Type', '').endswith('/sharedStrings'):
+            shared_strings_part = target
+    
+    sheet_parts = [
+        (sheet.get('name'), targets[sheet.get(f'{REL_NS}id')])
+        for sheet in workbook.iter(f'{MAIN_NS}sheet')
+    ]
+    return sheet_parts, shared_strings_part
+
+def read_epoch(zf):
+    """Date epoch of an open .xlsx zip: the 1904 calendar if workbook.xml asks for it."""
+    workbook_pr = ET.fromstring(zf.read('xl/workbook.xml')).find(f'{MAIN_NS}workbookPr')
+    if workbook_pr is not None and workbook_pr.get('date1904') in ('1', 'true'):
+        return CALENDAR_MAC_1904
+    return CALENDAR_WINDOWS_1900
+
+def read_date_styles(zf):
+    """
+    Find the cell style indices whose number format is a date or duration.
+    
+    Returns:
+        tuple: (frozenset of date style indices, frozenset of the duration
+               ones among them)
+    """
+    try:
+        styles = ET.fromstring(zf.read('xl/styles.xml'))
+    except KeyError:
+        return frozenset(), frozenset()
+    formats = dict(BUILTIN_FORMATS)
+    for num_fmt in styles.iter(f'{MAIN_NS}numFmt'):
+        formats[int(num_fmt.get('numFmtId'))] = num_fmt.get('formatCode')
+    date_styles = set()
+    timedelta_styles = set()
+    cell_xfs = styles.find(f'{MAIN_NS}cellXfs')
+    if cell_xfs is not None:
+        for idx, xf in enumerate(cell_xfs.iter(f'{MAIN_NS}xf')):
+            code = formats.get(int(xf.get('numFmtId', 0)))
+            if code and is_date_format(code):
+                date_styles.add(idx)
+                if is_timedelta_format(code):
+                    timedelta_styles.add(idx)
+    return frozenset(date_styles), frozenset(timedelta_styles)
+
+def find_identical_sheets(file1, file2, structure=False):
+    """
+    Find sheets whose content hashes match between two workbooks.
+    
+    Args:
+        structure: Hash formatting too, for a structural comparison
+    
+    Returns:
+        tuple: (set of identical sheet names, True if every sheet matches and
+               both files have the same sheets), or (set(), False) if either
+               file can't be read this way
+    """
+    try:
+        digests1 = sheet_digests(file1, structure)
+        digests2 = sheet_digests(file2, structure)
+    except (KeyError, OSError, zipfile.BadZipFile, ET.ParseError):
+        return set(), False
+    
+    by_name2 = dict(digests2)
+    identical = {name for name, digest in digests1 if by_name2.get(name) == digest}
+    return identical, digests1 == digests2
+
+# ============================================================================
+# OPENPYXL ACCESS
+# ============================================================================
+
+# The dense, streaming and structural comparisons read a few private openpyxl
+# attributes (checked against openpyxl 3.1), because the public API either
+# creates a cell for every coordinate it visits or doesn't expose the data at
+# all. Each access goes through one of the helpers below, which falls back to
+# the slower public API when the attribute is missing.
+
+# File each read-only workbook was opened from, for open_sheet_source()
+_SOURCE_PATHS = weakref.WeakKeyDictionary()
+
+def worksheet_cells(ws):
+    """
+    Get the cells stored in a fully loaded worksheet.
+    
+    Returns:
+        dict: {(row, col): cell} of the populated coordinates only, without
+              creating cells for the empty ones
+    """
+    cells = getattr(ws, '_cells', None)
+    if cells is not None:
+        return cells
+    return {(cell.row, cell.column): cell for row in ws.iter_rows() for cell in row}
+
+def open_sheet_source(ws):
+    """Open the XML part of a worksheet loaded with open_workbook(path, 'streaming')."""
+    get_source = getattr(ws, '_get_source', None)
+    if get_source is not None:
+        return get_source()
+    with zipfile.ZipFile(_SOURCE_PATHS[ws.parent]) as zf:
+        sheet_parts, _ = workbook_parts(zf)
+        # The member stays readable after the archive itself is closed
+        return zf.open(dict(sheet_parts)[ws.title])
+
+def is_read_only(ws):
+    """Whether an openpyxl worksheet was loaded read-only (streaming)."""
+    return getattr(ws.parent, 'read_only', False)
 
 def get_cell_value(cell):
     """Get the value from a cell, handling merged cells."""
@@ -17,75 +330,944 @@ def get_cell_value(cell):
         return None
     return cell.value
 
+def iter_differences(ws1, ws2, sheet_name):
+    """
+    Compare two worksheets and yield differences as they are found.
+    
+    Only coordinates populated in either sheet are visited, in (row, col)
+    order, so the work scales with the number of cells rather than with the
+    used range; an empty coordinate compares as None on both sides anyway.
+    """
+    print(f"\nComparing sheet: {sheet_name}")
+    print(f"  File 1: {ws1.max_row} rows × {ws1.max_column} columns")
+    print(f"  File 2: {ws2.max_row} rows × {ws2.max_column} columns")
+    
+    # Worksheet cell storage, keyed by (row, col); reading it directly
+    # avoids ws.cell(), which creates a cell for every empty coordinate
+    cells1 = worksheet_cells(ws1)
+    cells2 = worksheet_cells(ws2)
+    for row, col in sorted(cells1.keys() | cells2.keys()):
+        cell1 = cells1.get((row, col))
+        cell2 = cells2.get((row, col))
+        
+        val1 = get_cell_value(cell1) if cell1 is not None else None
+        val2 = get_cell_value(cell2) if cell2 is not None else None
+        
+        # Skip if both are None or MergedCell
+        if val1 is None and val2 is None:
+            continue
+        
+        if val1 != val2:
+            col_letter = openpyxl.utils.get_column_letter(col)
+            yield {
+                'cell': f"{col_letter}{row}",
+                'row': row,
+                'col': col,
+                'file1': val1,
+                'file2': val2
+            }
+
 def compare_sheets(ws1, ws2, sheet_name):
     """Compare two worksheets and return differences."""
-    differences = []
+    differences = list(iter_differences(ws1, ws2, sheet_name))
+    return differences, len(differences)
+
+def iter_differences_streaming(ws1, ws2, sheet_name):
+    """
+    Compare two read-only worksheets row by row and yield differences.
     
-    # Get the dimensions
-    max_row = max(ws1.max_row, ws2.max_row)
-    max_col = max(ws1.max_column, ws2.max_column)
+    Both sheets are walked in lockstep with iter_rows(values_only=True), so
+    only the current pair of rows is held in memory and no cell objects are
+    created for empty space. Produces the same differences as iter_differences().
     
+    Read-only worksheets don't expose merged ranges, so they are read from the
+    sheet XML first (read_covered_cells()); values stored under a merged range
+    are ignored, as they are for a MergedCell.
+    """
     print(f"\nComparing sheet: {sheet_name}")
     print(f"  File 1: {ws1.max_row} rows × {ws1.max_column} columns")
     print(f"  File 2: {ws2.max_row} rows × {ws2.max_column} columns")
     
-    diff_count = 0
-    
-    # Compare cell by cell
-    for row in range(1, max_row + 1):
-        for col in range(1, max_col + 1):
-            cell1 = ws1.cell(row=row, column=col) if row <= ws1.max_row and col <= ws1.max_column else None
-            cell2 = ws2.cell(row=row, column=col) if row <= ws2.max_row and col <= ws2.max_column else None
-            
-            val1 = get_cell_value(cell1) if cell1 else None
-            val2 = get_cell_value(cell2) if cell2 else None
-            
-            # Skip if both are None or MergedCell
+    covered1 = read_covered_cells(open_sheet_source(ws1))
+    covered2 = read_covered_cells(open_sheet_source(ws2))
+    rows1 = ws1.iter_rows(values_only=True)
+    rows2 = ws2.iter_rows(values_only=True)
+    for row, (values1, values2) in enumerate(zip_longest(rows1, rows2, fillvalue=()), start=1):
+        for col, (val1, val2) in enumerate(zip_longest(values1, values2), start=1):
+            # Skip if both are empty
+            if val1 is None and val2 is None:
+                continue
+            if covered1 and (row, col) in covered1:
+                val1 = None
+            if covered2 and (row, col) in covered2:
+                val2 = None
             if val1 is None and val2 is None:
                 continue
             
             if val1 != val2:
                 col_letter = openpyxl.utils.get_column_letter(col)
-                differences.append({
+                yield {
                     'cell': f"{col_letter}{row}",
                     'row': row,
                     'col': col,
                     'file1': val1,
                     'file2': val2
-                })
-                diff_count += 1
+                }
+
+# ============================================================================
+# RAW XML BACKEND
+# ============================================================================
+
+def _text_content(node):
+    """Text of a shared/inline string node (<si> or <is>), joining rich text runs."""
+    parts = []
+    for child in node:
+        if child.tag == T_TAG:
+            parts.append(child.text or '')
+        elif child.tag == R_TAG:
+            for text in child.iter(T_TAG):
+                parts.append(text.text or '')
+    return ''.join(parts)
+
+def _cast_number(text):
+    """Convert a numeric cell value the same way openpyxl does."""
+    if '.' in text or 'E' in text or 'e' in text:
+        return float(text)
+    return int(text)
+
+class RawWorkbook:
+    """
+    Minimal read-only view of an .xlsx file for the raw XML backend.
+    
+    Parses the shared strings and the date/time number formats once; the
+    sheets themselves are only parsed when iterated.
+    """
+    
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path)
+        sheet_parts, shared_strings_part = workbook_parts(self._zip)
+        self._sheet_parts = dict(sheet_parts)
+        self.sheetnames = [name for name, _ in sheet_parts]
+        self.shared_strings = []
+        if shared_strings_part is not None:
+            self.shared_strings = self._read_shared_strings(shared_strings_part)
+        self.epoch = read_epoch(self._zip)
+        self.date_styles, self.timedelta_styles = read_date_styles(self._zip)
+    
+    def __getitem__(self, name):
+        return RawWorksheet(self, self._sheet_parts[name])
+    
+    def open_part(self, part):
+        return self._zip.open(part)
+    
+    def close(self):
+        self._zip.close()
+    
+    def _read_shared_strings(self, part):
+        strings = []
+        with self._zip.open(part) as source:
+            for _, elem in ET.iterparse(source):
+                if elem.tag == SI_TAG:
+                    strings.append(_text_content(elem))
+                    elem.clear()
+        return strings
+
+class RawWorksheet:
+    """One worksheet part of a RawWorkbook."""
+    
+    def __init__(self, workbook, part):
+        self.workbook = workbook
+        self.part = part
+    
+    def dimensions(self):
+        """
+        Read the declared <dimension> without parsing the cell data.
+        
+        Returns:
+            tuple: (max_row, max_column), or (None, None) if not declared
+        """
+        with self.workbook.open_part(self.part) as source:
+            for _, elem in ET.iterparse(source, events=('start',)):
+                if elem.tag == DIMENSION_TAG:
+                    _, _, max_col, max_row = range_boundaries(elem.get('ref'))
+                    return max_row, max_col
+                if elem.tag == SHEET_DATA_TAG:
+                    break
+        return None, None
+    
+    def iter_values(self):
+        """
+        Yield (row, col, value) for every cell that has a value, in sheet order.
+        
+        Cells without a value (styled blanks, merged range fillers) are skipped
+        and each row is cleared once processed, so memory stays flat.
+        """
+        workbook = self.workbook
+        shared_strings = workbook.shared_strings
+        date_styles = workbook.date_styles
+        row = 0
+        with workbook.open_part(self.part) as source:
+            # Only whole rows are processed, which keeps per-event work minimal
+            for _, row_elem in ET.iterparse(source):
+                if row_elem.tag != ROW_TAG:
+                    continue
+                ref = row_elem.get('r')
+                row = int(ref) if ref else row + 1
+                col = 0
+                for elem in row_elem:
+                    ref = elem.get('r')
+                    if ref:
+                        col = column_index_from_string(ref.rstrip('0123456789'))
+                    else:
+                        col += 1
+                    
+                    data_type = elem.get('t', 'n')
+                    if data_type == 'inlineStr':
+                        node = elem.find(IS_TAG)
+                        if node is None:
+                            continue
+                        yield row, col, _text_content(node)
+                        continue
+                    
+                    node = elem.find(V_TAG)
+                    if node is None or node.text is None:
+                        continue
+                    text = node.text
+                    if data_type == 's':
+                        value = shared_strings[int(text)]
+                    elif data_type == 'b':
+                        value = bool(int(text))
+                    elif data_type == 'd':
+                        value = from_ISO8601(text)
+                    elif data_type in ('str', 'e'):
+                        value = text
+                    else:
+                        value = _cast_number(text)
+                        style = int(elem.get('s', 0))
+                        if style in date_styles:
+                            try:
+                                value = from_excel(value, workbook.epoch,
+                                                   timedelta=style in workbook.timedelta_styles)
+                            except (OverflowError, ValueError):
+                                value = '#VALUE!'
+                    yield row, col, value
+                row_elem.clear()
+
+def read_covered_cells(source):
+    """
+    Find the cells hidden under merged ranges in a worksheet part.
     
-    return differences, diff_count
+    <mergeCells> follows <sheetData>, so this is a separate pass that scans
+    the raw XML for <mergeCell> entries without parsing it.
+    
+    Args:
+        source: Binary file object of the worksheet XML
+    
+    Returns:
+        set: (row, col) of every cell inside a merged range except its
+             top-left anchor, i.e. the cells openpyxl loads as MergedCell
+    """
+    covered = set()
+    pending = b''
+    with source:
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            # Only scan up to the last complete tag so no tag is split
+            chunk = pending + chunk
+            cut = chunk.rfind(b'>') + 1
+            chunk, pending = chunk[:cut], chunk[cut:]
+            for tag in MERGE_CELL.findall(chunk):
+                ref = MERGE_REF.search(tag)
+                if ref is None:
+                    continue
+                min_col, min_row, max_col, max_row = range_boundaries(ref.group(1).decode())
+                covered.update((row, col) for row in range(min_row, max_row + 1)
+                               for col in range(min_col, max_col + 1))
+                covered.discard((min_row, min_col))
+    return covered
+
+def _merge_join(cells1, cells2):
+    """
+    Merge two (row, col, value) streams sorted by (row, col).
+    
+    Yields:
+        tuple: (row, col, value from stream 1 or None, value from stream 2 or None)
+    """
+    end = (float('inf'), float('inf'), None)
+    next1 = next(cells1, end)
+    next2 = next(cells2, end)
+    while next1 is not end or next2 is not end:
+        key1 = next1[:2]
+        key2 = next2[:2]
+        if key1 == key2:
+            yield key1[0], key1[1], next1[2], next2[2]
+            next1 = next(cells1, end)
+            next2 = next(cells2, end)
+        elif key1 < key2:
+            yield key1[0], key1[1], next1[2], None
+            next1 = next(cells1, end)
+        else:
+            yield key2[0], key2[1], None, next2[2]
+            next2 = next(cells2, end)
+
+def _uncovered_values(ws):
+    """RawWorksheet.iter_values() without the cells hidden under merged ranges."""
+    covered = read_covered_cells(ws.workbook.open_part(ws.part))
+    if not covered:
+        return ws.iter_values()
+    return (cell for cell in ws.iter_values() if cell[:2] not in covered)
+
+def iter_differences_raw(ws1, ws2, sheet_name):
+    """
+    Compare two RawWorksheets by merge-joining their populated cells.
+    
+    Yields the same differences as iter_differences() without building any
+    openpyxl cell objects. Values stored under a merged range (openpyxl
+    writes them, e.g. after insert_rows()) are ignored, as they are for a
+    MergedCell.
+    """
+    max_row1, max_col1 = ws1.dimensions()
+    max_row2, max_col2 = ws2.dimensions()
+    print(f"\nComparing sheet: {sheet_name}")
+    print(f"  File 1: {max_row1} rows × {max_col1} columns")
+    print(f"  File 2: {max_row2} rows × {max_col2} columns")
+    
+    for row, col, val1, val2 in _merge_join(_uncovered_values(ws1), _uncovered_values(ws2)):
+        if val1 != val2:
+            col_letter = openpyxl.utils.get_column_letter(col)
+            yield {
+                'cell': f"{col_letter}{row}",
+                'row': row,
+                'col': col,
+                'file1': val1,
+                'file2': val2
+            }
+
+# ============================================================================
+# ROW ALIGNMENT
+# ============================================================================
+
+# Give up on alignment (and compare by position) past this many row edits
+MAX_ALIGN_EDITS = 2000
+
+def _trim_row(values):
+    """Drop trailing empty cells so rows of different widths compare equal."""
+    end = len(values)
+    while end and values[end - 1] is None:
+        end -= 1
+    return tuple(values[:end])
 
-def print_differences(differences, limit=50):
-    """Print the differences found."""
-    if not differences:
+def _sheet_rows(ws):
+    """
+    Read a worksheet's values as a list of row tuples (index 0 is row 1).
+    
+    Trailing empty cells and trailing empty rows are dropped.
+    """
+    if isinstance(ws, RawWorksheet):
+        rows = []
+        for row, col, value in _uncovered_values(ws):
+            while len(rows) < row:
+                rows.append([])
+            cells = rows[row - 1]
+            cells.extend([None] * (col - 1 - len(cells)))
+            cells.append(value)
+        rows = [tuple(cells) for cells in rows]
+    elif is_read_only(ws):
+        # Read-only sheets don't turn cells under merged ranges into MergedCell
+        covered = read_covered_cells(open_sheet_source(ws))
+        rows = [
+            _trim_row(tuple(None if (row, col) in covered else value
+                            for col, value in enumerate(values, start=1)))
+            if covered else _trim_row(values)
+            for row, values in enumerate(ws.iter_rows(values_only=True), start=1)
+        ]
+    else:
+        rows = [_trim_row(values) for values in ws.iter_rows(values_only=True)]
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+def _myers_matches(a, b, max_edits=MAX_ALIGN_EDITS):
+    """
+    Find a longest common subsequence of two sequences with Myers' O(ND) diff.
+    
+    The common prefix and suffix are matched directly first, so the cost on
+    mostly-similar inputs is close to linear.
+    
+    Args:
+        a: First sequence (e.g. row hashes of sheet 1)
+        b: Second sequence
+        max_edits: Give up once more than this many insertions plus
+                   deletions would be needed
+    
+    Returns:
+        list: Matching (index in a, index in b) pairs in order, or None if
+              the sequences differ by more than max_edits
+    """
+    n, m = len(a), len(b)
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < n - prefix and suffix < m - prefix and a[n - 1 - suffix] == b[m - 1 - suffix]:
+        suffix += 1
+    
+    middle = _myers_core(a[prefix:n - suffix], b[prefix:m - suffix], max_edits)
+    if middle is None:
+        return None
+    
+    matches = [(i, i) for i in range(prefix)]
+    matches.extend((prefix + i, prefix + j) for i, j in middle)
+    matches.extend((n - suffix + k, m - suffix + k) for k in range(suffix))
+    return matches
+
+def _myers_core(a, b, max_edits):
+    """Myers' greedy forward search with backtracking; see _myers_matches()."""
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        # Every element is an insertion or a deletion
+        return [] if n + m <= max_edits else None
+    
+    max_d = min(n + m, max_edits)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        # Keep only the diagonals reachable at this depth
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m)
+    return None
+
+def _myers_backtrack(trace, x, y):
+    """Walk the saved diagonals back from (x, y) to collect matching pairs."""
+    matches = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        # trace[d] covers diagonals -d-1 .. d+1
+        if k == -d or (k != d and v[k - 1 + d + 1] < v[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        if d > 0:
+            x, y = prev_x, prev_y
+    matches.reverse()
+    return matches
+
+def _row_cell_differences(values1, values2, row1, row2):
+    """Cell-level differences between one matched pair of rows."""
+    differences = []
+    for col, (val1, val2) in enumerate(zip_longest(values1, values2), start=1):
+        if val1 is None and val2 is None:
+            continue
+        if val1 != val2:
+            differences.append({
+                'kind': 'cell',
+                'cell': f"{openpyxl.utils.get_column_letter(col)}{row1}",
+                'row': row1,
+                'row2': row2,
+                'col': col,
+                'file1': val1,
+                'file2': val2
+            })
+    return differences
+
+def iter_differences_aligned(ws1, ws2, sheet_name):
+    """
+    Compare two worksheets after aligning their rows, yielding differences.
+    
+    Each row is hashed and the two hash sequences are aligned with a Myers
+    diff, so an inserted or deleted row is reported once instead of shifting
+    every cell below it. Runs of deleted rows facing runs of inserted rows are
+    paired up as modified rows and diffed cell by cell; leftovers are reported
+    as whole-row insertions/deletions. If the sheets differ by more than
+    MAX_ALIGN_EDITS rows, rows are compared by position instead.
+    """
+    print(f"\nComparing sheet: {sheet_name} (aligning rows)")
+    rows1 = _sheet_rows(ws1)
+    rows2 = _sheet_rows(ws2)
+    print(f"  File 1: {len(rows1)} rows")
+    print(f"  File 2: {len(rows2)} rows")
+    
+    matches = _myers_matches([hash(row) for row in rows1], [hash(row) for row in rows2])
+    if matches is None:
+        print(f"  ⚠ More than {MAX_ALIGN_EDITS} row edits, comparing rows by position")
+        pairs = range(min(len(rows1), len(rows2)))
+        matches = list(zip(pairs, pairs))
+    
+    prev1 = prev2 = -1
+    # A sentinel match past the end flushes the trailing gap
+    for idx1, idx2 in matches + [(len(rows1), len(rows2))]:
+        deleted = range(prev1 + 1, idx1)
+        inserted = range(prev2 + 1, idx2)
+        for i, j in zip(deleted, inserted):
+            yield from _row_cell_differences(rows1[i], rows2[j], i + 1, j + 1)
+        # Empty rows hold no values, so adding or removing them isn't a difference
+        for i in deleted[len(inserted):]:
+            if not rows1[i]:
+                continue
+            yield {
+                'kind': 'row_deleted', 'cell': None, 'row': i + 1, 'row2': None,
+                'col': None, 'file1': rows1[i], 'file2': None
+            }
+        for j in inserted[len(deleted):]:
+            if not rows2[j]:
+                continue
+            yield {
+                'kind': 'row_inserted', 'cell': None, 'row': None, 'row2': j + 1,
+                'col': None, 'file1': None, 'file2': rows2[j]
+            }
+        # Equal hashes almost always mean equal rows; guard against collisions
+        if idx1 < len(rows1) and rows1[idx1] != rows2[idx2]:
+            yield from _row_cell_differences(rows1[idx1], rows2[idx2], idx1 + 1, idx2 + 1)
+        prev1, prev2 = idx1, idx2
+
+# ============================================================================
+# STRUCTURAL DIFF
+# ============================================================================
+
+# Style components compared per cell, in signature order
+STYLE_COMPONENTS = ('font', 'fill', 'border', 'number_format', 'alignment', 'protection')
+
+# openpyxl's workbook tables that a cell's StyleArray indexes into
+STYLE_TABLES = ('_fonts', '_fills', '_borders', '_number_formats', '_alignments',
+                '_protections')
+
+# Header/footer slots compared per sheet
+HEADER_FOOTER_PARTS = ('oddHeader', 'oddFooter', 'evenHeader', 'evenFooter',
+                       'firstHeader', 'firstFooter')
+
+class StyleSignatures:
+    """
+    Interned style signatures for one workbook.
+    
+    Cells only hold a StyleArray of indices into the workbook's font, fill,
+    border, etc. tables, and those indices differ between files. Each distinct
+    StyleArray is resolved once to the XML of its components plus a digest of
+    them, so cells are compared by digest instead of by style objects.
+    
+    The tables are private to openpyxl; if the workbook doesn't have them,
+    each cell's public style attributes are serialized instead, uncached.
+    """
+    
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self._signatures = {}
+        self._indexed = all(hasattr(workbook, name) for name in STYLE_TABLES)
+        self._default_cell = None
+    
+    def __call__(self, cell):
+        """Return (digest, components) for a cell's style; None has the default style."""
+        if not self._indexed:
+            if cell is None:
+                cell = self._default()
+            return self._signature(self._cell_components(cell))
+        # Missing cells, and cells created without a style, have the default
+        style = getattr(cell, '_style', None) or StyleArray()
+        key = style.tobytes()
+        signature = self._signatures.get(key)
+        if signature is None:
+            signature = self._signatures[key] = self._signature(self._components(style))
+        return signature
+    
+    @staticmethod
+    def _signature(components):
+        digest = hashlib.blake2b('\0'.join(components).encode(), digest_size=8).digest()
+        return digest, components
+    
+    def _components(self, style):
+        """Resolve a StyleArray to the text of each of STYLE_COMPONENTS."""
+        wb = self.workbook
+        if style.numFmtId < BUILTIN_FORMATS_MAX_SIZE:
+            number_format = BUILTIN_FORMATS.get(style.numFmtId, 'General')
+        else:
+            number_format = wb._number_formats[style.numFmtId - BUILTIN_FORMATS_MAX_SIZE]
+        return (
+            _xml_text(wb._fonts[style.fontId]),
+            _xml_text(wb._fills[style.fillId]),
+            _xml_text(wb._borders[style.borderId]),
+            number_format,
+            _xml_text(wb._alignments[style.alignmentId]),
+            _xml_text(wb._protections[style.protectionId]),
+        )
+    
+    @staticmethod
+    def _cell_components(cell):
+        """The text of each of STYLE_COMPONENTS, from a cell's public attributes."""
+        return (
+            _xml_text(cell.font),
+            _xml_text(cell.fill),
+            _xml_text(cell.border),
+            cell.number_format,
+            _xml_text(cell.alignment),
+            _xml_text(cell.protection),
+        )
+    
+    def _default(self):
+        """A detached cell with the workbook's default style."""
+        if self._default_cell is None:
+            self._default_cell = Cell(self.workbook.worksheets[0])
+        return self._default_cell
+
+def _xml_text(style_object):
+    """Serialize a style object to its XML, a stable text form for comparison."""
+    return tostring(style_object.to_tree()).decode()
+
+def page_settings(ws):
+    """
+    Flatten a worksheet's print settings into a dict.
+    
+    Covers page setup (including fit-to-page), margins, print options, print
+    titles/area and the header/footer text. Unset values are left out, so a
+    setting missing from one sheet compares equal to None.
+    """
+    settings = {}
+    for prefix, obj in (('page_setup', ws.page_setup), ('page_margins', ws.page_margins),
+                        ('print_options', ws.print_options),
+                        ('header_footer', ws.HeaderFooter)):
+        for attr, value in obj:
+            settings[f'{prefix}.{attr}'] = value
+    # page_setup.fitToPage lives in the sheet properties
+    if ws.sheet_properties.pageSetUpPr is not None:
+        settings['page_setup.fitToPage'] = ws.sheet_properties.pageSetUpPr.fitToPage
+    settings['print_title_rows'] = ws.print_title_rows
+    settings['print_title_cols'] = ws.print_title_cols
+    settings['print_area'] = ws.print_area
+    for part in HEADER_FOOTER_PARTS:
+        item = getattr(ws.HeaderFooter, part)
+        for position in ('left', 'center', 'right'):
+            settings[f'{part}.{position}'] = getattr(item, position).text
+    return {key: value for key, value in settings.items() if value not in (None, '')}
+
+def iter_structure_differences(ws1, ws2):
+    """
+    Compare merged ranges, cell styles and print settings of two worksheets.
+    
+    Needs fully loaded openpyxl worksheets (not read-only). Merged ranges are
+    compared as sets. Styles are compared for every cell present in either
+    sheet (including cells under merged ranges, whose borders show), using
+    StyleSignatures; a cell missing from one sheet has the default style.
+    """
+    merges1 = {str(merged) for merged in ws1.merged_cells.ranges}
+    merges2 = {str(merged) for merged in ws2.merged_cells.ranges}
+    for merged in sorted(merges1 ^ merges2, key=lambda ref: range_boundaries(ref)[1::-1]):
+        min_col, min_row = range_boundaries(merged)[:2]
+        yield {
+            'kind': 'merge', 'cell': merged, 'row': min_row, 'col': min_col,
+            'file1': merged if merged in merges1 else None,
+            'file2': merged if merged in merges2 else None
+        }
+    
+    signatures1 = StyleSignatures(ws1.parent)
+    signatures2 = StyleSignatures(ws2.parent)
+    cells1 = worksheet_cells(ws1)
+    cells2 = worksheet_cells(ws2)
+    for row, col in sorted(cells1.keys() | cells2.keys()):
+        digest1, components1 = signatures1(cells1.get((row, col)))
+        digest2, components2 = signatures2(cells2.get((row, col)))
+        if digest1 == digest2:
+            continue
+        for attribute, value1, value2 in zip(STYLE_COMPONENTS, components1, components2):
+            if value1 != value2:
+                yield {
+                    'kind': 'style',
+                    'cell': f"{openpyxl.utils.get_column_letter(col)}{row}",
+                    'row': row,
+                    'col': col,
+                    'attribute': attribute,
+                    'file1': value1,
+                    'file2': value2
+                }
+    
+    settings1 = page_settings(ws1)
+    settings2 = page_settings(ws2)
+    for key in sorted(settings1.keys() | settings2.keys()):
+        if settings1.get(key) != settings2.get(key):
+            yield {
+                'kind': 'page', 'cell': None, 'row': None, 'col': None,
+                'attribute': key, 'file1': settings1.get(key), 'file2': settings2.get(key)
+            }
+
+def print_differences(differences, limit=50, total=None):
+    """
+    Print the differences found.
+    
+    Args:
+        differences: List of difference records (may hold only the first few)
+        limit: Maximum number of differences to print
+        total: Total number of differences, if more were found than are in
+               ``differences`` (default: len(differences))
+    """
+    if total is None:
+        total = len(differences)
+    if not total:
         print("  ✓ No differences found!")
         return
     
-    print(f"\n  Found {len(differences)} differences:")
+    print(f"\n  Found {total} differences:")
     
     for i, diff in enumerate(differences[:limit]):
-        print(f"\n  Cell {diff['cell']} (Row {diff['row']}, Col {diff['col']}):")
+        kind = diff.get('kind', 'cell')
+        if kind == 'row_deleted':
+            print(f"\n  Row {diff['row']} deleted (only in File 1):")
+        elif kind == 'row_inserted':
+            print(f"\n  Row {diff['row2']} inserted (only in File 2):")
+        elif kind == 'merge':
+            where = 'File 1' if diff['file2'] is None else 'File 2'
+            print(f"\n  Merged range {diff['cell']} only in {where}:")
+        elif kind == 'style':
+            print(f"\n  Cell {diff['cell']} {diff['attribute']} (Row {diff['row']}, Col {diff['col']}):")
+        elif kind == 'page':
+            print(f"\n  Page setting {diff['attribute']}:")
+        elif diff.get('row2', diff['row']) != diff['row']:
+            print(f"\n  Cell {diff['cell']} (Row {diff['row']}, File 2 Row {diff['row2']}, Col {diff['col']}):")
+        else:
+            print(f"\n  Cell {diff['cell']} (Row {diff['row']}, Col {diff['col']}):")
         print(f"    File 1: {repr(diff['file1'])}")
         print(f"    File 2: {repr(diff['file2'])}")
     
-    if len(differences) > limit:
-        print(f"\n  ... and {len(differences) - limit} more differences (showing first {limit})")
+    shown = min(limit, len(differences))
+    if total > shown:
+        print(f"\n  ... and {total - shown} more differences (showing first {shown})")
+
+# ============================================================================
+# REPORTERS
+# ============================================================================
 
-def compare_workbooks(file1, file2, sheet_name=None):
-    """Compare two Excel workbooks."""
+class TextReporter:
+    """
+    Human-readable report: per sheet, the count and the first `limit`
+    differences. Only those are kept in memory; the rest are just counted.
+    """
+    
+    def __init__(self, limit=50, quick=False):
+        self.limit = limit
+        self.quick = quick
+        self.keep = 1 if quick else limit
+        self.total = 0
+    
+    def report_sheet(self, sheet_name, differences, total=None):
+        """
+        Consume one sheet's differences and print them.
+        
+        Args:
+            sheet_name: Name of the sheet
+            differences: Iterable of difference records
+            total: Total count if ``differences`` was already truncated
+        
+        Returns:
+            int: Number of differences in the sheet
+        """
+        shown = []
+        count = 0
+        for diff in differences:
+            count += 1
+            if len(shown) < self.limit:
+                shown.append(diff)
+            if self.quick:
+                break
+        if total is not None:
+            count = total
+        print_differences(shown, self.limit, count)
+        self.total += count
+        return count
+
+class JsonlReporter:
+    """
+    Machine-readable report: one JSON object per difference, written as soon
+    as it is found. Each record is the difference dict plus its sheet name;
+    values JSON can't represent (dates, tuples of mixed values) are
+    stringified.
+    """
+    
+    def __init__(self, stream, quick=False):
+        self.stream = stream
+        self.quick = quick
+        self.keep = 1 if quick else None
+        self.total = 0
+    
+    def report_sheet(self, sheet_name, differences, total=None):
+        """Write one sheet's differences; see TextReporter.report_sheet()."""
+        count = 0
+        for diff in differences:
+            record = {'sheet': sheet_name}
+            record.update(diff)
+            self.stream.write(json.dumps(record, default=str, ensure_ascii=False) + '\n')
+            count += 1
+            if self.quick:
+                break
+        self.stream.flush()
+        if total is not None:
+            count = total
+        self.total += count
+        return count
+
+def open_workbook(path, method='dense'):
+    """
+    Open a workbook for the given comparison method.
+    
+    Args:
+        path: Path to the .xlsx file
+        method: 'dense' (full openpyxl load), 'streaming' (openpyxl read-only)
+                or 'raw' (RawWorkbook, no openpyxl object model)
+    """
+    if method == 'raw':
+        return RawWorkbook(path)
+    wb = openpyxl.load_workbook(path, data_only=True, read_only=(method == 'streaming'))
+    if method == 'streaming':
+        _SOURCE_PATHS[wb] = path
+    return wb
+
+def compare_sheet_in_files(file1, file2, sheet, method='dense', align_rows=False,
+                           keep=None, quick=False, structure=False):
+    """
+    Open both workbooks, compare one sheet and capture what it prints.
+    
+    Used as the process-pool worker for parallel comparisons: each call opens
+    its own workbook handles, and its console output is returned instead of
+    printed so the parent can replay it in a deterministic sheet order.
+    
+    Args:
+        keep: Return at most this many differences (None for all); the rest
+              are only counted
+        quick: Stop at the first difference
+        structure: Also compare merged ranges, styles and print settings
+    
+    Returns:
+        tuple: (captured output, kept differences, diff_count)
+    """
+    output = io.StringIO()
+    kept = []
+    diff_count = 0
+    with redirect_stdout(output):
+        wb1 = open_workbook(file1, method)
+        wb2 = open_workbook(file2, method)
+        try:
+            for diff in _iter_sheet_differences(wb1[sheet], wb2[sheet], sheet, method, align_rows,
+                                                structure):
+                diff_count += 1
+                if keep is None or len(kept) < keep:
+                    kept.append(diff)
+                if quick:
+                    break
+        finally:
+            wb1.close()
+            wb2.close()
+    return output.getvalue(), kept, diff_count
+
+# Difference generator for each method
+COMPARE_METHODS = {
+    'dense': iter_differences,
+    'streaming': iter_differences_streaming,
+    'raw': iter_differences_raw,
+}
+
+def _iter_sheet_differences(ws1, ws2, sheet_name, method, align_rows=False, structure=False):
+    """Compare one pair of worksheets with the selected method."""
+    if align_rows:
+        differences = iter_differences_aligned(ws1, ws2, sheet_name)
+    else:
+        differences = COMPARE_METHODS[method](ws1, ws2, sheet_name)
+    if structure:
+        return chain(differences, iter_structure_differences(ws1, ws2))
+    return differences
+
+def compare_workbooks(file1, file2, sheet_name=None, method='dense', jobs=1, use_hash=True,
+                      align_rows=False, output_format='text', quick=False, structure=False):
+    """
+    Compare two Excel workbooks.
+    
+    Args:
+        file1: Path to the first workbook
+        file2: Path to the second workbook
+        sheet_name: Only compare this sheet (default: all common sheets)
+        method: 'dense' compares every cell of the used range, 'streaming'
+                walks read-only worksheets row by row, 'raw' merge-joins the
+                populated cells parsed straight from the sheet XML
+        jobs: Number of worker processes; above 1, sheets are compared in
+              parallel, each worker opening its own copy of the workbooks
+        use_hash: Skip sheets whose XML content hashes match
+        align_rows: Align rows with a diff before comparing cells, so inserted
+                    or deleted rows don't shift every cell below them
+        output_format: 'text' for the readable report, 'jsonl' to stream one
+                       JSON object per difference to stdout (the readable
+                       progress output then goes to stderr)
+        quick: Stop at the first difference
+        structure: Also compare merged ranges, cell styles and print settings
+                   (needs the dense method)
+    
+    Returns:
+        bool: True if no differences were found
+    """
+    if structure and method != 'dense':
+        raise ValueError("Structural comparison needs the dense method")
+    if output_format == 'jsonl':
+        reporter = JsonlReporter(sys.stdout, quick)
+        with redirect_stdout(sys.stderr):
+            return _compare_workbooks(file1, file2, sheet_name, method, jobs, use_hash,
+                                      align_rows, reporter, structure)
+    return _compare_workbooks(file1, file2, sheet_name, method, jobs, use_hash,
+                              align_rows, TextReporter(quick=quick), structure)
+
+def _compare_workbooks(file1, file2, sheet_name, method, jobs, use_hash, align_rows, reporter,
+                       structure=False):
+    """Compare two Excel workbooks; see compare_workbooks()."""
     print(f"Comparing:")
     print(f"  File 1: {file1}")
     print(f"  File 2: {file2}")
     
+    identical_sheets = set()
+    if use_hash:
+        identical_sheets, all_identical = find_identical_sheets(file1, file2, structure)
+        # A named sheet is only in identical_sheets if both files have it; a
+        # missing one is reported by the full comparison below
+        if sheet_name in identical_sheets if sheet_name else all_identical:
+            print("\n✓ Sheet contents hash identical, skipping cell comparison")
+            _print_summary(0)
+            return True
+    
+    # With jobs > 1 every changed sheet goes to the process pool (see
+    # _compare_loaded_workbooks()), so the parent only needs sheet names and a
+    # read-only open is enough; the workers load what they compare
+    open_method = 'streaming' if method == 'dense' and jobs > 1 else method
     try:
-        wb1 = openpyxl.load_workbook(file1, data_only=True)
-        wb2 = openpyxl.load_workbook(file2, data_only=True)
+        wb1 = open_workbook(file1, open_method)
+        wb2 = open_workbook(file2, open_method)
     except Exception as e:
         print(f"Error loading files: {e}")
         return False
     
+    try:
+        return _compare_loaded_workbooks(wb1, wb2, file1, file2, sheet_name, method, jobs,
+                                         identical_sheets, align_rows, reporter, structure)
+    finally:
+        # Read-only workbooks keep the zip file open until closed
+        wb1.close()
+        wb2.close()
+
+def _compare_loaded_workbooks(wb1, wb2, file1, file2, sheet_name, method, jobs,
+                              identical_sheets=frozenset(), align_rows=False, reporter=None,
+                              structure=False):
+    """Compare two already-open workbooks; see compare_workbooks()."""
+    if reporter is None:
+        reporter = TextReporter()
+    
     # Compare sheet names
     sheets1 = wb1.sheetnames
     sheets2 = wb2.sheetnames
@@ -112,39 +1294,273 @@ def compare_workbooks(file1, file2, sheet_name=None):
             return False
         sheets_to_compare = [sheet_name]
     else:
-        sheets_to_compare = set(sheets1) & set(sheets2)
+        # Common sheets, in File 1's order
+        sheets_to_compare = [sheet for sheet in sheets1 if sheet in sheets2]
+    
+    # Sheets with matching content hashes don't need a cell walk
+    changed_sheets = [sheet for sheet in sheets_to_compare if sheet not in identical_sheets]
     
     total_differences = 0
-    for sheet in sheets_to_compare:
-        ws1 = wb1[sheet]
-        ws2 = wb2[sheet]
-        differences, diff_count = compare_sheets(ws1, ws2, sheet)
-        total_differences += diff_count
-        print_differences(differences)
+    # Even a single changed sheet goes to the pool: with jobs > 1 the parent's
+    # workbooks may be read-only (see _compare_workbooks()), which the dense
+    # and structural comparisons can't walk
+    if jobs > 1 and changed_sheets:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(changed_sheets))) as pool:
+            # map() yields results in submission order, keeping output deterministic
+            results = pool.map(
+                compare_sheet_in_files,
+                [file1] * len(changed_sheets),
+                [file2] * len(changed_sheets),
+                changed_sheets,
+                [method] * len(changed_sheets),
+                [align_rows] * len(changed_sheets),
+                [reporter.keep] * len(changed_sheets),
+                [reporter.quick] * len(changed_sheets),
+                [structure] * len(changed_sheets),
+            )
+            for sheet in sheets_to_compare:
+                if sheet in identical_sheets:
+                    _print_identical_sheet(sheet)
+                    continue
+                output, differences, diff_count = next(results)
+                sys.stdout.write(output)
+                total_differences += reporter.report_sheet(sheet, differences, diff_count)
+                if reporter.quick and total_differences:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+    else:
+        for sheet in sheets_to_compare:
+            if sheet in identical_sheets:
+                _print_identical_sheet(sheet)
+                continue
+            ws1 = wb1[sheet]
+            ws2 = wb2[sheet]
+            differences = _iter_sheet_differences(ws1, ws2, sheet, method, align_rows, structure)
+            total_differences += reporter.report_sheet(sheet, differences)
+            if reporter.quick and total_differences:
+                break
     
+    _print_summary(total_differences, reporter.quick)
+    return total_differences == 0
+
+def _print_identical_sheet(sheet_name):
+    """Report a sheet that was skipped because its content hash matched."""
+    print(f"\nComparing sheet: {sheet_name}")
+    print("  ✓ No differences found! (content hash match)")
+
+def _print_summary(total_differences, quick=False):
+    """Print the final result banner."""
     print(f"\n{'='*60}")
     if total_differences == 0:
         print("✓ Files are identical!")
+    elif quick:
+        print("✗ Files differ (stopped at first difference)")
     else:
         print(f"✗ Found {total_differences} total differences")
     print('='*60)
+
+# ============================================================================
+# BATCH MODE
+# ============================================================================
+
+def pair_workbooks(dir_a, dir_b):
+    """
+    Pair up the .xlsx files of two directories by file name.
     
-    return total_differences == 0
+    Returns:
+        list: (name, path in dir_a or None, path in dir_b or None) tuples,
+              sorted by name
+    """
+    names_a = {name for name in os.listdir(dir_a) if name.lower().endswith('.xlsx')}
+    names_b = {name for name in os.listdir(dir_b) if name.lower().endswith('.xlsx')}
+    return [
+        (name,
+         os.path.join(dir_a, name) if name in names_a else None,
+         os.path.join(dir_b, name) if name in names_b else None)
+        for name in sorted(names_a | names_b)
+    ]
+
+def compare_pair(file1, file2, options):
+    """
+    Compare one pair of workbooks with the report discarded.
+    
+    Used as the process-pool worker for batch mode; `options` holds the
+    compare_workbooks() keyword arguments shared by every pair.
+    
+    Returns:
+        tuple: (status, differences, message) where status is 'identical',
+               'different' or 'error'
+    """
+    output = io.StringIO()
+    reporter = TextReporter(limit=0, quick=options['quick'])
+    try:
+        with redirect_stdout(output):
+            identical = _compare_workbooks(file1, file2, None, options['method'], 1,
+                                           options['use_hash'], options['align_rows'],
+                                           reporter, options['structure'])
+    except Exception as e:
+        return 'error', None, str(e)
+    if identical:
+        return 'identical', 0, ''
+    if reporter.total:
+        return 'different', reporter.total, ''
+    # Nothing was counted, so the comparison stopped on an error it printed
+    lines = output.getvalue().strip().splitlines()
+    return 'error', None, lines[-1].strip() if lines else ''
+
+def compare_directories(dir_a, dir_b, jobs=None, output_format='text', **options):
+    """
+    Compare every pair of same-named .xlsx files in two directories.
+    
+    Pairs are compared concurrently in a process pool and reported in one
+    summary table (or one JSON object per pair with output_format='jsonl').
+    
+    Args:
+        dir_a: Directory with the first (e.g. golden) workbooks
+        dir_b: Directory with the second (e.g. generated) workbooks
+        jobs: Number of worker processes (default: one per CPU)
+        output_format: 'text' for a table, 'jsonl' for one record per pair
+        **options: method, use_hash, align_rows, quick and structure, as for
+                   compare_workbooks()
+    
+    Returns:
+        int: Exit code - 0 if every pair is identical, 1 if any pair differs
+             or a file has no partner, 2 if any comparison failed
+    """
+    options = dict({'method': 'dense', 'use_hash': True, 'align_rows': False,
+                    'quick': False, 'structure': False}, **options)
+    pairs = pair_workbooks(dir_a, dir_b)
+    complete = [(file1, file2) for _, file1, file2 in pairs if file1 and file2]
+    
+    results = {}
+    if complete:
+        with ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count(), len(complete))) as pool:
+            outcomes = pool.map(compare_pair,
+                                [file1 for file1, _ in complete],
+                                [file2 for _, file2 in complete],
+                                [options] * len(complete))
+            results = dict(zip(complete, outcomes))
+    
+    rows = []
+    for name, file1, file2 in pairs:
+        if file1 is None:
+            rows.append((name, f'only in {dir_b}', None, ''))
+        elif file2 is None:
+            rows.append((name, f'only in {dir_a}', None, ''))
+        else:
+            rows.append((name,) + results[(file1, file2)])
+    
+    if output_format == 'jsonl':
+        for name, status, differences, message in rows:
+            print(json.dumps({'file': name, 'status': status, 'differences': differences,
+                              'message': message}, ensure_ascii=False))
+    else:
+        _print_batch_table(dir_a, dir_b, rows)
+    
+    statuses = [status for _, status, _, _ in rows]
+    if 'error' in statuses:
+        return 2
+    return 0 if all(status == 'identical' for status in statuses) else 1
+
+def _print_batch_table(dir_a, dir_b, rows):
+    """Print the batch-mode summary table."""
+    print(f"Comparing:")
+    print(f"  Directory A: {dir_a}")
+    print(f"  Directory B: {dir_b}\n")
+    
+    name_width = max([len('File')] + [len(row[0]) for row in rows])
+    status_width = max([len('Status')] + [len(row[1]) for row in rows])
+    print(f"{'File':<{name_width}}  {'Status':<{status_width}}  Differences")
+    print(f"{'-' * name_width}  {'-' * status_width}  {'-' * 11}")
+    for name, status, differences, message in rows:
+        count = '' if differences is None else str(differences)
+        line = f"{name:<{name_width}}  {status:<{status_width}}  {count:>11}"
+        if message:
+            line += f"  {message}"
+        print(line)
+    
+    identical = sum(1 for row in rows if row[1] == 'identical')
+    print(f"\n{'='*60}")
+    if identical == len(rows):
+        print(f"✓ All {len(rows)} workbook pairs are identical!")
+    else:
+        print(f"✗ {len(rows) - identical} of {len(rows)} workbook pairs differ")
+    print('='*60)
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Compare two Excel (.xlsx) files and show differences.'
+    )
+    parser.add_argument('file1', nargs='?', help='First .xlsx file')
+    parser.add_argument('file2', nargs='?', help='Second .xlsx file')
+    parser.add_argument('--dir-a', metavar='DIR',
+                        help='Batch mode: compare every .xlsx in DIR with the same-named '
+                             'file in --dir-b')
+    parser.add_argument('--dir-b', metavar='DIR', help='Batch mode: second directory')
+    parser.add_argument('--sheet', dest='sheet_name', default=None,
+                        help='Only compare the named sheet')
+    method = parser.add_mutually_exclusive_group()
+    method.add_argument('--streaming', dest='method', action='store_const', const='streaming',
+                        help='Compare read-only worksheets row by row '
+                             '(bounded memory for very large files)')
+    method.add_argument('--raw', dest='method', action='store_const', const='raw',
+                        help='Parse sheet XML directly and merge-join populated cells '
+                             '(fastest for large files)')
+    parser.set_defaults(method='dense')
+    parser.add_argument('--jobs', type=int, default=None, metavar='N',
+                        help='Compare up to N sheets (or, in batch mode, workbook pairs) '
+                             'in parallel worker processes')
+    parser.add_argument('--align-rows', action='store_true',
+                        help='Align rows with a diff first, reporting inserted/deleted rows '
+                             'instead of shifted cells')
+    parser.add_argument('--no-hash', dest='use_hash', action='store_false',
+                        help='Always compare cell by cell, even if sheet content hashes match')
+    parser.add_argument('--format', dest='output_format', choices=('text', 'jsonl'),
+                        default='text',
+                        help='Output format; jsonl streams one JSON object per difference '
+                             'to stdout and sends progress text to stderr')
+    parser.add_argument('--quick', action='store_true',
+                        help='Stop at the first difference (exit code 1)')
+    parser.add_argument('--structure', action='store_true',
+                        help='Also compare merged ranges, cell styles and page setup')
+    args = parser.parse_args(argv)
+    if args.structure and args.method != 'dense':
+        parser.error('--structure cannot be combined with --streaming or --raw')
+    if args.dir_a or args.dir_b:
+        if not (args.dir_a and args.dir_b):
+            parser.error('--dir-a and --dir-b must be given together')
+        if args.file1 or args.file2:
+            parser.error('give either two files or --dir-a/--dir-b, not both')
+        if args.sheet_name:
+            parser.error('--sheet is not available in batch mode')
+    elif not (args.file1 and args.file2):
+        parser.error('two files (or --dir-a and --dir-b) are required')
+    return args
 
 def main():
     if len(sys.argv) < 3:
         print(__doc__)
         sys.exit(1)
     
-    file1 = sys.argv[1]
-    file2 = sys.argv[2]
-    
-    sheet_name = None
-    if len(sys.argv) > 3 and sys.argv[3] == '--sheet' and len(sys.argv) > 4:
-        sheet_name = sys.argv[4]
+    args = parse_args()
     
     try:
-        are_identical = compare_workbooks(file1, file2, sheet_name)
+        if args.dir_a:
+            for directory in (args.dir_a, args.dir_b):
+                if not os.path.isdir(directory):
+                    print(f"Error: not a directory: {directory}")
+                    sys.exit(2)
+            sys.exit(compare_directories(args.dir_a, args.dir_b, jobs=args.jobs,
+                                         output_format=args.output_format, method=args.method,
+                                         use_hash=args.use_hash, align_rows=args.align_rows,
+                                         quick=args.quick, structure=args.structure))
+        
+        are_identical = compare_workbooks(args.file1, args.file2, args.sheet_name,
+                                          method=args.method, jobs=args.jobs or 1,
+                                          use_hash=args.use_hash, align_rows=args.align_rows,
+                                          output_format=args.output_format, quick=args.quick,
+                                          structure=args.structure)
         sys.exit(0 if are_identical else 1)
     except Exception as e:
         print(f"Error: {e}")